@@ -1,11 +1,11 @@
 # This file marks the directory as a Python package
 from .models.models import User, Opportunity, Vehicle, AdasSystem
-from .models import Base, SessionLocal, engine
+from .models import Base, SessionLocal, get_engine
 
 __all__ = [
     'Base',
     'SessionLocal',
-    'engine',
+    'get_engine',
     'User',
     'Opportunity',
     'Vehicle',
@@ -13,12 +13,28 @@ STORAGE_DIR = os.path.join(BASE_DIR, 'storage', 'files')
 # Ensure storage directory exists
 os.makedirs(STORAGE_DIR, exist_ok=True)
 
+# Local snapshots of reference data (vehicle catalog, ...)
+CACHE_DIR = os.path.join(BASE_DIR, 'storage', 'cache')
+
 # Supabase configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 SUPABASE_BUCKET = os.getenv("SUPABASE_BUCKET", "opportunity-files")
 
+# HTTP connection pool shared by all Supabase storage calls
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "10"))
+SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "60"))  # Seconds an idle connection is kept
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "30"))  # Seconds per request
+
+# Resumable (TUS) uploads for large attachments; Supabase expects 6 MB chunks
+SUPABASE_CHUNK_SIZE = int(os.getenv("SUPABASE_CHUNK_SIZE", str(6 * 1024 * 1024)))
+SUPABASE_RESUMABLE_THRESHOLD = int(os.getenv("SUPABASE_RESUMABLE_THRESHOLD", str(6 * 1024 * 1024)))  # Smaller files use one request
+
+# Downloaded attachments, keyed by content hash; least recently opened are evicted past the cap
+ATTACHMENT_CACHE_DIR = os.path.join(CACHE_DIR, 'attachments')
+ATTACHMENT_CACHE_MAX_BYTES = int(os.getenv("ATTACHMENT_CACHE_MAX_BYTES", str(500 * 1024 * 1024)))
+
 # Application settings
 DEBUG = os.getenv("DEBUG", "False").lower() in ("true", "1", "t")
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-key-change-in-production")
@@ -1,48 +1,308 @@
 import os
+import logging
+import threading
 from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
 from dotenv import load_dotenv
+from typing import Any, Dict
+from uuid import uuid4
+import select
 import time
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv('DATABASE_URL')
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set")
 
-# Create engine with enhanced configuration for Neon
-engine = create_engine(
-    DATABASE_URL,
-    # Note: sslmode is included in the connection string, not in connect_args
-    pool_size=5,  # Maximum number of connections in the pool
-    max_overflow=10,  # Maximum number of connections that can be created beyond pool_size
-    pool_timeout=30,  # Timeout for getting a connection from the pool
-    pool_recycle=1800,  # Recycle connections after 30 minutes
-    pool_pre_ping=True  # Enable connection health checks
-)
-
-# Add event listeners for connection debugging
-@event.listens_for(engine, 'connect')
-def receive_connect(dbapi_connection, connection_record):
-    print('New connection established')
-
-@event.listens_for(engine, 'checkout')
-def receive_checkout(dbapi_connection, connection_record, connection_proxy):
-    print('Connection retrieved from pool')
-
-@event.listens_for(engine, 'checkin')
-def receive_checkin(dbapi_connection, connection_record):
-    print('Connection returned to pool')
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def direct_database_url(url: str) -> str:
+    """The URL with Neon's pooled (-pooler) host replaced by the direct one"""
+    parsed = make_url(url)
+    if parsed.host and "-pooler." in parsed.host:
+        parsed = parsed.set(host=parsed.host.replace("-pooler.", ".", 1))
+    return parsed.render_as_string(hide_password=False)
+
+# LISTEN needs a session on one server connection. Transaction-mode poolers
+# (PgBouncer, Neon's -pooler endpoint) accept LISTEN but never deliver the
+# notifications, so listeners connect directly
+LISTEN_DATABASE_URL = os.getenv('DATABASE_LISTEN_URL') or direct_database_url(DATABASE_URL)
+
+# Channel the migration 010 triggers notify on; keep in step with its pg_notify calls
+CHANGE_CHANNEL = "si_changes"
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    return value.lower() in ("true", "1", "t") if value else default
+
+# Pool profile, overridable per deployment through the environment
+POOL_SIZE = _env_int("DB_POOL_SIZE", 5)  # Connections kept open in the pool
+MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 10)  # Extra connections allowed beyond POOL_SIZE
+POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 30)  # Seconds to wait for a free connection
+POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 1800)  # Recycle connections after this many seconds
+POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)  # Check connections are alive on checkout
+POOL_WARMUP = _env_int("DB_POOL_WARMUP", 2)  # Connections opened ahead of time at login
+NOTIFY_CHECK_TIMEOUT = _env_int("DB_NOTIFY_CHECK_TIMEOUT", 5)  # Seconds to wait for a listener's test notification
+SLOW_CHECKOUT_MS = _env_int("DB_SLOW_CHECKOUT_MS", 500)  # Checkout waits logged as warnings
+POOL_LOG_LEVEL = os.getenv("DB_POOL_LOG_LEVEL", "WARNING").upper()  # INFO adds overflow, DEBUG every connect
+
+# Attributes every LogRecord has; anything else on a record came in through extra=
+_LOG_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class PoolLogFormatter(logging.Formatter):
+    """Formatter that appends the fields pool events pass as extra= (pool_event, wait_ms, ...)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        fields = []
+        for name, value in vars(record).items():
+            if name in _LOG_RECORD_FIELDS:
+                continue
+            fields.append(f"{name}={value:.1f}" if isinstance(value, float) else f"{name}={value}")
+        return f"{message} [{' '.join(fields)}]" if fields else message
+
+class PoolStats:
+    """Counters for the engine's connection pool, see pool_stats()"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self.lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+        if timed_out:
+            logger.warning("Pool checkout timed out", extra={"pool_event": "timeout", "wait_ms": seconds * 1000})
+        elif seconds * 1000 >= SLOW_CHECKOUT_MS:
+            logger.warning("Slow pool checkout", extra={"pool_event": "slow_checkout", "wait_ms": seconds * 1000})
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "pool_size": POOL_SIZE,
+                "max_overflow": MAX_OVERFLOW,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": self.wait_total * 1000 / self.checkouts if self.checkouts else 0.0,
+                "max_wait_ms": self.wait_max * 1000,
+            }
+
+_pool_stats = PoolStats()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            _pool_stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        _pool_stats.record_wait(time.perf_counter() - start)
+        return connection
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def _create_engine():
+    # Create engine with enhanced configuration for Neon
+    engine = create_engine(
+        DATABASE_URL,
+        # Note: sslmode is included in the connection string, not in connect_args
+        poolclass=InstrumentedQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=POOL_PRE_PING
+    )
+
+    # Pool instrumentation: counters in PoolStats, details at DEBUG level
+    @event.listens_for(engine, 'connect')
+    def receive_connect(dbapi_connection, connection_record):
+        overflow = engine.pool.overflow() > 0
+        with _pool_stats.lock:
+            _pool_stats.connects += 1
+            if overflow:
+                _pool_stats.overflow_events += 1
+        if overflow:
+            logger.info("Pool overflow connection opened", extra={"pool_event": "overflow", "overflow": engine.pool.overflow()})
+        else:
+            logger.debug("New connection established", extra={"pool_event": "connect"})
+
+    @event.listens_for(engine, 'checkout')
+    def receive_checkout(dbapi_connection, connection_record, connection_proxy):
+        with _pool_stats.lock:
+            _pool_stats.checkouts += 1
+            _pool_stats.in_use += 1
+            _pool_stats.peak_in_use = max(_pool_stats.peak_in_use, _pool_stats.in_use)
+
+    @event.listens_for(engine, 'checkin')
+    def receive_checkin(dbapi_connection, connection_record):
+        with _pool_stats.lock:
+            _pool_stats.in_use = max(_pool_stats.in_use - 1, 0)
+
+    @event.listens_for(engine, 'detach')
+    def receive_detach(dbapi_connection, connection_record):
+        # Detached connections (e.g. LISTEN connections) never check back in
+        with _pool_stats.lock:
+            _pool_stats.in_use = max(_pool_stats.in_use - 1, 0)
+
+    return engine
+
+def get_engine():
+    """The application's single engine, created on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _create_engine()
+                logger.debug("Database engine created", extra={"pool_event": "engine_created"})
+    return _engine
+
+def __getattr__(name):
+    # `from app.database.connection import engine` keeps working, but builds the engine
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class LazySessionmaker(sessionmaker):
+    """sessionmaker that binds to get_engine() when the first session is made"""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+SessionLocal = LazySessionmaker(autocommit=False, autoflush=False)
 Base = declarative_base()
 
+def pool_stats() -> Dict[str, Any]:
+    """Snapshot of the pool counters: checkouts, in use, overflow events, wait times"""
+    return _pool_stats.snapshot()
+
+def warm_pool(count: int = POOL_WARMUP) -> None:
+    """Open up to count connections concurrently and return them to the pool"""
+    count = min(count, POOL_SIZE)
+    connections = []
+    lock = threading.Lock()
+
+    def open_connection():
+        try:
+            connection = get_engine().connect()
+        except Exception as e:
+            logger.warning(f"Pool warmup connection failed: {str(e)}", extra={"pool_event": "warmup_failed"})
+            return
+        with lock:
+            connections.append(connection)
+
+    threads = [threading.Thread(target=open_connection) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for connection in connections:
+        connection.close()
+    logger.debug("Pool warmed up", extra={"pool_event": "warmup", "connections": len(connections)})
+
+def start_pool_warmup(count: int = POOL_WARMUP) -> None:
+    """Warm the pool in the background, e.g. while the login screen is shown"""
+    if count > 0:
+        threading.Thread(target=warm_pool, args=(count,), daemon=True).start()
+
+def connect_listener(channel: str):
+    """
+    Open a connection LISTENing on channel, checked to receive notifications.
+
+    The connection goes to LISTEN_DATABASE_URL, outside the pool, in
+    autocommit mode. Before it is returned, a test notification is sent on
+    a private channel through the application's engine; if it does not
+    arrive within NOTIFY_CHECK_TIMEOUT (e.g. behind a transaction-mode
+    pooler) the connection is closed and an error raised, so callers keep
+    polling.
+
+    Returns:
+        A psycopg2 connection; read its notifies after poll()
+    """
+    listen_engine = create_engine(LISTEN_DATABASE_URL, poolclass=NullPool)
+    pooled = listen_engine.raw_connection()
+    connection = pooled.dbapi_connection
+    pooled.detach()
+    try:
+        connection.autocommit = True
+        probe = f"{channel}_probe_{uuid4().hex}"
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{channel}"')
+            cursor.execute(f'LISTEN "{probe}"')
+        # Sent the way the triggers' notifications are, from another (pooled)
+        # connection: behind a transaction pooler the idle LISTEN session
+        # never sees it
+        with get_engine().begin() as sender:
+            sender.execute(text("SELECT pg_notify(:channel, '')"), {"channel": probe})
+
+        received = False
+        deadline = time.monotonic() + NOTIFY_CHECK_TIMEOUT
+        while True:
+            connection.poll()
+            for notify in [n for n in connection.notifies if n.channel == probe]:
+                connection.notifies.remove(notify)
+                received = True
+            remaining = deadline - time.monotonic()
+            if received or remaining <= 0:
+                break
+            select.select([connection], [], [], remaining)
+
+        if not received:
+            raise RuntimeError("LISTEN connection does not receive notifications; if it goes through "
+                               "a transaction pooler, set DATABASE_LISTEN_URL to a direct connection")
+        with connection.cursor() as cursor:
+            cursor.execute(f'UNLISTEN "{probe}"')
+        return connection
+    except Exception:
+        connection.close()
+        raise
+    finally:
+        listen_engine.dispose()
+
+def configure_pool_logging(level: str = POOL_LOG_LEVEL) -> None:
+    """Print pool events at level and above to stderr; safe to call more than once"""
+    if not any(isinstance(handler.formatter, PoolLogFormatter) for handler in logger.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(PoolLogFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+def log_pool_stats() -> None:
+    """Log the pool counters at INFO, e.g. when the app quits"""
+    logger.info("Pool stats", extra={"pool_event": "stats", **pool_stats()})
+
 def get_db():
     db = SessionLocal()
     try:
-        # Test the connection with proper text() wrapper
-        db.execute(text("SELECT 1"))
         yield db
     except Exception as e:
         print(f"Database connection error: {str(e)}")
@@ -54,10 +314,12 @@ def get_db():
 def get_db_with_retry(max_retries=3, delay=1):
     """Get a database session with retry logic"""
     for attempt in range(max_retries):
+        db = None
         try:
             db = SessionLocal()
-            # Test the connection with proper text() wrapper
-            db.execute(text("SELECT 1"))
+            # Check out the session's connection now so failures are retried here;
+            # pool_pre_ping already verifies it, no separate probe query needed
+            db.connection()
             return db
         except Exception as e:
             print(f"Database connection attempt {attempt + 1} failed: {str(e)}")
@@ -66,4 +328,4 @@ def get_db_with_retry(max_retries=3, delay=1):
             if attempt < max_retries - 1:
                 time.sleep(delay)
             else:
-                raise 
\ No newline at end of file
+                raise
@@ -2,12 +2,12 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from app.database.connection import Base, engine
+from app.database.connection import Base, get_engine
 from app.models.models import User, Vehicle, Opportunity, AdasSystem, FileAttachment
 
 def init_database():
     print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
     print("Database tables created successfully!")
 
 if __name__ == "__main__":
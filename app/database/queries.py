@@ -0,0 +1,331 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+from sqlalchemy import and_, case, func, literal, or_, union_all, select
+from sqlalchemy.orm import Session, aliased, contains_eager
+from app.models.models import Notification, Opportunity, User
+
+UNKNOWN_USER = "Unknown"
+UNASSIGNED = "Unassigned"
+
+# Rows shown per page in the management portal opportunities table
+PORTAL_PAGE_SIZE = 100
+
+# Most recent ticket titles offered in the portal title dropdown
+PORTAL_TITLE_CHOICES = 200
+
+# Statuses counted as open work in the portal statistics
+ACTIVE_STATUSES = ("new", "in progress")
+
+class PortalRow(NamedTuple):
+    """Plain snapshot of one row of the portal opportunities table"""
+    id: Any
+    title: str
+    status: str
+    created_by: str
+    created_at: Optional[datetime]
+    assigned_to: str
+    completed_at: Optional[datetime]
+    response_time: Optional[timedelta]
+    acceptor_id: Any
+
+class UpdateFingerprint(NamedTuple):
+    """Cheap summary of what the toolbar update check would fetch for a user"""
+    user_id: str
+    new_opportunities: int
+    opportunities_changed_at: Optional[datetime]
+    unread_notifications: int
+    notifications_created_at: Optional[datetime]
+
+def creator_username(opportunity: Opportunity) -> str:
+    """Username of the ticket creator as shown in the portal"""
+    creator = opportunity.creator
+    return creator.username if creator else UNKNOWN_USER
+
+def assignee_name(opportunity: Opportunity) -> str:
+    """Full name of the ticket acceptor, or "Unassigned" """
+    acceptor = opportunity.acceptor if opportunity.acceptor_id else None
+    return f"{acceptor.first_name} {acceptor.last_name}" if acceptor else UNASSIGNED
+
+def portal_opportunities_query(db: Session,
+                               title: Optional[str] = None,
+                               status: Optional[str] = None,
+                               created_by: Optional[str] = None,
+                               assigned_to: Optional[str] = None):
+    """
+    Build the management portal query with the filter state compiled into SQL.
+
+    Creator and acceptor are joined once and used both for the WHERE clauses
+    and to populate Opportunity.creator / Opportunity.acceptor.
+
+    Args:
+        db: Open database session
+        title: Substring the ticket title must contain
+        status: Exact status value
+        created_by: Creator username, or "Unknown" for tickets without one
+        assigned_to: Acceptor "First Last" name, or "Unassigned"
+
+    Returns:
+        Query ordered newest first
+    """
+    creator = aliased(User)
+    acceptor = aliased(User)
+
+    query = (
+        db.query(Opportunity)
+        .outerjoin(creator, Opportunity.creator_id == creator.id)
+        .outerjoin(acceptor, Opportunity.acceptor_id == acceptor.id)
+        .options(
+            contains_eager(Opportunity.creator.of_type(creator)),
+            contains_eager(Opportunity.acceptor.of_type(acceptor))
+        )
+    )
+
+    if title:
+        query = query.filter(Opportunity.title.contains(title, autoescape=True))
+
+    if status:
+        query = query.filter(Opportunity.status == status)
+
+    if created_by == UNKNOWN_USER:
+        query = query.filter(creator.id.is_(None))
+    elif created_by:
+        query = query.filter(creator.username == created_by)
+
+    if assigned_to == UNASSIGNED:
+        query = query.filter(acceptor.id.is_(None))
+    elif assigned_to:
+        query = query.filter(acceptor.first_name + " " + acceptor.last_name == assigned_to)
+
+    return query.order_by(Opportunity.created_at.desc().nullslast(), Opportunity.id)
+
+def load_portal_page(db: Session, page: int = 0, page_size: int = PORTAL_PAGE_SIZE,
+                     **filters: Optional[str]) -> Tuple[List[Opportunity], int]:
+    """
+    Load one page of the management portal opportunities table.
+
+    The page query stops at LIMIT by walking the created_at index, so the
+    total is counted separately, and not at all when the first page
+    already holds every match.
+
+    Args:
+        db: Open database session
+        page: Zero-based page number
+        page_size: Rows per page
+        **filters: title, status, created_by, assigned_to (see portal_opportunities_query)
+
+    Returns:
+        Tuple of (opportunities on the page, total matching rows)
+    """
+    query = portal_opportunities_query(db, **filters)
+    opportunities = query.limit(page_size).offset(page * page_size).all()
+
+    if page == 0 and len(opportunities) < page_size:
+        return opportunities, len(opportunities)
+
+    total = db.query(func.count()).select_from(query.order_by(None).subquery()).scalar()
+    return opportunities, total
+
+def portal_row(opportunity: Opportunity) -> PortalRow:
+    """Snapshot an opportunity loaded by portal_opportunities_query"""
+    return PortalRow(
+        id=opportunity.id,
+        title=opportunity.title,
+        status=opportunity.status,
+        created_by=creator_username(opportunity),
+        created_at=opportunity.created_at,
+        assigned_to=assignee_name(opportunity),
+        completed_at=opportunity.completed_at,
+        response_time=opportunity.response_time,
+        acceptor_id=opportunity.acceptor_id
+    )
+
+def load_portal_filter_values(db: Session) -> Dict[str, Set[str]]:
+    """
+    Load the distinct values offered by the portal filter dropdowns.
+
+    All four lists come back from one UNION ALL statement. Only the most
+    recent PORTAL_TITLE_CHOICES titles are listed; older tickets can still
+    be found by typing part of the title.
+
+    Args:
+        db: Open database session
+
+    Returns:
+        Distinct values keyed by filter id: title, status, created_by, assigned_to
+    """
+    creator = aliased(User)
+    acceptor = aliased(User)
+
+    recent_titles = (
+        select(Opportunity.title.label("value"))
+        .order_by(Opportunity.created_at.desc().nullslast())
+        .limit(PORTAL_TITLE_CHOICES)
+        .subquery()
+    )
+
+    statement = union_all(
+        select(literal("title").label("filter_id"), recent_titles.c.value),
+        select(literal("status"), Opportunity.status).distinct(),
+        select(literal("created_by"), func.coalesce(creator.username, UNKNOWN_USER))
+        .select_from(Opportunity)
+        .outerjoin(creator, Opportunity.creator_id == creator.id)
+        .distinct(),
+        select(literal("assigned_to"),
+               func.coalesce(acceptor.first_name + " " + acceptor.last_name, UNASSIGNED))
+        .select_from(Opportunity)
+        .outerjoin(acceptor, Opportunity.acceptor_id == acceptor.id)
+        .distinct()
+    )
+
+    filter_values: Dict[str, Set[str]] = {
+        "title": set(),
+        "status": set(),
+        "created_by": set(),
+        "assigned_to": set()
+    }
+    for filter_id, value in db.execute(statement):
+        if value is not None:
+            filter_values[filter_id].add(value)
+
+    return filter_values
+
+def load_member_statistics(db: Session, team: Optional[str] = None) -> List[Tuple[User, int, int, Optional[timedelta]]]:
+    """
+    Load team members together with their ticket statistics in one GROUP BY query.
+
+    A ticket counts for a member when they created or accepted it.
+
+    Args:
+        db: Open database session
+        team: Only include members of this team (None for everyone)
+
+    Returns:
+        List of (user, active count, completed count, average response time)
+    """
+    is_completed = Opportunity.status == "completed"
+
+    query = (
+        db.query(
+            User,
+            func.count(Opportunity.id).filter(Opportunity.status.in_(ACTIVE_STATUSES)).label("active"),
+            func.count(Opportunity.id).filter(is_completed).label("completed"),
+            func.avg(Opportunity.completed_at - Opportunity.created_at).filter(is_completed).label("avg_response")
+        )
+        .outerjoin(Opportunity, or_(Opportunity.creator_id == User.id, Opportunity.acceptor_id == User.id))
+        .group_by(User.id)
+        .order_by(User.first_name, User.last_name)
+    )
+    if team is not None:
+        query = query.filter(User.team == team)
+
+    return [(user, active, completed, avg_response) for user, active, completed, avg_response in query.all()]
+
+def load_team_summary(db: Session, team: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load the portal statistics cards from SQL aggregates in one statement.
+
+    Args:
+        db: Open database session
+        team: Only count tickets created or accepted by members of this team,
+              and only members of this team (None for everything)
+
+    Returns:
+        Dict with active_tickets, team_members, total_tickets,
+        completed_tickets and avg_response (timedelta or None)
+    """
+    is_completed = and_(
+        Opportunity.status == "completed",
+        Opportunity.completed_at.isnot(None),
+        Opportunity.created_at.isnot(None)
+    )
+
+    member_filter = [User.is_active == True]
+    ticket_filter = []
+    if team is not None:
+        member_filter.append(User.team == team)
+        team_ids = select(User.id).where(User.team == team)
+        ticket_filter.append(or_(Opportunity.creator_id.in_(team_ids), Opportunity.acceptor_id.in_(team_ids)))
+
+    team_members = select(func.count(User.id)).where(*member_filter).scalar_subquery()
+
+    row = db.execute(
+        select(
+            func.count(Opportunity.id).filter(Opportunity.status.in_(ACTIVE_STATUSES)).label("active_tickets"),
+            team_members.label("team_members"),
+            func.count(Opportunity.id).label("total_tickets"),
+            func.count(Opportunity.id).filter(is_completed).label("completed_tickets"),
+            func.avg(Opportunity.completed_at - Opportunity.created_at).filter(is_completed).label("avg_response")
+        ).where(*ticket_filter)
+    ).one()
+
+    return dict(row._mapping)
+
+def load_profile_statistics(db: Session, user_id) -> Dict[str, Any]:
+    """
+    Load the ticket statistics shown on a user's profile in one statement.
+
+    Response time is measured on tickets the user accepted from someone
+    else: until started_at, or until completed_at for tickets completed
+    without being started.
+
+    Args:
+        db: Open database session
+        user_id: Profile owner
+
+    Returns:
+        Dict with created, accepted, active and completed counts and
+        avg_response (timedelta or None)
+    """
+    involved = or_(Opportunity.creator_id == user_id, Opportunity.acceptor_id == user_id)
+    handled = and_(
+        Opportunity.acceptor_id == user_id,
+        or_(Opportunity.creator_id != user_id, Opportunity.creator_id.is_(None))
+    )
+    response_time = case(
+        (Opportunity.started_at.isnot(None), Opportunity.started_at - Opportunity.created_at),
+        (and_(Opportunity.status == "completed", Opportunity.completed_at.isnot(None)),
+         Opportunity.completed_at - Opportunity.created_at)
+    )
+
+    row = db.execute(
+        select(
+            func.count(Opportunity.id).filter(Opportunity.creator_id == user_id).label("created"),
+            func.count(Opportunity.id).filter(Opportunity.acceptor_id == user_id).label("accepted"),
+            func.count(Opportunity.id).filter(Opportunity.status.in_(ACTIVE_STATUSES + ("needs info",))).label("active"),
+            func.count(Opportunity.id).filter(Opportunity.status == "completed").label("completed"),
+            func.avg(response_time).filter(handled).label("avg_response")
+        ).where(involved)
+    ).one()
+
+    return dict(row._mapping)
+
+def load_update_fingerprint(db: Session, user_id: str) -> UpdateFingerprint:
+    """
+    Summarize the toolbar's NEW opportunities and unread notifications.
+
+    Returns counts and latest timestamps in one statement, without reading
+    any ticket or notification contents. A ticket or notification arriving,
+    changing or going away changes the fingerprint, so the full fetch only
+    has to run when the fingerprint differs from the previous one.
+
+    Args:
+        db: Open database session
+        user_id: Current user; their own tickets are not counted
+
+    Returns:
+        UpdateFingerprint for the user
+    """
+    new_filter = (Opportunity.status == "new", Opportunity.creator_id != user_id)
+    unread_filter = (Notification.user_id == user_id, Notification.read == False)
+
+    row = db.execute(
+        select(
+            select(func.count(Opportunity.id)).where(*new_filter).scalar_subquery(),
+            select(func.max(func.coalesce(Opportunity.updated_at, Opportunity.created_at)))
+            .where(*new_filter).scalar_subquery(),
+            select(func.count(Notification.id)).where(*unread_filter).scalar_subquery(),
+            select(func.max(Notification.created_at)).where(*unread_filter).scalar_subquery()
+        )
+    ).one()
+
+    return UpdateFingerprint(str(user_id), *row)
@@ -1,17 +1,7 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
-
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-Base = declarative_base()
+# The engine, session factory and Base all live in app.database.connection;
+# this package only re-exports them so there is a single connection pool.
+# SQLALCHEMY_DATABASE_URL is kept for migrations/env.py (Alembic)
+from ..database.connection import Base, SessionLocal, get_engine, get_db, DATABASE_URL as SQLALCHEMY_DATABASE_URL
 
 # Import models after Base is defined
 from .models import User, Opportunity, Vehicle, AdasSystem
@@ -20,17 +10,11 @@ from .models import User, Opportunity, Vehicle, AdasSystem
 __all__ = [
     'Base',
     'SessionLocal',
-    'engine',
+    'get_engine',
+    'get_db',
+    'SQLALCHEMY_DATABASE_URL',
     'User',
     'Opportunity',
     'Vehicle',
     'AdasSystem'
 ]
-
-# Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close() 
\ No newline at end of file
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Table, Boolean, JSON, LargeBinary, Interval
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Table, Boolean, JSON, LargeBinary, Interval, select
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import column_property, relationship
 from sqlalchemy.sql import func
 import uuid
 from ..database.connection import Base
@@ -9,6 +10,21 @@ from datetime import datetime, timezone
 def generate_uuid():
     return str(uuid.uuid4())
 
+# Canonical opportunity statuses (as stored, see migration 012) and their display labels
+OPPORTUNITY_STATUSES = {
+    "new": "New",
+    "in progress": "In Progress",
+    "completed": "Completed",
+    "needs info": "Needs Info"
+}
+
+def normalize_status(value):
+    """Map a status label or stored value ("In Progress", "in_progress", ...) to its canonical form"""
+    status = " ".join(str(value).replace("_", " ").split()).lower()
+    if status not in OPPORTUNITY_STATUSES:
+        raise ValueError(f"Unknown opportunity status: {value!r}")
+    return status
+
 # Many-to-many relationship table for opportunities and systems
 opportunity_systems = Table(
     'opportunity_systems', 
@@ -53,7 +69,7 @@ class Vehicle(Base):
     make = Column(String, nullable=False)
     model = Column(String, nullable=False)
     is_custom = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     created_by_id = Column(UUID(as_uuid=True), ForeignKey('users.id'))
     last_modified_at = Column(DateTime(timezone=True))
     last_modified_by_id = Column(UUID(as_uuid=True), ForeignKey('users.id'))
@@ -70,9 +86,9 @@ class Opportunity(Base):
     __tablename__ = "opportunities"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid)
-    title = Column(String, nullable=False)
+    title = Column(String, nullable=False, unique=True)  # Ticket number, see ticket_numbers
     description = Column(String)
-    status = Column(String, default="new")  # Always lowercase for consistency
+    _status = Column("status", String, nullable=False, default="new")  # Canonical value, see status
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime(timezone=True), onupdate=lambda: datetime.now(timezone.utc))
     started_at = Column(DateTime(timezone=True))
@@ -82,37 +98,55 @@ class Opportunity(Base):
     creator_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     acceptor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     systems = Column(JSONB, default=list)
-    comments = Column(JSONB, default=list)  # Store comments as JSONB array
     vin = Column(String, nullable=True)  # VIN number for the vehicle, important for BMW
+    # Vehicle as picked on the form (see migration 014); kept on the ticket so
+    # cards, exports and filters don't have to parse the description
+    vehicle_id = Column(UUID(as_uuid=True), ForeignKey("vehicles.id"), nullable=True)
+    year = Column(String, nullable=True)
+    make = Column(String, nullable=True)
+    model = Column(String, nullable=True)
 
     # Relationships
     files = relationship("File", back_populates="opportunity", cascade="all, delete-orphan")
     creator = relationship("User", foreign_keys=[creator_id], back_populates="created_opportunities")
     acceptor = relationship("User", foreign_keys=[acceptor_id], back_populates="accepted_opportunities")
+    vehicle = relationship("Vehicle")
     notifications = relationship("Notification", back_populates="opportunity", cascade="all, delete-orphan")
+    comments = relationship("Comment", back_populates="opportunity", cascade="all, delete-orphan",
+                            passive_deletes=True, order_by="(Comment.created_at, Comment.id)")
     activity_logs = relationship("ActivityLog", back_populates="opportunity", cascade="all, delete-orphan")
     systems_rel = relationship("AdasSystem", secondary="opportunity_systems", back_populates="opportunities")
 
+    @property
+    def vehicle_name(self):
+        """"YEAR MAKE MODEL", or None when the ticket has no vehicle"""
+        if self.year and self.make and self.model:
+            return f"{self.year} {self.make} {self.model}"
+        return None
+
     @property
     def display_title(self):
         """Get a display-friendly title"""
         return self.title if len(self.title) <= 50 else self.title[:47] + "..."
         
+    @hybrid_property
+    def status(self):
+        """Canonical status; filters on it compare the stored column directly"""
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        self._status = normalize_status(value)
+
     @property
     def normalized_status(self):
         """Get normalized status in lowercase"""
-        return self.status.lower() if self.status else "new"
+        return self.status or "new"
         
     @property
     def display_status(self):
         """Get a properly formatted status for display"""
-        status_map = {
-            "new": "New",
-            "in progress": "In Progress",
-            "completed": "Completed",
-            "needs info": "Needs Info"
-        }
-        return status_map.get(self.normalized_status, self.status)
+        return OPPORTUNITY_STATUSES.get(self.normalized_status, self.status)
 
 class AdasSystem(Base):
     __tablename__ = "adas_systems"
@@ -170,6 +204,34 @@ class Notification(Base):
     user = relationship("User")
     opportunity = relationship("Opportunity", back_populates="notifications")
 
+class Comment(Base):
+    __tablename__ = "comments"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid)
+    opportunity_id = Column(UUID(as_uuid=True), ForeignKey('opportunities.id', ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete="SET NULL"))
+    user_name = Column(String)  # Author's name when the comment was written
+    text = Column(Text, nullable=False)
+    type = Column(String)  # Status the comment was left with, if any
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    # Relationships
+    opportunity = relationship("Opportunity", back_populates="comments")
+    user = relationship("User")
+
+# Comment summary for the dashboard cards, read from the comments index without
+# loading the comments themselves; deferred, so only queries that ask for them
+# (see card_loader_options) pay for the subqueries
+Opportunity.comment_count = column_property(
+    select(func.count(Comment.id)).where(Comment.opportunity_id == Opportunity.id).scalar_subquery(),
+    deferred=True
+)
+Opportunity.first_comment = column_property(
+    select(Comment.text).where(Comment.opportunity_id == Opportunity.id)
+    .order_by(Comment.created_at, Comment.id).limit(1).scalar_subquery(),
+    deferred=True
+)
+
 class ActivityLog(Base):
     __tablename__ = "activity_log"
 
@@ -184,6 +246,13 @@ class ActivityLog(Base):
     user = relationship("User")
     opportunity = relationship("Opportunity", back_populates="activity_logs")
 
+class TicketCounter(Base):
+    __tablename__ = "ticket_counters"
+
+    year = Column(Integer, primary_key=True)
+    last_number = Column(Integer, nullable=False)  # Last SI-YYYY-NNNNN number issued this year
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
 class Settings(Base):
     __tablename__ = "settings"
 
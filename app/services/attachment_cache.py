@@ -0,0 +1,232 @@
+"""
+Local cache of attachments opened from Supabase storage.
+
+Downloaded files are kept under ATTACHMENT_CACHE_DIR, named by their
+SHA-256 content hash, so reopening an attachment (or another attachment
+with the same bytes) is served from disk. A download is only cached when
+its bytes match the File.hash recorded at upload; a cached entry is
+checked again the first time it is used in a process. Once the cache is
+over ATTACHMENT_CACHE_MAX_BYTES the least recently opened files are
+removed. The last use of an entry is its modification time, so the
+order survives restarts.
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+from app.config import ATTACHMENT_CACHE_DIR, ATTACHMENT_CACHE_MAX_BYTES
+from app.services.supabase_storage import SupabaseStorageService
+
+class AttachmentHashMismatchError(Exception):
+    """A download did not match the attachment's recorded hash
+
+    path is the downloaded file, outside the cache; the caller owns it.
+    """
+
+    def __init__(self, message: str, path: str):
+        super().__init__(message)
+        self.path = path
+
+class AttachmentCache:
+    """Content-hash keyed files on disk with least-recently-used eviction"""
+
+    def __init__(self, directory: str = ATTACHMENT_CACHE_DIR, max_bytes: int = ATTACHMENT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, str]" = OrderedDict()  # hash -> path, least recently used first
+        self.sizes: Dict[str, int] = {}
+        self.total_bytes = 0
+        self.verified: Set[str] = set()  # hashes checked against their bytes in this process
+        self.stats_counts = {"hits": 0, "misses": 0, "evictions": 0, "rejected": 0}
+        self.lock = threading.RLock()
+        self.scan()
+
+    def scan(self) -> None:
+        """Load the entries already on disk, oldest use first"""
+        found = []
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                # Leftover partial downloads
+                if name.endswith(".part"):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, os.path.splitext(name)[0], path, stat.st_size))
+        with self.lock:
+            for _, file_hash, path, size in sorted(found):
+                self.entries[file_hash] = path
+                self.sizes[file_hash] = size
+                self.total_bytes += size
+
+    def get(self, file_hash: str) -> Optional[str]:
+        """
+        Path of the cached copy of a file, or None if it is not cached.
+
+        An entry whose bytes no longer match its hash is removed.
+        """
+        file_hash = file_hash.lower()
+        with self.lock:
+            path = self.entries.get(file_hash)
+            if path is None or not os.path.exists(path):
+                if path is not None:
+                    self._forget(file_hash)
+                self.stats_counts["misses"] += 1
+                return None
+            needs_check = file_hash not in self.verified
+
+        if needs_check and SupabaseStorageService.calculate_file_hash(path) != file_hash:
+            print(f"Cached attachment {path} does not match its hash; removing it")
+            with self.lock:
+                self._remove(file_hash)
+                self.stats_counts["misses"] += 1
+            return None
+
+        with self.lock:
+            if file_hash not in self.entries:
+                self.stats_counts["misses"] += 1
+                return None
+            self.verified.add(file_hash)
+            self.entries.move_to_end(file_hash)
+            self.stats_counts["hits"] += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def put(self, file_hash: str, source_path: str, extension: str = "") -> Optional[str]:
+        """
+        Move a downloaded file into the cache.
+
+        Args:
+            file_hash: Expected SHA-256 of the file (File.hash)
+            source_path: Downloaded file; moved, so it must be on the same file system
+            extension: Suffix for the cached file, so external viewers recognise it
+
+        Returns:
+            Path of the cached file, or None if its bytes do not match the hash
+            (the download is then left in place)
+        """
+        file_hash = file_hash.lower()
+        if SupabaseStorageService.calculate_file_hash(source_path) != file_hash:
+            print(f"Downloaded attachment does not match its hash {file_hash}; not caching it")
+            with self.lock:
+                self.stats_counts["rejected"] += 1
+            return None
+
+        path = os.path.join(self.directory, file_hash + extension.lower())
+        size = os.path.getsize(source_path)
+        with self.lock:
+            if file_hash in self.entries:
+                self._remove(file_hash)
+            os.replace(source_path, path)
+            self.entries[file_hash] = path
+            self.sizes[file_hash] = size
+            self.total_bytes += size
+            self.verified.add(file_hash)
+            self.evict(keep=file_hash)
+        return path
+
+    def fetch(self, storage_path: str, file_hash: str, extension: str = "") -> Optional[str]:
+        """
+        Local path of a stored attachment: the cached copy, or a new download.
+
+        Args:
+            storage_path: Path of the file in Supabase storage
+            file_hash: SHA-256 recorded for the file (File.hash)
+            extension: Suffix for a newly cached file
+
+        Returns:
+            Path of the cached file, None if the download failed
+
+        Raises:
+            AttachmentHashMismatchError: The download does not match file_hash;
+                it is not cached but kept in a temp file (the error's path)
+        """
+        cached = self.get(file_hash)
+        if cached:
+            print(f"Opening cached attachment: {cached}")
+            return cached
+
+        os.makedirs(self.directory, exist_ok=True)
+        handle, part_path = tempfile.mkstemp(suffix=".part", dir=self.directory)
+        os.close(handle)
+        start = time.perf_counter()
+        if not SupabaseStorageService.download_file(storage_path, part_path):
+            self._discard(part_path)
+            return None
+        print(f"Downloaded {storage_path} in {(time.perf_counter() - start) * 1000:.1f}ms")
+        path = self.put(file_hash, part_path, extension)
+        if path is None:
+            handle, temp_path = tempfile.mkstemp(suffix=extension)
+            os.close(handle)
+            shutil.move(part_path, temp_path)
+            raise AttachmentHashMismatchError(f"Download of {storage_path} does not match its hash", temp_path)
+        return path
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Remove least recently used entries until the cache fits its cap"""
+        with self.lock:
+            for file_hash in list(self.entries):
+                if self.total_bytes <= self.max_bytes:
+                    break
+                if file_hash == keep:
+                    continue
+                if self._remove(file_hash):
+                    self.stats_counts["evictions"] += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            for file_hash in list(self.entries):
+                self._remove(file_hash)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {**self.stats_counts, "entries": len(self.entries), "bytes": self.total_bytes,
+                    "max_bytes": self.max_bytes}
+
+    def _remove(self, file_hash: str) -> bool:
+        """Delete an entry's file; an entry whose file is open elsewhere (Windows) is kept"""
+        try:
+            os.remove(self.entries[file_hash])
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Could not remove cached attachment {self.entries[file_hash]}: {e}")
+            return False
+        self._forget(file_hash)
+        return True
+
+    def _forget(self, file_hash: str) -> None:
+        self.entries.pop(file_hash, None)
+        self.total_bytes -= self.sizes.pop(file_hash, 0)
+        self.verified.discard(file_hash)
+
+    @staticmethod
+    def _discard(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+_attachment_cache = None
+_attachment_cache_lock = threading.Lock()
+
+def get_attachment_cache() -> AttachmentCache:
+    """Get the process-wide attachment cache"""
+    global _attachment_cache
+    with _attachment_cache_lock:
+        if _attachment_cache is None:
+            _attachment_cache = AttachmentCache()
+        return _attachment_cache
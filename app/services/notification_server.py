@@ -0,0 +1,127 @@
+"""
+Websocket notification hub.
+
+Serves notification_websocket_endpoint at /ws/notifications/{user_id} and
+forwards the database change notifications added in migration 010 to the
+connected clients: notification rows go to their user, opportunity changes
+are broadcast to everyone. Database pool counters are served at
+/stats/pool. Run it next to the database:
+
+    python -m app.services.notification_server [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import asyncio
+import json
+import traceback
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+from uuid import UUID
+
+import uvicorn
+from fastapi import FastAPI, WebSocket
+
+from app.database.connection import CHANGE_CHANNEL, configure_pool_logging, connect_listener, pool_stats
+from app.services.notification_service import (NotificationManager, notification_manager,
+                                               notification_websocket_endpoint)
+
+# Seconds to wait before relistening, doubled after each failure up to the maximum
+RECONNECT_DELAY = 2.0
+MAX_RECONNECT_DELAY = 60.0
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+async def dispatch_change(manager: NotificationManager, payload: Dict[str, Any]) -> None:
+    """Forward one database change to the clients it concerns"""
+    if payload.get("table") == "notifications":
+        if payload.get("user_id"):
+            await manager.send_notification(UUID(payload["user_id"]), {"event": "notification", **payload})
+    else:
+        await manager.broadcast({"event": "opportunity", **payload})
+
+async def forward_database_changes(manager: NotificationManager) -> None:
+    """LISTEN for database changes and dispatch them until cancelled"""
+    loop = asyncio.get_running_loop()
+    delay = RECONNECT_DELAY
+    while True:
+        connection = None
+        try:
+            # A dedicated, direct connection, checked to actually receive notifications
+            connection = await asyncio.to_thread(connect_listener, CHANGE_CHANNEL)
+            print(f"Forwarding database changes from {CHANGE_CHANNEL}")
+            delay = RECONNECT_DELAY
+
+            readable = asyncio.Event()
+            loop.add_reader(connection.fileno(), readable.set)
+            try:
+                while True:
+                    await readable.wait()
+                    readable.clear()
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        try:
+                            payload = json.loads(notify.payload)
+                        except ValueError:
+                            print(f"Ignoring malformed change payload: {notify.payload!r}")
+                            continue
+                        await dispatch_change(manager, payload)
+            finally:
+                loop.remove_reader(connection.fileno())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Database change listener error: {str(e)}")
+            print(traceback.format_exc())
+        finally:
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+def create_app(listen_database: bool = True) -> FastAPI:
+    """
+    Build the notification hub.
+
+    Args:
+        listen_database: Forward database change notifications to clients;
+                         disable to serve websockets only (e.g. for load tests)
+    """
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        forwarder = asyncio.create_task(forward_database_changes(notification_manager)) if listen_database else None
+        try:
+            yield
+        finally:
+            if forwarder is not None:
+                forwarder.cancel()
+
+    app = FastAPI(title="SI Opportunity Manager notifications", lifespan=lifespan)
+
+    @app.websocket("/ws/notifications/{user_id}")
+    async def notifications(websocket: WebSocket, user_id: UUID) -> None:
+        await notification_websocket_endpoint(websocket, user_id)
+
+    @app.get("/stats/pool")
+    async def database_pool_stats() -> Dict[str, Any]:
+        return pool_stats()
+
+    return app
+
+app = create_app()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the websocket notification hub")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    args = parser.parse_args()
+
+    configure_pool_logging()
+    uvicorn.run(app, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,11 @@ from typing import Dict, Set, Optional, Any, Protocol
 from datetime import datetime
 from uuid import UUID
 import asyncio
-from fastapi import Depends
-from sqlalchemy.orm import Session
 from zoneinfo import ZoneInfo
+from sqlalchemy import false, func, insert, literal, select
 
-from app.models.models import Notification
+from app.database.connection import SessionLocal
+from app.models.models import Notification, User
 
 class NotificationModel(Protocol):
     id: UUID
@@ -29,37 +29,96 @@ class WebSocketConnection(Protocol):
     async def receive_json(self) -> Dict[str, Any]: ...
     async def close(self) -> None: ...
 
+# Messages buffered per connection; a connection that falls this far behind is evicted
+SEND_QUEUE_SIZE = 100
+
+class ConnectionSender:
+    """Delivers one connection's queued messages from its own task
+
+    Queuing never blocks the caller, so a slow client only delays itself.
+    A client whose queue fills up is evicted; one whose connection dies
+    (including failed websocket pings) is evicted when its send fails.
+    """
+    def __init__(self, user_id: UUID, websocket: WebSocketConnection, manager: "NotificationManager") -> None:
+        self.user_id = user_id
+        self.websocket = websocket
+        self.manager = manager
+        self.queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.task = asyncio.create_task(self._run())
+
+    def offer(self, data: Dict[str, Any]) -> bool:
+        """Queue a message; False when the connection has fallen too far behind"""
+        try:
+            self.queue.put_nowait(data)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                data = await self.queue.get()
+                await self.websocket.send_json(data)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await self.manager.evict(self)
+
+    def stop(self) -> None:
+        """Stop delivering queued messages"""
+        if self.task is not asyncio.current_task():
+            self.task.cancel()
+
+    async def close(self) -> None:
+        self.stop()
+        try:
+            await self.websocket.close()
+        except Exception:
+            pass
+
 class NotificationManager:
     def __init__(self) -> None:
-        self.active_connections: Dict[UUID, Set[WebSocketConnection]] = {}
+        self.active_connections: Dict[UUID, Dict[WebSocketConnection, ConnectionSender]] = {}
         self._background_tasks: Set[asyncio.Task[Any]] = set()
+        self.evicted_count = 0
 
     async def connect(self, user_id: UUID, websocket: WebSocketConnection) -> None:
         if user_id not in self.active_connections:
-            self.active_connections[user_id] = set()
-        self.active_connections[user_id].add(websocket)
+            self.active_connections[user_id] = {}
+        self.active_connections[user_id][websocket] = ConnectionSender(user_id, websocket, self)
 
     async def disconnect(self, user_id: UUID, websocket: WebSocketConnection) -> None:
         if user_id in self.active_connections:
-            self.active_connections[user_id].remove(websocket)
+            sender = self.active_connections[user_id].pop(websocket, None)
+            if sender is not None:
+                sender.stop()
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
 
+    async def evict(self, sender: ConnectionSender) -> None:
+        """Drop a connection that cannot keep up and close it"""
+        connections = self.active_connections.get(sender.user_id, {})
+        if connections.get(sender.websocket) is not sender:
+            return
+        await self.disconnect(sender.user_id, sender.websocket)
+        self.evicted_count += 1
+        # Closing waits for the congested socket, so never block the caller on it
+        task = asyncio.create_task(sender.close())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     async def send_notification(self, user_id: UUID, notification_data: Dict[str, Any]) -> None:
         if user_id in self.active_connections:
-            dead_connections: Set[WebSocketConnection] = set()
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(notification_data)
-                except Exception:
-                    dead_connections.add(connection)
-            
-            for dead_connection in dead_connections:
-                self.active_connections[user_id].remove(dead_connection)
+            slow_senders = [sender for sender in list(self.active_connections[user_id].values())
+                            if not sender.offer(notification_data)]
+            for sender in slow_senders:
+                await self.evict(sender)
 
     async def broadcast(self, notification_data: Dict[str, Any]) -> None:
-        for user_id in self.active_connections:
-            await self.send_notification(user_id, notification_data)
+        await asyncio.gather(*(
+            self.send_notification(user_id, notification_data)
+            for user_id in list(self.active_connections)
+        ))
 
 notification_manager = NotificationManager()
 
@@ -91,6 +150,48 @@ async def handle_notification_event(
     
     await notification_manager.send_notification(user_id, notification_data)
 
+def notify_all_users(
+    db: Any,
+    opportunity_id: UUID,
+    notification_type: str,
+    message: str,
+    exclude_user_id: Optional[UUID] = None
+) -> int:
+    """
+    Add the same unread notification for every user in one INSERT ... SELECT.
+
+    Runs in the caller's transaction; the rows are written with the commit.
+
+    Args:
+        db: Open database session
+        opportunity_id: Ticket the notification refers to
+        notification_type: Notification type, e.g. "new_opportunity"
+        message: Notification text
+        exclude_user_id: User to leave out, usually the one who caused it
+
+    Returns:
+        Number of notifications created
+    """
+    recipients = select(
+        func.gen_random_uuid(),
+        User.id,
+        literal(opportunity_id, Notification.opportunity_id.type),
+        literal(notification_type),
+        literal(message),
+        false(),
+        func.now()
+    )
+    if exclude_user_id is not None:
+        recipients = recipients.where(User.id != exclude_user_id)
+
+    result = db.execute(
+        insert(Notification).from_select(
+            ["id", "user_id", "opportunity_id", "type", "message", "read", "created_at"],
+            recipients
+        )
+    )
+    return result.rowcount
+
 async def mark_notification_read(
     notification_id: UUID,
     user_id: UUID,
@@ -109,8 +210,7 @@ async def mark_notification_read(
 
 async def notification_websocket_endpoint(
     websocket: WebSocketConnection,
-    user_id: UUID,
-    db: Session = Depends()
+    user_id: UUID
 ) -> None:
     await websocket.accept()
     await notification_manager.connect(user_id, websocket)
@@ -120,10 +220,18 @@ async def notification_websocket_endpoint(
             data = await websocket.receive_json()
             if data.get("action") == "mark_read":
                 notification_id = UUID(data["notification_id"])
-                success = await mark_notification_read(notification_id, user_id, db)
+                # Only hold a session while handling a request, not for the whole connection
+                db = SessionLocal()
+                try:
+                    success = await mark_notification_read(notification_id, user_id, db)
+                finally:
+                    db.close()
                 await websocket.send_json({"success": success})
     except Exception:
         pass
     finally:
         await notification_manager.disconnect(user_id, websocket)
-        await websocket.close() 
\ No newline at end of file
+        try:
+            await websocket.close()
+        except Exception:
+            pass
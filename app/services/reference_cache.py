@@ -0,0 +1,164 @@
+"""
+Local cache of reference data: vehicles, ADAS systems and user names.
+
+Each cached table has a version stamp in the settings table, bumped by the
+migration 015 triggers whenever the table changes. Reads are served from
+memory after a single version check; a table is fetched again only when its
+version moved. The cached rows are also kept in a pickle snapshot with their
+versions, so a fresh process starts without fetching anything that has not
+changed since it last ran.
+"""
+import os
+import pickle
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import CACHE_DIR
+from app.models.models import AdasSystem, Settings, User, Vehicle
+
+REFERENCE_CACHE_FILE = os.path.join(CACHE_DIR, 'reference_data.pickle')
+
+# Settings key holding a table's version: reference_version:<table>
+VERSION_KEY_PREFIX = "reference_version:"
+
+# Columns cached per table
+REFERENCE_QUERIES = {
+    "vehicles": select(Vehicle.id, Vehicle.year, Vehicle.make, Vehicle.model),
+    "adas_systems": select(AdasSystem.id, AdasSystem.code, AdasSystem.name),
+    "users": select(User.id, User.username, User.first_name, User.last_name, User.team, User.role, User.is_active),
+}
+
+class ReferenceCache:
+    """Version-checked in-memory copy of the reference tables"""
+
+    def __init__(self, path: str = REFERENCE_CACHE_FILE):
+        self.path = path
+        self.versions = {}     # table -> server version the rows were fetched at
+        self.rows = {}         # table -> list of row tuples
+        self.generations = {}  # table -> local counter, bumped on every fetch
+        self.derived = {}      # (table, name) -> (generation, value)
+        self.snapshot_loaded = False
+        self.lock = threading.RLock()
+
+    def load_versions(self, db: Session, tables: Iterable[str]) -> Dict[str, Optional[int]]:
+        """Current server versions; None for tables without one (migration 015 not applied)"""
+        keys = {VERSION_KEY_PREFIX + table: table for table in tables}
+        versions = {table: None for table in keys.values()}
+        for key, value in db.execute(select(Settings.key, Settings.value).where(Settings.key.in_(keys))):
+            if isinstance(value, dict) and value.get("version") is not None:
+                versions[keys[key]] = int(value["version"])
+        return versions
+
+    def refresh(self, db: Session, tables: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Fetch the tables whose server version changed.
+
+        Args:
+            db: Open database session
+            tables: Tables to check (all cached tables by default)
+
+        Returns:
+            Tables that were fetched
+        """
+        tables = list(tables or REFERENCE_QUERIES)
+        with self.lock:
+            if not self.snapshot_loaded:
+                self.load_snapshot()
+
+            versions = self.load_versions(db, tables)
+            stale = [table for table in tables
+                     if versions[table] is None or versions[table] != self.versions.get(table)]
+            for table in stale:
+                self.rows[table] = [tuple(str(value) if isinstance(value, UUID) else value for value in row)
+                                    for row in db.execute(REFERENCE_QUERIES[table])]
+                self.versions[table] = versions[table]
+                self.generations[table] = self.generations.get(table, 0) + 1
+
+            if any(versions[table] is not None for table in stale):
+                try:
+                    self.save_snapshot()
+                except OSError as e:
+                    print(f"Error saving reference data cache: {str(e)}")
+            return stale
+
+    def get(self, db: Session, table: str) -> List[Tuple]:
+        """Rows of a reference table, refetched only if its version changed"""
+        with self.lock:
+            self.refresh(db, [table])
+            return self.rows[table]
+
+    def get_derived(self, db: Session, table: str, name: str, build: Callable[[List[Tuple], Optional[int]], Any]) -> Any:
+        """
+        A value computed from a table's rows, rebuilt only after a refetch.
+
+        Args:
+            db: Open database session
+            table: Reference table the value is built from
+            name: Name of the value, unique per table
+            build: Called with the rows and their version to build the value
+        """
+        with self.lock:
+            rows = self.get(db, table)
+            generation = self.generations[table]
+            cached = self.derived.get((table, name))
+            if cached is None or cached[0] != generation:
+                cached = (generation, build(rows, self.versions[table]))
+                self.derived[(table, name)] = cached
+            return cached[1]
+
+    def load_snapshot(self) -> None:
+        """Start from the rows saved by a previous run, if the snapshot is readable"""
+        self.snapshot_loaded = True
+        try:
+            with open(self.path, 'rb') as f:
+                snapshot = pickle.load(f)
+            for table, (version, rows) in snapshot.items():
+                if table in REFERENCE_QUERIES and version is not None:
+                    self.versions[table] = version
+                    self.rows[table] = rows
+                    self.generations[table] = self.generations.get(table, 0) + 1
+        except (OSError, pickle.PickleError, EOFError, ValueError, TypeError, AttributeError):
+            pass
+
+    def save_snapshot(self) -> None:
+        """Write the versioned tables, replacing the previous snapshot atomically"""
+        snapshot = {table: (version, self.rows[table]) for table, version in self.versions.items()
+                    if version is not None}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.path)
+
+_reference_cache = None
+_reference_cache_lock = threading.Lock()
+
+def get_reference_cache() -> ReferenceCache:
+    """Get the process-wide reference data cache"""
+    global _reference_cache
+    with _reference_cache_lock:
+        if _reference_cache is None:
+            _reference_cache = ReferenceCache()
+        return _reference_cache
+
+def get_user_names(db: Session) -> Dict[str, str]:
+    """Display names ("First Last") keyed by user id string"""
+    return get_reference_cache().get_derived(
+        db, "users", "names",
+        lambda rows, version: {user_id: f"{first_name} {last_name}"
+                               for user_id, _, first_name, last_name, _, _, _ in rows}
+    )
+
+def get_user_name(db: Session, user_id, default: str = "Unknown") -> str:
+    """Display name of a user, from the cache"""
+    if user_id is None:
+        return default
+    return get_user_names(db).get(str(user_id), default)
+
+def get_adas_systems(db: Session) -> List[Tuple[str, str, str]]:
+    """(id, code, name) of every ADAS system, from the cache"""
+    return get_reference_cache().get(db, "adas_systems")
@@ -0,0 +1,363 @@
+"""
+Local stand-in for the Supabase Storage API.
+
+Implements the storage endpoints SupabaseStorageService uses (bucket
+listing, upload, resumable (TUS) upload, exists, list, signed URLs,
+download and delete) against an in-memory object store, so storage code
+can be exercised and benchmarked offline. A per-connection delay stands in for the TCP/TLS
+handshake to the hosted service and a per-request delay for its round
+trip; the server counts connections and requests:
+
+    python -m app.services.storage_stub_server [--port 54321] [--handshake-ms 40] [--latency-ms 20]
+
+Point SUPABASE_URL at http://127.0.0.1:<port> (any SUPABASE_SERVICE_KEY
+works). Tests use patched_storage() instead, and can set
+StubStorage.drop_patch_after to have the server close the connection,
+without answering, on a resumable upload chunk.
+"""
+import argparse
+import base64
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 54321
+PREFIX = "/storage/v1"
+
+class StubStorage:
+    """Objects by (bucket, path), plus connection and request counters"""
+
+    def __init__(self, buckets=("opportunity-files",)):
+        self.lock = threading.Lock()
+        self.buckets = list(buckets)
+        self.objects: Dict[Tuple[str, str], bytes] = {}
+        # Unfinished resumable uploads by id
+        self.uploads: Dict[str, Dict[str, Any]] = {}
+        self.connections = 0
+        self.requests = 0
+        self.chunks = 0
+        # Chunks to accept before dropping the connection on the next one (once)
+        self.drop_patch_after: Optional[int] = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"connections": self.connections, "requests": self.requests,
+                    "objects": len(self.objects), "chunks": self.chunks,
+                    "uploads": len(self.uploads)}
+
+class StubStorageHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive between requests
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle delay the body
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.storage.lock:
+            self.server.storage.connections += 1
+        time.sleep(self.server.handshake_delay)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _route(self) -> Tuple[str, ...]:
+        path = urlparse(self.path).path
+        if not path.startswith(PREFIX + "/"):
+            return ()
+        return tuple(unquote(part) for part in path[len(PREFIX) + 1:].split("/") if part)
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, body: Any = None, content_type: str = "application/json",
+              headers: Optional[Dict[str, str]] = None) -> None:
+        if isinstance(body, (dict, list)):
+            payload = json.dumps(body).encode()
+        else:
+            payload = body or b""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def _error(self, status: int, error: str, message: str) -> None:
+        self._send(status, {"statusCode": str(status), "error": error, "message": message})
+
+    def _handle(self) -> None:
+        storage = self.server.storage
+        with storage.lock:
+            storage.requests += 1
+        time.sleep(self.server.request_delay)
+        route = self._route()
+        body = self._body()
+        handler = getattr(self, f"_{self.command.lower()}", None)
+        if not route or handler is None:
+            self._error(404, "not_found", "Unknown route")
+            return
+        handler(storage, route, body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = do_PATCH = _handle
+
+    def _get(self, storage, route, body):
+        if route == ("bucket",):
+            now = datetime.now(timezone.utc).isoformat()
+            self._send(200, [{"id": name, "name": name, "owner": "", "public": False,
+                              "created_at": now, "updated_at": now,
+                              "file_size_limit": None, "allowed_mime_types": None}
+                             for name in storage.buckets])
+        elif route[0] == "object" and len(route) > 2:
+            data = storage.objects.get((route[1], "/".join(route[2:])))
+            if data is None:
+                self._error(404, "not_found", "Object not found")
+            else:
+                self._send(200, data, "application/octet-stream")
+        else:
+            self._error(404, "not_found", "Unknown route")
+
+    def _head(self, storage, route, body):
+        if route[:2] == ("upload", "resumable") and len(route) == 3:
+            with storage.lock:
+                upload = storage.uploads.get(route[2])
+                offset = len(upload["data"]) if upload else 0
+            if upload is None:
+                self._error(404, "not_found", "Upload not found")
+            else:
+                self._send(200, headers={"Tus-Resumable": "1.0.0", "Upload-Offset": str(offset),
+                                         "Upload-Length": str(upload["length"]),
+                                         "Cache-Control": "no-store"})
+        else:
+            self._get(storage, route, body)
+
+    def _post(self, storage, route, body):
+        if route[:2] == ("object", "list") and len(route) == 3:
+            options = json.loads(body or b"{}")
+            prefix = options.get("prefix", "").strip("/")
+            prefix = f"{prefix}/" if prefix else ""
+            with storage.lock:
+                names = sorted(path[len(prefix):] for bucket, path in storage.objects
+                               if bucket == route[2] and path.startswith(prefix))
+                sizes = {name: len(storage.objects[(route[2], prefix + name)]) for name in names}
+            self._send(200, [{"name": name, "id": name, "metadata": {"size": sizes[name]}}
+                             for name in names if "/" not in name])
+        elif route[:2] == ("object", "sign") and len(route) > 3:
+            path = "/".join(route[3:])
+            if (route[2], path) not in storage.objects:
+                self._error(404, "not_found", "Object not found")
+            else:
+                self._send(200, {"signedURL": f"/object/sign/{route[2]}/{path}?token=stub"})
+        elif route[0] == "object" and len(route) > 2:
+            self._upload(storage, route[1], "/".join(route[2:]), body, overwrite=self.headers.get("x-upsert") == "true")
+        elif route == ("upload", "resumable"):
+            self._create_upload(storage)
+        else:
+            self._error(404, "not_found", "Unknown route")
+
+    def _put(self, storage, route, body):
+        if route[0] == "object" and len(route) > 2:
+            self._upload(storage, route[1], "/".join(route[2:]), body, overwrite=True)
+        else:
+            self._error(404, "not_found", "Unknown route")
+
+    def _patch(self, storage, route, body):
+        if route[:2] != ("upload", "resumable") or len(route) != 3:
+            self._error(404, "not_found", "Unknown route")
+            return
+        with storage.lock:
+            if storage.drop_patch_after is not None:
+                if storage.drop_patch_after == 0:
+                    storage.drop_patch_after = None
+                    drop = True
+                else:
+                    storage.drop_patch_after -= 1
+                    drop = False
+            else:
+                drop = False
+        if drop:
+            # The chunk is lost along with the connection; the client must resume
+            self.close_connection = True
+            return
+
+        with storage.lock:
+            upload = storage.uploads.get(route[2])
+            offset = len(upload["data"]) if upload else 0
+            if upload is None:
+                status = 404
+            elif int(self.headers.get("Upload-Offset", -1)) != offset:
+                status = 409
+            elif offset + len(body) > upload["length"]:
+                status = 413
+            else:
+                status = 204
+                upload["data"] += body
+                offset = len(upload["data"])
+                storage.chunks += 1
+                if offset == upload["length"]:
+                    storage.objects[(upload["bucket"], upload["path"])] = bytes(upload["data"])
+                    del storage.uploads[route[2]]
+        if status == 404:
+            self._error(404, "not_found", "Upload not found")
+        elif status == 409:
+            self._error(409, "conflict", "Upload-Offset does not match the upload's offset")
+        elif status == 413:
+            self._error(413, "too_large", "Chunk goes past the upload's length")
+        else:
+            self._send(204, headers={"Tus-Resumable": "1.0.0", "Upload-Offset": str(offset)})
+
+    def _create_upload(self, storage):
+        metadata = {}
+        for item in (self.headers.get("Upload-Metadata") or "").split(","):
+            if item.strip():
+                key, _, value = item.strip().partition(" ")
+                metadata[key] = base64.b64decode(value).decode()
+        bucket, path = metadata.get("bucketName"), metadata.get("objectName")
+        length = self.headers.get("Upload-Length")
+        if not bucket or not path or length is None:
+            self._error(400, "invalid_request", "Upload-Length and bucketName/objectName metadata are required")
+            return
+        with storage.lock:
+            exists = self.headers.get("x-upsert") != "true" and (bucket, path) in storage.objects
+            if not exists:
+                upload_id = f"{len(storage.uploads)}-{time.time_ns()}"
+                storage.uploads[upload_id] = {"bucket": bucket, "path": path,
+                                              "length": int(length), "data": bytearray()}
+        if exists:
+            self._error(409, "Duplicate", "The resource already exists")
+        else:
+            self._send(201, headers={"Tus-Resumable": "1.0.0",
+                                     "Location": f"{PREFIX}/upload/resumable/{upload_id}"})
+
+    def _delete(self, storage, route, body):
+        if route[0] == "object" and len(route) == 2:
+            prefixes = json.loads(body or b"{}").get("prefixes", [])
+            with storage.lock:
+                removed = [path for path in prefixes if storage.objects.pop((route[1], path), None) is not None]
+            self._send(200, [{"name": path, "bucket_id": route[1]} for path in removed])
+        else:
+            self._error(404, "not_found", "Unknown route")
+
+    def _upload(self, storage, bucket, path, body, overwrite):
+        data = self._file_data(body)
+        with storage.lock:
+            if not overwrite and (bucket, path) in storage.objects:
+                exists = True
+            else:
+                exists = False
+                storage.objects[(bucket, path)] = data
+        if exists:
+            # Supabase reports duplicates as a 400 with a 409 status code in the body
+            self._send(400, {"statusCode": "409", "error": "Duplicate", "message": "The resource already exists"})
+        else:
+            self._send(200, {"Key": f"{bucket}/{path}", "Id": path})
+
+    def _file_data(self, body: bytes) -> bytes:
+        content_type = self.headers.get("Content-Type", "")
+        if not content_type.startswith("multipart/form-data"):
+            return body
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+        for part in message.iter_parts():
+            if part.get_param("name", header="content-disposition") == "file":
+                return part.get_payload(decode=True) or b""
+        return b""
+
+class StubStorageServer(ThreadingHTTPServer):
+    """Threaded stub server; start() runs it in the background"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = 0, handshake_ms: float = 0.0,
+                 latency_ms: float = 0.0, storage: Optional[StubStorage] = None):
+        super().__init__((host, port), StubStorageHandler)
+        self.storage = storage or StubStorage()
+        self.handshake_delay = handshake_ms / 1000
+        self.request_delay = latency_ms / 1000
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubStorageServer":
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+@contextmanager
+def patched_storage(state_dir: str, **settings) -> Iterator[StubStorageServer]:
+    """
+    Run a stub server and point SupabaseStorageService at it.
+
+    The storage settings are patched in app.config and in the service
+    module (which copied them at import), the shared client is closed on
+    entry and exit, and the dedup index and counters start empty, so
+    several tests in one process each get a fresh stub.
+
+    Args:
+        state_dir: Directory for resumable upload state (RESUMABLE_STATE_DIR)
+        settings: Other supabase_storage globals to patch, e.g.
+                  SUPABASE_CHUNK_SIZE=256 * 1024
+    """
+    from app import config
+    from app.services import supabase_storage
+
+    server = StubStorageServer().start()
+    patches = {"SUPABASE_URL": server.url, "SUPABASE_SERVICE_KEY": "stub-service-key",
+               "SUPABASE_BUCKET": server.storage.buckets[0], "RESUMABLE_STATE_DIR": state_dir,
+               **settings}
+    saved = [(module, name, getattr(module, name)) for name in patches
+             for module in (config, supabase_storage) if hasattr(module, name)]
+    supabase_storage.SupabaseStorageService.close_client()
+    for module, name, _ in saved:
+        setattr(module, name, patches[name])
+    supabase_storage._hash_index.clear()
+    for key in supabase_storage._dedup_stats:
+        supabase_storage._dedup_stats[key] = 0
+    try:
+        yield server
+    finally:
+        supabase_storage.SupabaseStorageService.close_client()
+        for module, name, value in saved:
+            setattr(module, name, value)
+        supabase_storage._hash_index.clear()
+        server.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Supabase Storage API")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--handshake-ms", type=float, default=0.0, help="Delay per new connection")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay per request")
+    args = parser.parse_args()
+
+    server = StubStorageServer(args.host, args.port, args.handshake_ms, args.latency_ms)
+    print(f"Stub storage server on {server.url}{PREFIX}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served {server.storage.stats()}")
+
+if __name__ == "__main__":
+    main()
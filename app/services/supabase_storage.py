@@ -1,35 +1,137 @@
 import os
+import io
+import base64
 import hashlib
-from typing import Optional, Any, List, Dict
+import json
+import threading
+import time
+from typing import Optional, Any, Callable, List, Dict, TYPE_CHECKING
 import mimetypes
 import tempfile
 import platform
 import subprocess
-from app.config import SUPABASE_URL, SUPABASE_KEY, SUPABASE_SERVICE_KEY, SUPABASE_BUCKET
+from urllib.parse import urljoin
+from app.config import (SUPABASE_URL, SUPABASE_KEY, SUPABASE_SERVICE_KEY, SUPABASE_BUCKET,
+                        SUPABASE_MAX_CONNECTIONS, SUPABASE_KEEPALIVE_EXPIRY, SUPABASE_TIMEOUT,
+                        SUPABASE_CHUNK_SIZE, SUPABASE_RESUMABLE_THRESHOLD, CACHE_DIR)
 
-from supabase import create_client, Client
 from dotenv import load_dotenv
+from app.database.connection import SessionLocal
+from app.models.models import File
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 # Load environment variables
 load_dotenv()
 
+# Process-wide client, see SupabaseStorageService.get_supabase_client()
+_client: Optional["Client"] = None
+_client_lock = threading.Lock()
+_client_stats = {
+    "constructions": 0,
+    "construction_ms": 0.0,
+    "reuses": 0,
+}
+
+# Content hash -> storage path of objects known to be stored, see find_stored_copy()
+_hash_index: Dict[str, str] = {}
+_dedup_lock = threading.Lock()
+_dedup_stats = {
+    "hits": 0,
+    "uploads": 0,
+    "bytes_saved": 0,
+    "bytes_uploaded": 0,
+}
+
+# Resume state of unfinished chunked uploads, one JSON file per content hash
+RESUMABLE_STATE_DIR = os.path.join(CACHE_DIR, 'uploads')
+
+class ResumableUploadError(Exception):
+    """A resumable upload request failed; status is the HTTP status code"""
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+class ProgressReader(io.BufferedReader):
+    """File reader that reports the bytes read so far, used for upload progress"""
+
+    def __init__(self, path: str, callback: Callable[[int, int], None]):
+        super().__init__(io.FileIO(path, "rb"))
+        self.total = os.path.getsize(path)
+        self.sent = 0
+        self.callback = callback
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        chunk = super().read(size)
+        if chunk:
+            self.sent += len(chunk)
+            self.callback(self.sent, self.total)
+        return chunk
+
 class SupabaseStorageService:
     """Service for interacting with Supabase Storage"""
     
     @staticmethod
-    def get_supabase_client() -> Client:
+    def get_supabase_client() -> "Client":
         """
-        Get a Supabase client using the service role key.
+        Get the shared Supabase client using the service role key.
+
+        The client is created once per process and reuses one keep-alive
+        HTTP connection pool for every call; it is safe to use from
+        several threads.
         
         Returns:
             Supabase client
         """
-        # Check if Supabase URL and key are configured
-        if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-            raise ValueError("Supabase URL and service key must be configured")
-            
-        # Always use the service role key for admin operations
-        return create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        global _client
+        if _client is not None:
+            with _client_lock:
+                _client_stats["reuses"] += 1
+            return _client
+
+        with _client_lock:
+            if _client is None:
+                # Check if Supabase URL and key are configured
+                if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+                    raise ValueError("Supabase URL and service key must be configured")
+
+                # Imported on first use: the supabase package is slow to import
+                import httpx
+                from supabase import ClientOptions, create_client
+
+                start = time.perf_counter()
+                http_client = httpx.Client(
+                    timeout=SUPABASE_TIMEOUT,
+                    follow_redirects=True,
+                    limits=httpx.Limits(max_connections=SUPABASE_MAX_CONNECTIONS,
+                                        max_keepalive_connections=SUPABASE_MAX_CONNECTIONS,
+                                        keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY)
+                )
+                # Always use the service role key for admin operations
+                _client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY,
+                                        options=ClientOptions(httpx_client=http_client))
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                _client_stats["constructions"] += 1
+                _client_stats["construction_ms"] += elapsed_ms
+                print(f"Supabase client created in {elapsed_ms:.1f}ms")
+            return _client
+
+    @staticmethod
+    def close_client() -> None:
+        """Close the shared client's connections; the next call creates a new client"""
+        global _client
+        with _client_lock:
+            if _client is not None:
+                _client.options.httpx_client.close()
+                _client = None
+
+    @staticmethod
+    def client_stats() -> Dict[str, Any]:
+        """Client constructions, total construction time (ms) and reuses"""
+        with _client_lock:
+            return dict(_client_stats)
     
     @staticmethod
     def test_connection() -> bool:
@@ -57,15 +159,13 @@ class SupabaseStorageService:
             List of bucket names
         """
         try:
-            # First test the connection
-            if not SupabaseStorageService.test_connection():
-                return []
-                
             supabase = SupabaseStorageService.get_supabase_client()
-            # Get buckets using the storage API
+            # Get buckets using the storage API (a failed connection raises here)
             response = supabase.storage.list_buckets()
             if isinstance(response, list):
-                return [bucket.get('name', '') for bucket in response if bucket.get('name')]
+                names = [getattr(bucket, 'name', None) or (bucket.get('name') if isinstance(bucket, dict) else None)
+                         for bucket in response]
+                return [name for name in names if name]
             elif isinstance(response, dict):
                 # Handle case where response is a single bucket
                 return [response.get('name', '')] if response.get('name') else []
@@ -92,13 +192,68 @@ class SupabaseStorageService:
         return sha256_hash.hexdigest()
     
     @staticmethod
-    def store_file(source_path: str, custom_path: Optional[str] = None) -> Optional[str]:
+    def find_stored_copy(file_hash: str, db=None) -> Optional[str]:
+        """
+        Find an object already stored with the given content hash.
+
+        Checks the in-process hash index first, then (given a session) the
+        files table for a live attachment with that hash. Given a session,
+        an indexed path is only trusted while a live attachment links it
+        or the object is still in the bucket: another client may have
+        deleted it since.
+
+        Args:
+            file_hash: SHA-256 hex digest of the file
+            db: Optional database session
+
+        Returns:
+            Storage path of the stored copy, None if there is none
+        """
+        with _dedup_lock:
+            storage_path = _hash_index.get(file_hash)
+        if db is None:
+            return storage_path
+        if storage_path:
+            linked = db.query(File.id).filter(
+                File.storage_path == storage_path,
+                File.is_deleted.isnot(True)
+            ).first()
+            if linked or SupabaseStorageService.object_exists(storage_path):
+                return storage_path
+            print(f"Stored copy {storage_path} is gone; forgetting it")
+            with _dedup_lock:
+                if _hash_index.get(file_hash) == storage_path:
+                    del _hash_index[file_hash]
+
+        # Attachments that fell back to local storage aren't in the bucket
+        row = db.query(File.storage_path).filter(
+            File.hash == file_hash,
+            File.is_deleted.isnot(True),
+            ~File.storage_path.like('local%')
+        ).first()
+        if row:
+            with _dedup_lock:
+                _hash_index[file_hash] = row.storage_path
+            return row.storage_path
+        return None
+
+    @staticmethod
+    def store_file(source_path: str, custom_path: Optional[str] = None,
+                   file_hash: Optional[str] = None, db=None,
+                   progress: Optional[Callable[[int, int], None]] = None) -> Optional[str]:
         """
         Store a file in Supabase storage.
+
+        Content-addressed uploads (the storage path starts with the file's
+        hash) are checked first: when a copy of the same bytes is already
+        stored, its path is returned and nothing is sent.
         
         Args:
             source_path: Path to the source file
             custom_path: Optional custom path to use in storage
+            file_hash: SHA-256 of the file, if the caller already has it
+            db: Optional database session used to look up stored copies
+            progress: Optional callback, called with (bytes sent, total bytes)
             
         Returns:
             Storage path if successful, None otherwise
@@ -106,7 +261,9 @@ class SupabaseStorageService:
         try:
             # Get file info
             file_name = os.path.basename(source_path)
-            file_hash = SupabaseStorageService.calculate_file_hash(source_path)
+            file_size = os.path.getsize(source_path)
+            if not file_hash:
+                file_hash = SupabaseStorageService.calculate_file_hash(source_path)
             
             # Determine storage path
             if custom_path:
@@ -116,20 +273,162 @@ class SupabaseStorageService:
                 # Use hash-based path to avoid duplicates
                 file_ext = os.path.splitext(file_name)[1]
                 storage_path = f"{file_hash}{file_ext}"
+            content_addressed = storage_path.startswith(file_hash)
+
+            # Hash first: link an existing copy instead of uploading the bytes again
+            if content_addressed:
+                try:
+                    existing_path = SupabaseStorageService.find_stored_copy(file_hash, db)
+                except Exception as e:
+                    # Only an optimization: upload as usual when the lookup fails
+                    print(f"Error looking up stored copies of {file_name}: {e}")
+                    if db is not None:
+                        db.rollback()
+                    existing_path = None
+                if existing_path:
+                    SupabaseStorageService._record_dedup_hit(file_size)
+                    print(f"Linked stored copy of {file_name}: {existing_path}")
+                    return existing_path
             
-            # Upload file to Supabase
+            # Upload file to Supabase: large files in resumable chunks, the rest in one request
             supabase = SupabaseStorageService.get_supabase_client()
-            with open(source_path, "rb") as f:
-                # Upload without file_options to avoid type errors
-                supabase.storage.from_(SUPABASE_BUCKET).upload(
-                    path=storage_path,
-                    file=f
-                )
-            
+            try:
+                if file_size > SUPABASE_RESUMABLE_THRESHOLD:
+                    SupabaseStorageService.upload_resumable(source_path, storage_path, file_hash, progress)
+                else:
+                    with (ProgressReader(source_path, progress) if progress else open(source_path, "rb")) as f:
+                        # Upload without file_options to avoid type errors
+                        supabase.storage.from_(SUPABASE_BUCKET).upload(
+                            path=storage_path,
+                            file=f
+                        )
+            except Exception as e:
+                # The same bytes are already stored under this path (e.g. by
+                # another workstation since the lookup), so link them
+                if not (content_addressed and str(getattr(e, 'status', '')) == '409'):
+                    raise
+                SupabaseStorageService._record_dedup_hit(file_size)
+                print(f"Linked stored copy of {file_name}: {storage_path}")
+            else:
+                with _dedup_lock:
+                    _dedup_stats["uploads"] += 1
+                    _dedup_stats["bytes_uploaded"] += file_size
+
+            if content_addressed:
+                with _dedup_lock:
+                    _hash_index[file_hash] = storage_path
             return storage_path
         except Exception as e:
             print(f"Error storing file: {e}")
             return None
+
+    @staticmethod
+    def upload_resumable(source_path: str, storage_path: str, file_hash: str,
+                         progress: Optional[Callable[[int, int], None]] = None) -> None:
+        """
+        Upload a file in chunks with the TUS protocol, resuming an earlier attempt.
+
+        The upload URL is saved under RESUMABLE_STATE_DIR, keyed by the file's
+        hash, as soon as the upload is created. A later call for the same
+        file (after a dropped connection, or in a new session) asks the
+        server how much it already has and sends only the rest.
+
+        Args:
+            source_path: Path to the source file
+            storage_path: Path to store the file under
+            file_hash: SHA-256 of the file, keys the resume state
+            progress: Optional callback, called with (bytes sent, total bytes)
+
+        Raises:
+            ResumableUploadError: The server rejected a request, with its status
+                (409 when the object already exists)
+            httpx.HTTPError: The connection failed; call again to resume
+        """
+        supabase = SupabaseStorageService.get_supabase_client()
+        http = supabase.options.httpx_client
+        endpoint = f"{SUPABASE_URL.rstrip('/')}/storage/v1/upload/resumable"
+        headers = {
+            "apikey": SUPABASE_SERVICE_KEY,
+            "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+            "Tus-Resumable": "1.0.0"
+        }
+        file_size = os.path.getsize(source_path)
+        state_path = os.path.join(RESUMABLE_STATE_DIR, f"{file_hash}.json")
+
+        # Resume an earlier upload of the same file to the same place
+        upload_url = None
+        offset = 0
+        try:
+            with open(state_path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = None
+        if state and (state.get('bucket'), state.get('storage_path'), state.get('size')) == \
+                (SUPABASE_BUCKET, storage_path, file_size):
+            response = http.head(state['url'], headers=headers)
+            if response.status_code == 200:
+                upload_url = state['url']
+                offset = int(response.headers.get('Upload-Offset', 0))
+                print(f"Resuming upload of {storage_path} at {offset}/{file_size} bytes")
+
+        if upload_url is None:
+            metadata = {
+                "bucketName": SUPABASE_BUCKET,
+                "objectName": storage_path,
+                "contentType": mimetypes.guess_type(source_path)[0] or 'application/octet-stream',
+                "cacheControl": "3600"
+            }
+            response = http.post(endpoint, headers={
+                **headers,
+                "Upload-Length": str(file_size),
+                "Upload-Metadata": ",".join(f"{key} {base64.b64encode(value.encode()).decode()}"
+                                            for key, value in metadata.items())
+            })
+            if response.status_code != 201:
+                raise ResumableUploadError(f"Creating upload failed: {response.text}", response.status_code)
+            upload_url = urljoin(endpoint + "/", response.headers['Location'])
+
+            os.makedirs(RESUMABLE_STATE_DIR, exist_ok=True)
+            temp_path = f"{state_path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({"url": upload_url, "bucket": SUPABASE_BUCKET,
+                           "storage_path": storage_path, "size": file_size}, f)
+            os.replace(temp_path, state_path)
+
+        with open(source_path, 'rb') as f:
+            f.seek(offset)
+            while offset < file_size:
+                chunk = f.read(SUPABASE_CHUNK_SIZE)
+                response = http.patch(upload_url, content=chunk, headers={
+                    **headers,
+                    "Upload-Offset": str(offset),
+                    "Content-Type": "application/offset+octet-stream"
+                })
+                if response.status_code == 409:
+                    # Offset mismatch, e.g. a chunk arrived but its response was lost: ask and continue
+                    offset = int(http.head(upload_url, headers=headers).headers['Upload-Offset'])
+                    f.seek(offset)
+                    continue
+                if response.status_code != 204:
+                    raise ResumableUploadError(f"Upload chunk at {offset} failed: {response.text}",
+                                               response.status_code)
+                offset = int(response.headers['Upload-Offset'])
+                if progress:
+                    progress(offset, file_size)
+
+        os.remove(state_path)
+
+    @staticmethod
+    def _record_dedup_hit(file_size: int) -> None:
+        with _dedup_lock:
+            _dedup_stats["hits"] += 1
+            _dedup_stats["bytes_saved"] += file_size
+
+    @staticmethod
+    def dedup_stats() -> Dict[str, Any]:
+        """Uploads linked to stored copies (hits) and sent, with their bytes"""
+        with _dedup_lock:
+            return dict(_dedup_stats)
     
     @staticmethod
     def get_file_url(storage_path: str, expires_in: int = 3600) -> Optional[str]:
@@ -159,6 +458,21 @@ class SupabaseStorageService:
             print(f"Error getting file URL: {e}")
             return None
     
+    @staticmethod
+    def object_exists(storage_path: str) -> bool:
+        """
+        Check an object is in the bucket with a single HEAD request.
+
+        Returns:
+            True if it exists, False if it doesn't or the check failed
+        """
+        try:
+            supabase = SupabaseStorageService.get_supabase_client()
+            return bool(supabase.storage.from_(SUPABASE_BUCKET).exists(storage_path))
+        except Exception as e:
+            print(f"Error checking {storage_path}: {e}")
+            return False
+
     @staticmethod
     def file_exists(storage_path: str) -> bool:
         """
@@ -254,20 +568,43 @@ class SupabaseStorageService:
             return False
     
     @staticmethod
-    def delete_file(storage_path: str) -> bool:
+    def delete_file(storage_path: str, db=None) -> bool:
         """
         Delete a file from Supabase storage.
+
+        Content-addressed objects can be linked from several attachments,
+        so only delete one no live files row refers to any more. Mark the
+        attachment's own row deleted (or delete it) before calling this.
         
         Args:
             storage_path: Path to the file in storage
+            db: Optional database session used to look for other attachments
             
         Returns:
-            True if the file was deleted successfully, False otherwise
+            True if the file was deleted (or is kept for other attachments),
+            False otherwise
         """
         try:
+            session = db or SessionLocal()
+            try:
+                linked = session.query(File.id).filter(
+                    File.storage_path == storage_path,
+                    File.is_deleted.isnot(True)
+                ).count()
+            finally:
+                if db is None:
+                    session.close()
+            if linked:
+                print(f"Keeping {storage_path}: still linked from {linked} attachment(s)")
+                return True
+
             supabase = SupabaseStorageService.get_supabase_client()
             # Delete the file
             supabase.storage.from_(SUPABASE_BUCKET).remove([storage_path])
+            with _dedup_lock:
+                for file_hash, path in list(_hash_index.items()):
+                    if path == storage_path:
+                        del _hash_index[file_hash]
             return True
         except Exception as e:
             print(f"Error deleting file: {e}")
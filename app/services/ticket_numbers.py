@@ -0,0 +1,55 @@
+"""
+Ticket numbers in the SI-YYYY-NNNNN format.
+
+Numbers come from a per-year row in ticket_counters (migration 016) that is
+incremented with a single INSERT ... ON CONFLICT DO UPDATE. The row lock is
+held until the submitting transaction ends, so concurrent submitters get
+consecutive numbers and a rolled back submission gives its number back.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.models import TicketCounter
+
+def format_ticket_number(year: int, number: int) -> str:
+    """SI-YYYY-NNNNN"""
+    return f"SI-{year}-{number:05d}"
+
+def allocate_ticket_number(db: Session, year: Optional[int] = None) -> str:
+    """
+    Issue the next ticket number for a year.
+
+    Call this in the transaction that inserts the ticket; the number is
+    reserved once that transaction commits.
+
+    Args:
+        db: Open database session
+        year: Ticket year (the current year by default)
+
+    Returns:
+        The allocated ticket number
+    """
+    year = year or datetime.now().year
+    statement = insert(TicketCounter).values(year=year, last_number=1, updated_at=func.now())
+    statement = statement.on_conflict_do_update(
+        index_elements=[TicketCounter.year],
+        set_={"last_number": TicketCounter.last_number + 1, "updated_at": func.now()}
+    ).returning(TicketCounter.last_number)
+    number = db.execute(statement).scalar_one()
+    return format_ticket_number(year, number)
+
+def peek_ticket_number(db: Session, year: Optional[int] = None) -> str:
+    """
+    The number the next ticket will most likely get, without reserving it.
+
+    Args:
+        db: Open database session
+        year: Ticket year (the current year by default)
+    """
+    year = year or datetime.now().year
+    last_number = db.execute(select(TicketCounter.last_number).where(TicketCounter.year == year)).scalar()
+    return format_ticket_number(year, (last_number or 0) + 1)
@@ -0,0 +1,61 @@
+"""
+Vehicle catalog for the opportunity form's year/make/model cascades.
+
+The catalog is built once from the cached vehicles rows (see
+reference_cache) into nested lookups: year -> makes, (year, make) -> models
+and (year, make, model) -> vehicle id. Every form in the process shares it,
+and it is rebuilt only when the vehicles table's version changes.
+"""
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.services.reference_cache import get_reference_cache
+
+class VehicleCatalog:
+    """Year/make/model lookups over the vehicles table"""
+
+    def __init__(self, version: Optional[int], vehicles: Iterable[Tuple[str, str, str, str]]):
+        """
+        Args:
+            version: Version of the vehicles table the rows were read at
+            vehicles: (id, year, make, model) rows
+        """
+        self.version = version
+
+        makes = {}
+        models = {}
+        self.ids = {}
+        for vehicle_id, year, make, model in vehicles:
+            year = str(year)
+            makes.setdefault(year, set()).add(make)
+            models.setdefault((year, make), set()).add(model)
+            self.ids.setdefault((year, make, model), vehicle_id)
+
+        self.years = sorted(makes, reverse=True)
+        self.makes = {year: sorted(values) for year, values in makes.items()}
+        self.models = {key: sorted(values) for key, values in models.items()}
+
+    def makes_for(self, year: str) -> List[str]:
+        """Sorted makes available for a year"""
+        return self.makes.get(year, [])
+
+    def models_for(self, year: str, make: str) -> List[str]:
+        """Sorted models available for a year and make"""
+        return self.models.get((year, make), [])
+
+    def vehicle_id(self, year: str, make: str, model: str) -> Optional[str]:
+        """Id of the vehicle row for a selection, if there is one"""
+        return self.ids.get((year, make, model))
+
+def get_vehicle_catalog(db: Session) -> VehicleCatalog:
+    """
+    Get the shared vehicle catalog, rebuilding it only if the table changed.
+
+    Args:
+        db: Open database session, used for the version check and any refetch
+
+    Returns:
+        VehicleCatalog current as of the version check
+    """
+    return get_reference_cache().get_derived(db, "vehicles", "catalog", lambda rows, version: VehicleCatalog(version, rows))
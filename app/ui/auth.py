@@ -3,7 +3,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QLineEdit,
                            QDialog, QFormLayout)
 from PyQt5.QtCore import pyqtSignal, QSettings
 from app.auth.auth_handler import hash_pin, create_access_token
-from app.database.connection import get_db_with_retry
+from app.database.connection import get_db_with_retry, start_pool_warmup
 from app.models.models import User
 from sqlalchemy import func
 from datetime import datetime
@@ -207,6 +207,8 @@ class AuthWidget(QWidget):
         self.settings = QSettings('SI Opportunity Manager', 'Auth')
         self.initUI()
         self.load_remembered_username()
+        # Open database connections while the user types, so login doesn't wait for them
+        start_pool_warmup()
         
     def closeEvent(self, event):
         # Hide the window instead of closing it
@@ -0,0 +1,91 @@
+"""
+Push notifications of database changes to the UI.
+
+Migration 010 adds triggers that pg_notify a compact JSON payload on
+CHANGE_CHANNEL whenever an opportunity or notification row changes. The
+ChangeListener thread holds one dedicated connection LISTENing on that
+channel and emits each payload as a Qt signal, so clients react to new
+tickets immediately instead of waiting for their next poll. The
+connection bypasses any transaction pooler (see connect_listener) and is
+only reported as connected once a test notification has come through.
+"""
+from PyQt5.QtCore import QThread, pyqtSignal
+from app.database.connection import CHANGE_CHANNEL, connect_listener
+import json
+import select
+import time
+import traceback
+
+# Seconds between checks of the stop flag while waiting for notifications
+LISTEN_TIMEOUT = 1.0
+
+# Seconds to wait before reconnecting, doubled after each failure up to the maximum
+RECONNECT_DELAY = 2.0
+MAX_RECONNECT_DELAY = 60.0
+
+class ChangeListener(QThread):
+    """Background thread that LISTENs for change notifications
+
+    Signals are delivered on the UI thread. connection_changed reports
+    whether notifications are currently being received, so callers can
+    fall back to polling while they are not.
+    """
+    change_received = pyqtSignal(dict)      # Decoded trigger payload
+    connection_changed = pyqtSignal(bool)   # True while listening
+
+    def __init__(self, channel: str = CHANGE_CHANNEL, parent=None):
+        super().__init__(parent)
+        self.channel = channel
+        self._running = True
+
+    def stop(self) -> None:
+        """Ask the thread to finish; returns once it has"""
+        self._running = False
+        self.wait()
+
+    def run(self):
+        delay = RECONNECT_DELAY
+        while self._running:
+            connection = None
+            try:
+                connection = self._connect()
+                self.connection_changed.emit(True)
+                delay = RECONNECT_DELAY
+                self._listen(connection)
+            except Exception as e:
+                print(f"Change listener error: {str(e)}")
+                print(traceback.format_exc())
+            finally:
+                if connection is not None:
+                    self.connection_changed.emit(False)
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+            # Back off before reconnecting, staying responsive to stop()
+            deadline = time.monotonic() + delay
+            while self._running and time.monotonic() < deadline:
+                time.sleep(0.2)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    def _connect(self):
+        # A dedicated, direct connection, checked to actually receive notifications
+        connection = connect_listener(self.channel)
+        print(f"Listening for database changes on {self.channel}")
+        return connection
+
+    def _listen(self, connection):
+        while self._running:
+            readable, _, _ = select.select([connection], [], [], LISTEN_TIMEOUT)
+            if not readable:
+                continue
+            connection.poll()
+            while connection.notifies:
+                notify = connection.notifies.pop(0)
+                try:
+                    payload = json.loads(notify.payload)
+                except ValueError:
+                    print(f"Ignoring malformed change payload: {notify.payload!r}")
+                    continue
+                self.change_received.emit(payload)
@@ -1,12 +1,14 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QPushButton, QScrollArea, QFrame, QMessageBox, QComboBox, QDateEdit,
-                           QDialog, QTextEdit, QSlider, QSizePolicy)
+                           QDialog, QTextEdit, QSlider, QSizePolicy, QListView, QMenu)
 from PyQt5.QtCore import Qt, QTimer, QDate, QPoint, QRect, QObject, QEvent, QSize
 from PyQt5.QtGui import QCloseEvent, QKeySequence, QPainter, QPixmap, QColor, QFont
 from app.database.connection import SessionLocal
-from app.models.models import Opportunity, Notification, ActivityLog, User, Vehicle, File
-from sqlalchemy.orm import joinedload
+from app.models.models import Opportunity, Notification, ActivityLog, User, File, Comment, normalize_status
 from app.services.supabase_storage import SupabaseStorageService
+from app.services.attachment_cache import AttachmentHashMismatchError, get_attachment_cache
+from app.ui.opportunity_list import (OpportunityListModel, OpportunityCardDelegate, OpportunityRole,
+                                     card_loader_options, card_systems, STATUS_CHOICES)
 from app.config import STORAGE_DIR
 import os
 import traceback
@@ -15,13 +17,12 @@ from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import pyqtSignal, QEvent
 from typing import Dict, List, Optional, Union, Any, cast, TypeVar, Iterable
 from zoneinfo import ZoneInfo
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query
 from sqlalchemy import Column, ColumnElement, String, DateTime, Interval
 from sqlalchemy.sql.elements import BinaryExpression
 from sqlalchemy.sql.expression import cast as sql_cast
-from sqlalchemy import text
+from sqlalchemy import func
 import math  # Add this import at the top
-import re
 
 T = TypeVar('T')
 
@@ -76,8 +77,9 @@ class DashboardWidget(QWidget):
         super().__init__()
         self.current_user = current_user
         self.current_filter: str = "new"  # Changed back to "new" as the default filter
-        self.opportunity_widgets: Dict[str, QFrame] = {}  # Change to dict to store by ID
         self.is_loading: bool = False
+        self.refresh_animation_requested: bool = False
+        self.pending_focus_id: Optional[str] = None
         self.is_compact: bool = True
         self.refresh_timer = QTimer()
         self.refresh_timer.setSingleShot(True)
@@ -121,76 +123,83 @@ class DashboardWidget(QWidget):
             print(f"DEBUG: Error getting local timezone: {str(e)}")
             return ZoneInfo('UTC')
 
-    def get_filtered_opportunities(self, db: Session) -> List[Opportunity]:
-        """Get opportunities based on current filter"""
-        print(f"DEBUG: Applying filter: {self.current_filter}")
-        print(f"DEBUG: Advanced filter applied: {self.advanced_filter_applied}")
+    def get_filter_state(self) -> Dict[str, Any]:
+        """Snapshot the filter widgets as plain values, for queries run off the UI thread"""
+        return {
+            "filter": self.current_filter,
+            "user_id": str(self.current_user.id) if self.current_user else None,
+            "my_tickets": self.my_tickets_filter_type.currentText(),
+            "advanced": self.advanced_filter_applied,
+            "status": self.status_filter.currentText(),
+            "assignment": self.assignment_filter.currentText(),
+            "from_date": self.from_date.date().toPyDate(),
+            "to_date": self.to_date.date().toPyDate()
+        }
+
+    @staticmethod
+    def build_opportunities_query(db: Session, filters: Dict[str, Any]) -> Query:
+        """Build the opportunities query for a filter state, without ordering or loader options
+        
+        Args:
+            db: Open database session
+            filters: Filter state from get_filter_state
+        """
+        current_filter = filters["filter"]
+        user_id = filters["user_id"]
         
-        # Base query with files relationship loaded
-        query = db.query(Opportunity).options(joinedload(Opportunity.files))
+        # Base query
+        query = db.query(Opportunity)
         
         # Apply filter based on filter button
-        if self.current_filter == "active_tickets":
+        if current_filter == "active_tickets":
             # Show all tickets except completed ones
-            query = query.filter(~Opportunity.status.ilike("completed"))
-            print(f"DEBUG: Applied 'Active Tickets' filter (excluding completed)")
-        elif self.current_filter == "my_tickets":
+            query = query.filter(Opportunity.status != "completed")
+        elif current_filter == "my_tickets":
             # My tickets filter (created by me)
-            query = query.filter(Opportunity.creator_id == str(self.current_user.id))
-            print(f"DEBUG: Applied 'My Tickets' filter")
+            query = query.filter(Opportunity.creator_id == user_id)
             
             # Sub-filter for my tickets
-            if self.my_tickets_filter_type.currentText() == "Created":
+            if filters["my_tickets"] == "Created":
                 # Already filtered to my created tickets
                 pass
-            elif self.my_tickets_filter_type.currentText() == "Assigned":
+            elif filters["my_tickets"] == "Assigned":
                 # Switch to assigned tickets
-                query = db.query(Opportunity).filter(Opportunity.acceptor_id == str(self.current_user.id))
-                print(f"DEBUG: Applied 'Assigned to Me' sub-filter")
-            elif self.my_tickets_filter_type.currentText() == "Both":
+                query = db.query(Opportunity).filter(Opportunity.acceptor_id == user_id)
+            elif filters["my_tickets"] == "Both":
                 # Both created by me and assigned to me
                 query = db.query(Opportunity).filter(
-                    (Opportunity.creator_id == str(self.current_user.id)) | 
-                    (Opportunity.acceptor_id == str(self.current_user.id))
+                    (Opportunity.creator_id == user_id) | 
+                    (Opportunity.acceptor_id == user_id)
                 )
-                print(f"DEBUG: Applied 'Both' sub-filter")
-        elif self.current_filter == "new":
-            query = query.filter(Opportunity.status.ilike("new"))
+        elif current_filter == "new":
+            query = query.filter(Opportunity.status == "new")
             # Only show tickets that aren't created by current user
-            if self.current_user:
-                query = query.filter(Opportunity.creator_id != str(self.current_user.id))
-            print(f"DEBUG: Applied 'New' filter")
-        elif self.current_filter == "in_progress":
-            query = query.filter(Opportunity.status.ilike("in progress"))
-            print(f"DEBUG: Applied 'In Progress' filter")
-        elif self.current_filter == "completed":
-            query = query.filter(Opportunity.status.ilike("completed"))
-            print(f"DEBUG: Applied 'Completed' filter")
-        elif self.current_filter == "needs_info":
-            query = query.filter(Opportunity.status.ilike("needs info"))
-            print(f"DEBUG: Applied 'Needs Info' filter")
+            if user_id:
+                query = query.filter(Opportunity.creator_id != user_id)
+        elif current_filter == "in_progress":
+            query = query.filter(Opportunity.status == "in progress")
+        elif current_filter == "completed":
+            query = query.filter(Opportunity.status == "completed")
+        elif current_filter == "needs_info":
+            query = query.filter(Opportunity.status == "needs info")
         
         # Apply advanced filters if set
-        if self.advanced_filter_applied:
+        if filters["advanced"]:
             # Status filter
-            if self.status_filter.currentText() != "All":
-                query = query.filter(Opportunity.status.ilike(self.status_filter.currentText().lower()))
-                print(f"DEBUG: Applied advanced status filter: {self.status_filter.currentText()}")
+            if filters["status"] != "All":
+                query = query.filter(Opportunity.status == normalize_status(filters["status"]))
             
             # Assignment filter
-            if self.assignment_filter.currentText() == "Assigned To Me":
-                query = query.filter(Opportunity.acceptor_id == str(self.current_user.id))
-                print(f"DEBUG: Applied 'Assigned To Me' filter")
-            elif self.assignment_filter.currentText() == "Created By Me":
-                query = query.filter(Opportunity.creator_id == str(self.current_user.id))
-                print(f"DEBUG: Applied 'Created By Me' filter")
-            elif self.assignment_filter.currentText() == "Unassigned":
+            if filters["assignment"] == "Assigned To Me":
+                query = query.filter(Opportunity.acceptor_id == user_id)
+            elif filters["assignment"] == "Created By Me":
+                query = query.filter(Opportunity.creator_id == user_id)
+            elif filters["assignment"] == "Unassigned":
                 query = query.filter(Opportunity.acceptor_id == None)
-                print(f"DEBUG: Applied 'Unassigned' filter")
             
             # Date range
-            start_date = self.from_date.date().toPyDate()
-            end_date = self.to_date.date().toPyDate()
+            start_date = filters["from_date"]
+            end_date = filters["to_date"]
             
             # Add a day to the end date to make it inclusive
             end_date = end_date + timedelta(days=1)
@@ -204,417 +213,92 @@ class DashboardWidget(QWidget):
                         datetime.combine(start_date, datetime.min.time(), tzinfo=utc),
                         datetime.combine(end_date, datetime.max.time(), tzinfo=utc)
                     ))
-                print(f"DEBUG: Applied date filter: {start_date} to {end_date}")
-            else:
-                print(f"DEBUG: No date range filter applied")
         
-        # Get vehicle information if available by joining with Vehicle table
-        try:
-            # Check if the vehicles table exists and has matching records
-            vehicles_exists = db.query(Vehicle).limit(1).count() > 0
-            if vehicles_exists:
-                # Look for vehicle_id if it exists as a direct column
-                if hasattr(Opportunity, 'vehicle_id'):
-                    query = query.outerjoin(Vehicle, Vehicle.id == Opportunity.vehicle_id)
-                    print(f"DEBUG: Joined with vehicles table using vehicle_id")
-                # Otherwise try to join using VIN if both tables have it
-                elif hasattr(Opportunity, 'vin') and hasattr(Vehicle, 'vin'):
-                    query = query.outerjoin(Vehicle, Vehicle.vin == Opportunity.vin)
-                    print(f"DEBUG: Joined with vehicles table using VIN")
-        except Exception as e:
-            print(f"DEBUG: Error trying to join with vehicles: {str(e)}")
-            # Continue without the join if there's an error
+        return query
+
+    @staticmethod
+    def get_filtered_opportunities(db: Session, filters: Dict[str, Any],
+                                   offset: int = 0, limit: Optional[int] = None) -> List[Opportunity]:
+        """Get opportunities for a filter state
         
-        # Return results ordered by creation date
-        return query.order_by(Opportunity.created_at.desc()).all()
+        Args:
+            db: Open database session
+            filters: Filter state from get_filter_state
+            offset: Rows to skip, for paging
+            limit: Maximum rows to return (None for all)
+        """
+        query = DashboardWidget.build_opportunities_query(db, filters).options(*card_loader_options())
+        
+        # Return results ordered by creation date (matches the created_at index)
+        query = query.order_by(Opportunity.created_at.desc().nullslast(), Opportunity.id).offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
 
-    def add_opportunity_widget(self, opportunity: Opportunity) -> Optional[QFrame]:
-        """Add a widget for displaying an opportunity"""
-        try:
-            card = QFrame()
-            card.setObjectName(f"card_{opportunity.id}")
-            
-            # Store the widget in our dictionary
-            self.opportunity_widgets[str(opportunity.id)] = card
-            
-            # Adjust card style based on view mode
-            card.setStyleSheet(f"""
-                QFrame {{
-                    background-color: #2d2d2d;
-                    border-radius: {6 if self.is_compact else 8}px;
-                    padding: {12 if self.is_compact else 20}px;
-                }}
-                QFrame:hover {{
-                    background-color: #333333;
-                }}
-            """)
-            
-            card_layout = QVBoxLayout()
-            card_layout.setSpacing(self.is_compact and 8 or 16)
-            card_layout.setContentsMargins(0, 0, 0, 0)
-            
-            # Header section with title and status
-            header = QHBoxLayout()
-            header.setSpacing(self.is_compact and 8 or 16)
-            
-            # Title and submitter info
-            title_section = QVBoxLayout()
-            title_section.setSpacing(self.is_compact and 2 or 4)
-            
-            # Display vehicle info as the main title instead of ticket number
-            vehicle_info_display = []
-            has_vehicle_for_title = False
-            
-            # Check if this is a referenced vehicle through a join
-            if hasattr(opportunity, 'vehicle') and opportunity.vehicle:
-                vehicle = opportunity.vehicle
-                if vehicle and hasattr(vehicle, 'year') and hasattr(vehicle, 'make') and hasattr(vehicle, 'model'):
-                    vehicle_info_display = [vehicle.year, vehicle.make, vehicle.model]
-                    has_vehicle_for_title = True
-            # Otherwise check for year/make/model attributes directly on opportunity
-            elif hasattr(opportunity, 'year') and opportunity.year and hasattr(opportunity, 'make') and opportunity.make and hasattr(opportunity, 'model') and opportunity.model:
-                vehicle_info_display = [opportunity.year, opportunity.make, opportunity.model]
-                has_vehicle_for_title = True
-            # Otherwise try to extract from description
-            elif opportunity.description:
-                # Look for "Vehicle: YEAR MAKE MODEL" pattern in the description
-                vehicle_match = re.search(r'Vehicle:\s+([^\n]+)', opportunity.description)
-                if vehicle_match:
-                    vehicle_str = vehicle_match.group(1).strip()
-                    if vehicle_str:
-                        vehicle_info_display = [vehicle_str]
-                        has_vehicle_for_title = True
-            
-            # Use vehicle info as title if available, otherwise fall back to ticket number
-            if has_vehicle_for_title and vehicle_info_display:
-                title_text = " ".join(vehicle_info_display)
-            else:
-                title_text = f"{opportunity.display_title if hasattr(opportunity, 'display_title') else opportunity.title}"
-            
-            title = QLabel(title_text)
-            title.setStyleSheet(f"""
-                color: #ffffff;
-                font-size: {14 if self.is_compact else 18}px;
-                font-weight: bold;
-            """)
-            title_section.addWidget(title)
-            
-            # Add submitter info
-            if opportunity.creator:
-                creator = opportunity.creator
-                submitter_text = QLabel(f"Submitted by {creator.first_name} {creator.last_name} ({creator.team})")
-                submitter_text.setStyleSheet("color: #bbbbbb; font-size: 12px;")
-                title_section.addWidget(submitter_text)
-            
-            # Add time info
-            time_info = QLabel()
-            time_text = []
-            
-            if opportunity.created_at:
-                # Convert to local time for display
-                local_created_time = self.convert_to_local_time(opportunity.created_at)
-                created_time = local_created_time.strftime("%Y-%m-%d %H:%M")
-                time_text.append(f"Created: {created_time}")
-            
-            # Add acceptor info if assigned
-            if opportunity.acceptor_id:
-                acceptor = opportunity.acceptor
-                if acceptor:
-                    # If completed, show completion info
-                    if opportunity.status.lower() == "completed":
-                        # Include response and work time if available
-                        total_time = opportunity.response_time
-                        work_time = opportunity.work_time
-                        
-                        # Convert completed time to local time
-                        if opportunity.completed_at:
-                            local_completed_time = self.convert_to_local_time(opportunity.completed_at)
-                            completed_time = local_completed_time.strftime("%Y-%m-%d %H:%M")
-                            time_text.append(f"Completed: {completed_time}")
-                        time_info_parts = []
-                        if total_time:
-                            time_info_parts.append(f"Total Time: {self.format_duration(total_time)}")
-                        if work_time:
-                            time_info_parts.append(f"Work Time: {self.format_duration(work_time)}")
-                            
-                        time_text.append(f"✓ Completed by {acceptor.first_name} {acceptor.last_name}")
-                        if time_info_parts:
-                            time_text.append(" • ".join(time_info_parts))
-                    elif opportunity.status.lower() == "in progress":
-                        time_text.append(f"Assigned to: {acceptor.first_name} {acceptor.last_name}")
-                        # Show both current total time and work time for in-progress tickets
-                        current_time = datetime.now(timezone.utc)
-                        total_duration = current_time - opportunity.created_at
-                        time_text.append(f"Total Time: {self.format_duration(total_duration)}")
-                        
-                        if opportunity.started_at:
-                            work_duration = current_time - opportunity.started_at
-                            time_text.append(f"Work Time: {self.format_duration(work_duration)}")
-                    else:
-                        time_text.append(f"Assigned to: {acceptor.first_name} {acceptor.last_name}")
-            
-            time_info.setText(" • ".join(time_text))
-            time_info.setStyleSheet("color: #888888; font-size: 11px;")
-            title_section.addWidget(time_info)
-            
-            # Add vehicle, systems, and description information
-            if opportunity.vin or hasattr(opportunity, 'systems') or opportunity.description:
-                details_frame = QFrame()
-                details_frame.setStyleSheet("""
-                    QFrame {
-                        background-color: #252525;
-                        border-radius: 4px;
-                        padding: 8px;
-                        margin-top: 4px;
-                    }
-                """)
-                details_layout = QVBoxLayout(details_frame)
-                details_layout.setContentsMargins(8, 8, 8, 8)
-                details_layout.setSpacing(6)
-                
-                # Ticket number (moved from title to details)
-                ticket_label = QLabel(f"Ticket: {opportunity.display_title if hasattr(opportunity, 'display_title') else opportunity.title}")
-                ticket_label.setStyleSheet("color: #0078d4; font-size: 12px; font-weight: bold;")
-                ticket_label.setWordWrap(True)
-                details_layout.addWidget(ticket_label)
-                
-                # Add VIN if available
-                if opportunity.vin:
-                    vin_label = QLabel(f"VIN: {opportunity.vin}")
-                    vin_label.setStyleSheet("color: #0078d4; font-size: 12px;")
-                    details_layout.addWidget(vin_label)
-                
-                # Systems info (if available)
-                if hasattr(opportunity, 'systems') and opportunity.systems:
-                    systems_str = ""
-                    if isinstance(opportunity.systems, list):
-                        systems = []
-                        for system in opportunity.systems:
-                            if isinstance(system, dict) and "system" in system:
-                                systems.append(system["system"])
-                            elif isinstance(system, dict) and "name" in system:
-                                systems.append(system["name"])
-                            elif isinstance(system, str):
-                                systems.append(system)
-                        systems_str = ", ".join(systems)
-                    
-                    if systems_str:
-                        systems_label = QLabel(f"Systems: {systems_str}")
-                        systems_label.setStyleSheet("color: #0078d4; font-size: 12px;")
-                        systems_label.setWordWrap(True)
-                        details_layout.addWidget(systems_label)
-                
-                # Attachments info (if available)
-                if hasattr(opportunity, 'files') and opportunity.files:
-                    files_container = QFrame()
-                    files_container.setStyleSheet("""
-                        QFrame {
-                            background-color: transparent;
-                            border-radius: 0px;
-                            padding: 0px;
-                        }
-                    """)
-                    files_layout = QVBoxLayout(files_container)
-                    files_layout.setContentsMargins(0, 0, 0, 0)
-                    files_layout.setSpacing(2)
-                    
-                    # Attachments header
-                    attachments_header = QLabel(f"Attachments ({len(opportunity.files)}):")
-                    attachments_header.setStyleSheet("color: #0078d4; font-size: 12px; font-weight: bold;")
-                    files_layout.addWidget(attachments_header)
-                    
-                    # List attachments (show up to 3, then "and X more...")
-                    displayed_files = 0
-                    max_display = 3
-                    
-                    for file in opportunity.files:
-                        if displayed_files < max_display:
-                            file_link = QPushButton(f"📎 {file.display_name}")
-                            file_link.setStyleSheet("""
-                                QPushButton {
-                                    background-color: transparent;
-                                    color: #0078d4;
-                                    border: none;
-                                    text-align: left;
-                                    padding: 2px 0px;
-                                    font-size: 11px;
-                                }
-                                QPushButton:hover {
-                                    color: #2196F3;
-                                    text-decoration: underline;
-                                }
-                            """)
-                            file_link.setCursor(Qt.PointingHandCursor)
-                            file_link.clicked.connect(lambda checked, f=file: self.open_attachment(f))
-                            files_layout.addWidget(file_link)
-                            displayed_files += 1
-                    
-                    # If there are more files, show count
-                    remaining_files = len(opportunity.files) - displayed_files
-                    if remaining_files > 0:
-                        more_label = QLabel(f"... and {remaining_files} more file(s)")
-                        more_label.setStyleSheet("color: #888888; font-size: 11px; font-style: italic;")
-                        files_layout.addWidget(more_label)
-                    
-                    details_layout.addWidget(files_container)
-                
-                # First comment or description (if available)
-                description = ""
-                if hasattr(opportunity, 'comments') and opportunity.comments and isinstance(opportunity.comments, list) and len(opportunity.comments) > 0:
-                    # Get the first comment's text
-                    if isinstance(opportunity.comments[0], dict) and 'text' in opportunity.comments[0]:
-                        description = opportunity.comments[0]['text']
-                elif opportunity.description:
-                    description = opportunity.description
-                    # Remove the Vehicle: line from displayed description since we now show vehicle in title
-                    description = re.sub(r'Vehicle:\s+[^\n]+(\n|$)', '', description).strip()
-                
-                if description:
-                    # Create a container for the description with a frame
-                    desc_container = QFrame()
-                    desc_container.setStyleSheet("""
-                        QFrame {
-                            background-color: transparent;
-                            border-radius: 0px;
-                            padding: 0px;
-                        }
-                        QFrame:hover {
-                            background-color: #303030;
-                        }
-                    """)
-                    desc_container_layout = QVBoxLayout(desc_container)
-                    desc_container_layout.setContentsMargins(0, 0, 0, 0)
-                    desc_container_layout.setSpacing(4)
-                    
-                    # Full description for storage
-                    desc_container.full_description = description
-                    
-                    # Truncated description for initial display
-                    max_length = 150
-                    truncated = len(description) > max_length
-                    display_text = description if not truncated else description[:max_length] + "..."
-                    
-                    desc_label = QLabel(display_text)
-                    desc_label.setStyleSheet("color: #cccccc; font-size: 12px;")
-                    desc_label.setWordWrap(True)
-                    desc_container_layout.addWidget(desc_label)
-                    
-                    # Add "Show more" indicator if truncated
-                    if truncated:
-                        show_more = QLabel("Click to expand...")
-                        show_more.setStyleSheet("color: #0078d4; font-size: 11px; font-style: italic;")
-                        desc_container_layout.addWidget(show_more)
-                    
-                    # Make the container clickable
-                    desc_container.mousePressEvent = lambda event, container=desc_container, label=desc_label, full_text=description: self.toggle_description(container, label, full_text)
+    @staticmethod
+    def get_opportunity_versions(db: Session, filters: Dict[str, Any], limit: Optional[int] = None) -> List[tuple]:
+        """Get (id, version) pairs for a filter state in display order
+        
+        The version is updated_at, falling back to created_at for tickets
+        that were never edited. Only these two columns are fetched.
+        """
+        query = (
+            DashboardWidget.build_opportunities_query(db, filters)
+            .with_entities(Opportunity.id, func.coalesce(Opportunity.updated_at, Opportunity.created_at))
+            .order_by(Opportunity.created_at.desc().nullslast(), Opportunity.id)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return [(str(opportunity_id), version) for opportunity_id, version in query.all()]
+
+    def format_time_info(self, opportunity: Opportunity) -> str:
+        """Format the created/assigned/completed line shown on an opportunity card"""
+        time_text = []
+        
+        if opportunity.created_at:
+            # Convert to local time for display
+            local_created_time = self.convert_to_local_time(opportunity.created_at)
+            created_time = local_created_time.strftime("%Y-%m-%d %H:%M")
+            time_text.append(f"Created: {created_time}")
+        
+        # Add acceptor info if assigned
+        if opportunity.acceptor_id:
+            acceptor = opportunity.acceptor
+            if acceptor:
+                # If completed, show completion info
+                if opportunity.status == "completed":
+                    # Include response and work time if available
+                    total_time = opportunity.response_time
+                    work_time = opportunity.work_time
                     
-                    # Store if currently expanded
-                    desc_container.is_expanded = False
+                    # Convert completed time to local time
+                    if opportunity.completed_at:
+                        local_completed_time = self.convert_to_local_time(opportunity.completed_at)
+                        completed_time = local_completed_time.strftime("%Y-%m-%d %H:%M")
+                        time_text.append(f"Completed: {completed_time}")
+                    time_info_parts = []
+                    if total_time:
+                        time_info_parts.append(f"Total Time: {self.format_duration(total_time)}")
+                    if work_time:
+                        time_info_parts.append(f"Work Time: {self.format_duration(work_time)}")
+                        
+                    time_text.append(f"✓ Completed by {acceptor.first_name} {acceptor.last_name}")
+                    if time_info_parts:
+                        time_text.append(" • ".join(time_info_parts))
+                elif opportunity.status == "in progress":
+                    time_text.append(f"Assigned to: {acceptor.first_name} {acceptor.last_name}")
+                    # Show both current total time and work time for in-progress tickets
+                    current_time = datetime.now(timezone.utc)
+                    total_duration = current_time - opportunity.created_at
+                    time_text.append(f"Total Time: {self.format_duration(total_duration)}")
                     
-                    details_layout.addWidget(desc_container)
-                
-                title_section.addWidget(details_frame)
-            
-            header.addLayout(title_section, 1)  # Give title section more space
-            
-            # Status section
-            status_section = QHBoxLayout()
-            status_section.setSpacing(8)
-            
-            status_combo = QComboBox()
-            status_combo.addItems(["New", "In Progress", "Completed", "Needs Info"])
-            current_status = opportunity.display_status if hasattr(opportunity, 'display_status') else opportunity.status.title()
-            status_combo.setCurrentText(current_status)
-            status_combo.setStyleSheet(f"""
-                QComboBox {{
-                    background-color: #262626;
-                    color: white;
-                    border: 1px solid #404040;
-                    padding: {4 if self.is_compact else 6}px {8 if self.is_compact else 12}px;
-                    border-radius: 4px;
-                    min-width: {100 if self.is_compact else 140}px;
-                }}
-                QComboBox::drop-down {{
-                    border: none;
-                    padding-right: 8px;
-                }}
-                QComboBox::down-arrow {{
-                    image: none;
-                    border-left: 4px solid transparent;
-                    border-right: 4px solid transparent;
-                    border-top: 4px solid white;
-                }}
-            """)
-            
-            # Protect from accidental wheel scrolling
-            self.protect_combobox_from_wheel(status_combo)
-            
-            status_combo.setProperty("opportunity", opportunity)
-            status_combo.currentTextChanged.connect(self.handle_status_change)
-            status_section.addWidget(status_combo)
-            
-            header.addLayout(status_section)
-            card_layout.addLayout(header)
-            
-            # Buttons section (comment, view details)
-            buttons_layout = QHBoxLayout()
-            buttons_layout.setSpacing(8)
-            
-            # View Details button
-            if opportunity.description or opportunity.systems:
-                view_btn = QPushButton("View Details")
-                view_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #262626;
-                        color: #0078d4;
-                        border: none;
-                        border-radius: 4px;
-                        padding: 6px 12px;
-                        font-size: 13px;
-                    }
-                    QPushButton:hover {
-                        background-color: #333333;
-                        color: #2196F3;
-                    }
-                """)
-                view_btn.clicked.connect(lambda checked, o=opportunity: self.focus_ticket(o.id))
-                buttons_layout.addWidget(view_btn)
-            
-            # Comments button
-            if hasattr(opportunity, 'comments') and opportunity.comments:
-                comments_btn = QPushButton(f"Comments ({len(opportunity.comments)})")
-            else:
-                comments_btn = QPushButton("Add Comment")
-            comments_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #262626;
-                    color: #0078d4;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 6px 12px;
-                    font-size: 13px;
-                }
-                QPushButton:hover {
-                    background-color: #333333;
-                    color: #2196F3;
-                }
-            """)
-            comments_btn.clicked.connect(lambda checked, o=opportunity: self.show_comments_dialog(o))
-            buttons_layout.addWidget(comments_btn)
-            
-            buttons_layout.addStretch()
-            
-            if not self.is_compact:
-                card_layout.addLayout(buttons_layout)
-            
-            card.setLayout(card_layout)
-            self.opportunities_layout.addWidget(card)
-            return card
+                    if opportunity.started_at:
+                        work_duration = current_time - opportunity.started_at
+                        time_text.append(f"Work Time: {self.format_duration(work_duration)}")
+                else:
+                    time_text.append(f"Assigned to: {acceptor.first_name} {acceptor.last_name}")
         
-        except Exception as e:
-            print(f"ERROR creating opportunity widget: {str(e)}")
-            print("Traceback:", traceback.format_exc())
-            return None
+        return " • ".join(time_text)
 
     def convert_to_local_time(self, utc_time: datetime) -> datetime:
         """Convert UTC timestamp to local timezone for display"""
@@ -972,13 +656,30 @@ class DashboardWidget(QWidget):
         
         layout.addLayout(header_layout)
         
-        # Create scroll area for opportunities
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
+        # Opportunity list: cards are painted by a delegate and fetched a page at a time
+        self.opportunity_model = OpportunityListModel(self.get_filtered_opportunities,
+                                                      self.get_opportunity_versions,
+                                                      self.get_filter_state, parent=self)
+        self.opportunity_model.refreshed.connect(self.on_opportunities_loaded)
+        self.opportunity_model.load_failed.connect(self.on_opportunities_failed)
+        self.opportunity_model.rowsInserted.connect(lambda *args: self.focus_pending_ticket())
+        self.opportunity_list = QListView()
+        self.opportunity_list.setModel(self.opportunity_model)
+        self.opportunity_delegate = OpportunityCardDelegate(self.format_time_info, self.opportunity_list)
+        self.opportunity_delegate.is_compact = self.is_compact
+        self.opportunity_list.setItemDelegate(self.opportunity_delegate)
+        self.opportunity_list.setResizeMode(QListView.Adjust)
+        self.opportunity_list.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.opportunity_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.opportunity_list.setSelectionMode(QListView.SingleSelection)
+        self.opportunity_list.setMouseTracking(True)
+        self.opportunity_list.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.opportunity_list.customContextMenuRequested.connect(self.show_opportunity_menu)
+        self.opportunity_list.setStyleSheet("""
+            QListView {
                 border: none;
                 background-color: transparent;
+                outline: none;
             }
             QScrollBar:vertical {
                 border: none;
@@ -996,16 +697,11 @@ class DashboardWidget(QWidget):
                 background: none;
             }
         """)
-        
-        # Container for opportunities
-        self.opportunities_container = QWidget()
-        self.opportunities_container.setStyleSheet("background-color: transparent;")
-        self.opportunities_layout = QVBoxLayout(self.opportunities_container)
-        self.opportunities_layout.setSpacing(16)
-        self.opportunities_layout.setContentsMargins(0, 0, 0, 0)
-        
-        self.scroll_area.setWidget(self.opportunities_container)
-        layout.addWidget(self.scroll_area)
+        self.opportunity_delegate.status_clicked.connect(self.show_status_menu)
+        self.opportunity_delegate.comments_clicked.connect(self.show_comments_dialog)
+        self.opportunity_delegate.details_clicked.connect(self.show_opportunity_details)
+        self.opportunity_delegate.attachment_clicked.connect(self.open_attachment)
+        layout.addWidget(self.opportunity_list)
         
         # Create refresh animation components (initially hidden)
         self.refresh_animation = QLabel(self)
@@ -1042,76 +738,13 @@ class DashboardWidget(QWidget):
         Args:
             show_refresh_animation: Whether to show the refresh animation
         """
-        if self.is_loading:
-            return
-            
-        self.is_loading = True
-        
-        # Only show refresh animation when explicitly requested
-        if show_refresh_animation:
-            self.show_refresh_animation()
-        
-        db = SessionLocal()
-        try:
-            # Clear existing widgets
-            self.cleanup_widgets()
-            
-            # Get opportunities based on filter
-            opportunities = self.get_filtered_opportunities(db)
-            
-            print(f"DEBUG: DashboardWidget refreshed {len(opportunities)} opportunities with filter '{self.current_filter}'")
-            
-            # Mark new opportunities as viewed and update toolbar
-            # Important: This must be consistent with how the notification system identifies "new" tickets
-            parent = self.parent()
-            if parent and hasattr(parent, 'toolbar'):
-                marked_count = 0
-                
-                # For all new status items visible in any view
-                for opp in opportunities:
-                    # Check status using normalized_status property
-                    if hasattr(opp, 'normalized_status') and opp.normalized_status == "new":
-                        if opp.id not in parent.toolbar.viewed_opportunities:
-                            print(f"DEBUG: Dashboard marking opportunity as viewed: {opp.id} (Status: {opp.status})")
-                            parent.toolbar.viewed_opportunities.add(opp.id)
-                            marked_count += 1
-                
-                if marked_count > 0:
-                    print(f"DEBUG: Dashboard marked {marked_count} opportunities as viewed")
-                    # Update notification badge
-                    parent.toolbar.check_updates()
-            
-            # Add opportunity widgets
-            for opportunity in opportunities:
-                self.add_opportunity_widget(opportunity)
-                
-            # Update scroll area contents
-            self.opportunities_container.adjustSize()
-            
-        except Exception as e:
-            print(f"Error refreshing opportunities: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-        finally:
-            self.is_loading = False
-            db.close()
-            
-            # Only show refresh confirmation when animation was shown
-            if show_refresh_animation:
-                self.hide_refresh_animation()
+        self.load_opportunities(show_refresh_animation)
 
     def cleanup_widgets(self) -> None:
-        """Safely clean up widgets"""
+        """Drop the loaded opportunity rows"""
         try:
-            # Clear all widgets from the layout
-            if hasattr(self, 'opportunities_layout'):
-                while self.opportunities_layout.count():
-                    item = self.opportunities_layout.takeAt(0)
-                    if item and item.widget():
-                        item.widget().deleteLater()
-            
-            # Clear the widget list
-            self.opportunity_widgets.clear()
+            if hasattr(self, 'opportunity_model'):
+                self.opportunity_model.clear()
         except Exception as e:
             print(f"Error during cleanup: {str(e)}")
     
@@ -1121,8 +754,8 @@ class DashboardWidget(QWidget):
             return
             
         # Position in center of visible area
-        viewport_rect = self.scroll_area.viewport().rect()
-        global_pos = self.scroll_area.viewport().mapToGlobal(viewport_rect.center())
+        viewport_rect = self.opportunity_list.viewport().rect()
+        global_pos = self.opportunity_list.viewport().mapToGlobal(viewport_rect.center())
         local_pos = self.mapFromGlobal(global_pos)
         
         # Position the spinner
@@ -1236,81 +869,82 @@ class DashboardWidget(QWidget):
     def load_opportunities(self, show_refresh_animation=False):
         """Load opportunities based on current filter
         
+        The query runs in the background; a newer call supersedes one still
+        in flight, so rapid filter changes only apply the last one.
+        
         Args:
             show_refresh_animation: Whether to show the refresh animation
                                    True when triggered by refresh button,
                                    False during initial load or other automatic calls
         """
-        if self.is_loading:
-            return
-            
         self.is_loading = True
         
         # Only show refresh animation when explicitly requested (e.g., from refresh button)
         if show_refresh_animation:
+            self.refresh_animation_requested = True
             self.show_refresh_animation()
         
+        # Extra debug - print current filter and UI state
+        print(f"\nDEBUG: Loading opportunities with filter '{self.current_filter}'")
+        print(f"DEBUG: Current UI buttons checked state:")
+        if hasattr(self, 'filter_buttons'):
+            for filter_id, btn in self.filter_buttons.items():
+                print(f"  {filter_id}: {btn.isChecked()}")
+        
+        # Update only the rows whose tickets changed
+        self.opportunity_model.refresh()
+    
+    def on_opportunities_loaded(self):
+        """Finish a load once the model has applied the latest rows"""
         try:
-            # Clear existing widgets
-            self.cleanup_widgets()
+            opportunities = self.opportunity_model.opportunities()
+            print(f"DEBUG: DashboardWidget loaded {len(opportunities)} opportunities with filter '{self.current_filter}'")
             
-            # Extra debug - print current filter and UI state
-            print(f"\nDEBUG: Loading opportunities with filter '{self.current_filter}'")
-            print(f"DEBUG: Current UI buttons checked state:")
-            if hasattr(self, 'filter_buttons'):
-                for filter_id, btn in self.filter_buttons.items():
-                    print(f"  {filter_id}: {btn.isChecked()}")
-                    
-            db = SessionLocal()
-            try:
-                # Get opportunities based on filter
-                opportunities = self.get_filtered_opportunities(db)
-                
-                print(f"DEBUG: DashboardWidget loaded {len(opportunities)} opportunities with filter '{self.current_filter}'")
-                
-                # Store last error if any
-                self._last_error = None
-                
-                # Mark new opportunities as viewed and update toolbar
-                # Important: This must be consistent with how the notification system identifies "new" tickets
-                parent = self.parent()
-                if parent and hasattr(parent, 'toolbar'):
-                    marked_count = 0
-                    
-                    # For all new status items visible in any view
-                    for opp in opportunities:
-                        # Check status using normalized_status property
-                        if hasattr(opp, 'normalized_status') and opp.normalized_status == "new":
-                            if opp.id not in parent.toolbar.viewed_opportunities:
-                                print(f"DEBUG: Dashboard marking opportunity as viewed: {opp.id} (Status: {opp.status})")
-                                parent.toolbar.viewed_opportunities.add(opp.id)
-                                marked_count += 1
-                
-                    if marked_count > 0:
-                        print(f"DEBUG: Dashboard marked {marked_count} opportunities as viewed")
-                        # Update notification badge
-                        parent.toolbar.check_updates()
-                
-                # Add opportunity widgets
-                for opportunity in opportunities:
-                    self.add_opportunity_widget(opportunity)
-                    
-                # Update scroll area contents
-                self.opportunities_container.adjustSize()
-                
-            except Exception as e:
-                self._last_error = str(e)
-                print(f"Error loading opportunities: {str(e)}")
-                print(traceback.format_exc())
-            finally:
-                db.close()
+            # Store last error if any
+            self._last_error = None
+            
+            # Mark new opportunities as viewed and update toolbar
+            # Important: This must be consistent with how the notification system identifies "new" tickets
+            parent = self.parent()
+            if parent and hasattr(parent, 'toolbar'):
+                marked_count = 0
                 
-        finally:
-            self.is_loading = False
+                # For all new status items visible in any view
+                for opp in opportunities:
+                    # Check status using normalized_status property
+                    if hasattr(opp, 'normalized_status') and opp.normalized_status == "new":
+                        if opp.id not in parent.toolbar.viewed_opportunities:
+                            print(f"DEBUG: Dashboard marking opportunity as viewed: {opp.id} (Status: {opp.status})")
+                            parent.toolbar.viewed_opportunities.add(opp.id)
+                            marked_count += 1
+            
+                if marked_count > 0:
+                    print(f"DEBUG: Dashboard marked {marked_count} opportunities as viewed")
+                    # Update notification badge
+                    parent.toolbar.check_updates()
             
-            # Only show refresh confirmation when animation was shown
-            if show_refresh_animation:
-                self.hide_refresh_animation()
+            self.focus_pending_ticket()
+            
+        except Exception as e:
+            self._last_error = str(e)
+            print(f"Error loading opportunities: {str(e)}")
+            print(traceback.format_exc())
+        finally:
+            self.finish_loading()
+    
+    def on_opportunities_failed(self, error):
+        """Record a failed background load"""
+        self._last_error = error
+        print(f"Error loading opportunities: {error}")
+        self.finish_loading()
+    
+    def finish_loading(self):
+        self.is_loading = False
+        
+        # Only show refresh confirmation when animation was shown
+        if self.refresh_animation_requested:
+            self.refresh_animation_requested = False
+            self.hide_refresh_animation()
     
     def apply_filter(self, filter_id):
         """Apply filter and reload opportunities"""
@@ -1369,54 +1003,58 @@ class DashboardWidget(QWidget):
             screen = QApplication.primaryScreen().availableGeometry()
             self.resize(int(screen.width() * 0.8), int(screen.height() * 0.8))
         
-        # Refresh the opportunities to update their layout
-        self.load_opportunities() 
+        # Re-measure every card, since card layout depends on the view mode
+        self.opportunity_delegate.is_compact = self.is_compact
+        self.opportunity_list.doItemsLayout()
 
     def focus_ticket(self, ticket_id):
         """Focus on a specific ticket by ID"""
         if not ticket_id:
             return
             
-        # Ensure the ticket is loaded
+        # Ensure the ticket is loaded; it is focused once its row arrives
+        self.pending_focus_id = str(ticket_id)
         self.current_filter = "active_tickets"  # Switch to all tickets view
         self.load_opportunities()
+    
+    def focus_pending_ticket(self):
+        """Scroll to and highlight the ticket requested by focus_ticket, if loaded"""
+        if not self.pending_focus_id or self.is_loading:
+            return
         
-        # Find and scroll to the ticket widget
-        if ticket_id in self.opportunity_widgets:
-            widget = self.opportunity_widgets[ticket_id]
-            # Ensure the widget is visible
-            scroll_area = self.findChild(QScrollArea)
-            if scroll_area:
-                # Calculate position to scroll to
-                widget_pos = widget.mapTo(scroll_area.widget(), QPoint(0, 0))
-                scroll_area.ensureVisible(0, widget_pos.y(), 0, widget.height() // 2)
-                
-                # Highlight the ticket briefly
-                original_style = widget.styleSheet()
-                highlight_style = """
-                    QFrame {
-                        background-color: #0078d4;
-                        border-radius: 6px;
-                        padding: 12px;
-                    }
-                """
-                widget.setStyleSheet(highlight_style)
-                
-                # Reset style after a delay
-                QTimer.singleShot(1000, lambda: widget.setStyleSheet(original_style))
+        row = self.opportunity_model.row_of(self.pending_focus_id)
+        if row is None:
+            # Not loaded yet: fetch the next page, or give up at the end
+            if self.opportunity_model.canFetchMore():
+                self.opportunity_model.fetchMore()
+            elif not self.opportunity_model.is_fetching():
+                self.pending_focus_id = None
+            return
+        
+        self.pending_focus_id = None
+        index = self.opportunity_model.index(row)
+        self.opportunity_list.scrollTo(index, QListView.PositionAtCenter)
+        
+        # Highlight the ticket briefly
+        self.opportunity_list.setCurrentIndex(index)
+        QTimer.singleShot(1000, self.opportunity_list.clearSelection)
 
     def show_comments_dialog(self, opportunity):
         """Show dialog for viewing and adding comments"""
         try:
-            # Get fresh opportunity data from database
+            # Get the ticket's comments from the database
             db = SessionLocal()
-            fresh_opp = db.query(Opportunity).filter(Opportunity.id == opportunity.id).first()
-            if fresh_opp:
-                # Update the opportunity object with fresh data
-                opportunity.comments = fresh_opp.comments
-            db.close()
+            try:
+                comments = (
+                    db.query(Comment)
+                    .filter(Comment.opportunity_id == opportunity.id)
+                    .order_by(Comment.created_at, Comment.id)
+                    .all()
+                )
+            finally:
+                db.close()
             
-            dialog = CommentDialog(opportunity, self)
+            dialog = CommentDialog(opportunity, comments, self)
             if dialog.exec_() == QDialog.Accepted:
                 comment = dialog.get_comment()
                 if comment:
@@ -1429,21 +1067,55 @@ class DashboardWidget(QWidget):
             print("Traceback:", traceback.format_exc())
             QMessageBox.critical(self, "Error", f"An error occurred while showing comments: {str(e)}")
     
-    def handle_status_change(self, new_status):
-        """Handle status change from combo box"""
+    def show_status_menu(self, opportunity, global_pos):
+        """Offer the other statuses for an opportunity as a popup menu"""
+        menu = QMenu(self)
+        for status in STATUS_CHOICES:
+            if status != opportunity.display_status:
+                action = menu.addAction(status)
+                action.triggered.connect(lambda checked, o=opportunity, s=status: self.handle_status_change(o, s))
+        menu.exec_(global_pos)
+
+    def show_opportunity_menu(self, pos):
+        """Context menu for the opportunity under the cursor"""
+        index = self.opportunity_list.indexAt(pos)
+        opportunity = index.data(OpportunityRole) if index.isValid() else None
+        if opportunity is None:
+            return
+        
+        menu = QMenu(self)
+        status_menu = menu.addMenu("Change Status")
+        for status in STATUS_CHOICES:
+            action = status_menu.addAction(status)
+            action.setEnabled(status != opportunity.display_status)
+            action.triggered.connect(lambda checked, o=opportunity, s=status: self.handle_status_change(o, s))
+        
+        comment_count = opportunity.comment_count
+        menu.addAction(f"Comments ({comment_count})" if comment_count else "Add Comment",
+                       lambda o=opportunity: self.show_comments_dialog(o))
+        
+        if opportunity.description or opportunity.systems:
+            menu.addAction("View Details", lambda o=opportunity: self.show_opportunity_details(o))
+        
+        if opportunity.files:
+            files_menu = menu.addMenu(f"Attachments ({len(opportunity.files)})")
+            for file in opportunity.files:
+                files_menu.addAction(f"📎 {file.display_name}", lambda f=file: self.open_attachment(f))
+        
+        menu.exec_(self.opportunity_list.viewport().mapToGlobal(pos))
+
+    def show_opportunity_details(self, opportunity):
+        """Show the full description and systems of an opportunity"""
+        details = opportunity.description or ""
+        systems = card_systems(opportunity)
+        if systems:
+            details = f"{details}\n\nSystems: {systems}".strip()
+        self.show_details_dialog(opportunity.display_title, details)
+
+    def handle_status_change(self, opportunity, new_status):
+        """Handle a status picked from a card's status menu"""
         try:
             print(f"\nDEBUG: Status change initiated - New status: {new_status}")
-            combo = self.sender()  # Get the combo box that sent the signal
-            if not combo:
-                print("DEBUG: No combo box found as sender")
-                return
-            
-            # Get the opportunity from the combo box property
-            opportunity = combo.property("opportunity")
-            if not opportunity:
-                print("DEBUG: No opportunity found in combo box property")
-                return
-            
             print(f"DEBUG: Found opportunity {opportunity.id} for status change")
             
             # Show dialog for "Needs Info" or "Completed" status
@@ -1453,13 +1125,9 @@ class DashboardWidget(QWidget):
                     comment = dialog.get_comment()
                     if new_status == "Needs Info" and not comment:
                         QMessageBox.warning(self, "Required Information", "Please specify what information is needed.")
-                        combo.setCurrentText(opportunity.status.title())  # Revert the combo box
                         return
                     # Update the status with the comment
                     self.update_status(opportunity, new_status, comment)
-                else:
-                    # Dialog was cancelled, revert the combo box
-                    combo.setCurrentText(opportunity.status.title())
             else:
                 # For other statuses, update directly
                 self.update_status(opportunity, new_status)
@@ -1468,39 +1136,37 @@ class DashboardWidget(QWidget):
             print(f"ERROR in handle_status_change: {str(e)}")
             print("Traceback:", traceback.format_exc())
             QMessageBox.critical(self, "Error", f"An error occurred while handling status change: {str(e)}")
-    
+
     def add_comment(self, opportunity, comment):
         """Add a comment to an opportunity"""
         try:
             now = datetime.now(timezone.utc)
             db = SessionLocal()
             
-            # Get fresh opportunity data
-            opp = db.query(Opportunity).filter(Opportunity.id == opportunity.id).first()
+            # Only the columns the notification needs, not the whole ticket
+            opp = (
+                db.query(Opportunity.id, Opportunity.title, Opportunity.creator_id, Opportunity.acceptor_id)
+                .filter(Opportunity.id == opportunity.id)
+                .first()
+            )
             if not opp:
                 print("ERROR: Opportunity not found")
                 return None
             
-            # Initialize comments list if it doesn't exist
-            if opp.comments is None:
-                opp.comments = []
+            # Append the comment as its own row
+            db.add(Comment(
+                opportunity_id=opp.id,
+                user_id=self.current_user.id,
+                user_name=f"{self.current_user.first_name} {self.current_user.last_name}",
+                text=comment,
+                created_at=now
+            ))
             
-            # Add the new comment with consistent structure
-            comment_data = {
-                'user_id': str(self.current_user.id),
-                'user_name': f"{self.current_user.first_name} {self.current_user.last_name}",
-                'text': comment,
-                'timestamp': now.isoformat()  # Store as ISO format string
-            }
+            # Bump the ticket's version so open dashboards pick up the new count
+            db.query(Opportunity).filter(Opportunity.id == opp.id).update(
+                {Opportunity.updated_at: now}, synchronize_session=False)
             
-            # Debug print
-            print(f"Adding comment: {comment_data}")
-            print(f"Current comments: {opp.comments}")
-            
-            # Append the new comment to the JSONB array
-            opp.comments = opp.comments + [comment_data]
-                
-            print(f"Updated comments: {opp.comments}")
+            print(f"Adding comment to {opp.id}")
             
             # Create notification for the other party
             target_user_id = opp.creator_id if self.current_user.id != opp.creator_id else opp.acceptor_id
@@ -1517,10 +1183,7 @@ class DashboardWidget(QWidget):
             
             # Commit the changes
             db.commit()
-            print(f"Comment saved successfully. Total comments: {len(opp.comments)}")
-            
-            # Update the original opportunity object with new comments
-            opportunity.comments = opp.comments
+            print("Comment saved successfully")
             
             # Force a refresh of the dashboard to update comment counts
             self.load_opportunities()
@@ -1556,14 +1219,13 @@ class DashboardWidget(QWidget):
                 
                 # Add comment if provided
                 if comment:
-                    comment_data = {
-                        "user_id": str(self.current_user.id) if self.current_user else None,
-                        "text": comment,
-                        "user_name": f"{self.current_user.first_name} {self.current_user.last_name}" if self.current_user else "Unknown"
-                    }
-                    if not getattr(opportunity, 'comments', None):
-                        setattr(opportunity, 'comments', [])
-                    getattr(opportunity, 'comments').append(comment_data)
+                    db.add(Comment(
+                        opportunity_id=opportunity.id,
+                        user_id=self.current_user.id if self.current_user else None,
+                        user_name=f"{self.current_user.first_name} {self.current_user.last_name}" if self.current_user else "Unknown",
+                        text=comment,
+                        created_at=now
+                    ))
                 
                 # Debug prints
                 print(f"Old status: {str(opportunity.status)}")
@@ -1621,7 +1283,7 @@ class DashboardWidget(QWidget):
                 )
                 db.add(activity_log)
                 
-                # Update opportunity status and timestamp
+                # Update opportunity status (stored in canonical form) and timestamp
                 setattr(opportunity, 'status', new_status)
                 setattr(opportunity, 'updated_at', now)
                 
@@ -1676,11 +1338,21 @@ class DashboardWidget(QWidget):
                 final_path = full_path
                 
             else:
-                # Remote storage (Supabase) - download to temp location
+                # Remote storage (Supabase) - served from the attachment cache when
+                # it holds these bytes; files without a hash go to a temp location
                 print(f"Downloading remote file: {file.storage_path}")
                 try:
-                    temp_file_path = SupabaseStorageService.download_file(file.storage_path)
-                    if not temp_file_path:
+                    final_path = None
+                    if file.hash:
+                        try:
+                            final_path = get_attachment_cache().fetch(file.storage_path, file.hash, file_ext)
+                        except AttachmentHashMismatchError as mismatch:
+                            # Not cached, but the bytes were downloaded: open them as a temp file
+                            print(f"Warning: {mismatch}")
+                            temp_file_path = mismatch.path
+                    else:
+                        temp_file_path = SupabaseStorageService.download_file(file.storage_path)
+                    if not final_path and not temp_file_path:
                         # If download fails, try to get a download URL
                         file_url = SupabaseStorageService.get_file_url(file.storage_path, expires_in=3600)
                         if file_url:
@@ -1701,7 +1373,7 @@ class DashboardWidget(QWidget):
                                 f"The file could not be opened or downloaded from cloud storage."
                             )
                             return
-                    final_path = temp_file_path
+                    final_path = final_path or temp_file_path
                     
                 except Exception as remote_error:
                     print(f"Error accessing remote file: {remote_error}")
@@ -1814,44 +1486,6 @@ class DashboardWidget(QWidget):
         self.hide()
         event.ignore()
 
-    def toggle_description(self, container, label, full_text):
-        """Toggle between truncated and full text in description"""
-        if not hasattr(container, 'is_expanded'):
-            container.is_expanded = False
-            
-        if container.is_expanded:
-            # Contract: Show truncated text
-            max_length = 150
-            truncated = len(full_text) > max_length
-            display_text = full_text if not truncated else full_text[:max_length] + "..."
-            label.setText(display_text)
-            
-            # Update show more indicator if needed
-            if truncated:
-                # Find and update the show more indicator
-                for i in range(container.layout().count()):
-                    widget = container.layout().itemAt(i).widget()
-                    if isinstance(widget, QLabel) and widget != label:
-                        widget.setText("Click to expand...")
-                        widget.show()
-            
-            container.is_expanded = False
-        else:
-            # Expand: Show full text
-            label.setText(full_text)
-            
-            # Hide the show more indicator
-            for i in range(container.layout().count()):
-                widget = container.layout().itemAt(i).widget()
-                if isinstance(widget, QLabel) and widget != label:
-                    widget.setText("Click to collapse...")
-            
-            container.is_expanded = True
-            
-        # Adjust layout as needed
-        container.adjustSize()
-        self.opportunities_container.adjustSize()
-        
     def show_details_dialog(self, title, description):
         """Show a dialog with the full text of a description"""
         dialog = QDialog(self)
@@ -2294,9 +1928,10 @@ class StatusChangeDialog(QDialog):
         return self.comment
 
 class CommentDialog(QDialog):
-    def __init__(self, opportunity, parent=None):
+    def __init__(self, opportunity, comments, parent=None):
         super().__init__(parent)
         self.opportunity = opportunity
+        self.comments = comments
         self.comment = None
         self.initUI()
         
@@ -2314,7 +1949,7 @@ class CommentDialog(QDialog):
         layout.addWidget(title)
         
         # Previous comments
-        if self.opportunity.comments:
+        if self.comments:
             comments_frame = QFrame()
             comments_frame.setStyleSheet("""
                 QFrame {
@@ -2326,7 +1961,7 @@ class CommentDialog(QDialog):
             """)
             comments_layout = QVBoxLayout(comments_frame)
             
-            for comment in self.opportunity.comments:
+            for comment in self.comments:
                 comment_widget = QFrame()
                 comment_widget.setStyleSheet("""
                     QFrame {
@@ -2338,29 +1973,19 @@ class CommentDialog(QDialog):
                 """)
                 comment_layout = QVBoxLayout(comment_widget)
                 
-                # Format timestamp if it exists
-                timestamp = comment.get('timestamp', '')
-                if timestamp:
-                    try:
-                        # Parse ISO format timestamp
-                        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                        formatted_time = dt.strftime("%Y-%m-%d %H:%M")
-                    except:
-                        formatted_time = timestamp
-                else:
-                    formatted_time = "Unknown time"
+                formatted_time = comment.created_at.strftime("%Y-%m-%d %H:%M") if comment.created_at else "Unknown time"
                 
-                header = QLabel(f"{comment.get('user_name', 'Unknown User')} • {formatted_time}")
+                header = QLabel(f"{comment.user_name or 'Unknown User'} • {formatted_time}")
                 header.setStyleSheet("color: #888888; font-size: 11px;")
                 comment_layout.addWidget(header)
                 
-                text = QLabel(comment.get('text', ''))
-                text.setWordWrap(True)
-                text.setStyleSheet("color: white; font-size: 12px;")
-                comment_layout.addWidget(text)
+                comment_text = QLabel(comment.text or '')
+                comment_text.setWordWrap(True)
+                comment_text.setStyleSheet("color: white; font-size: 12px;")
+                comment_layout.addWidget(comment_text)
                 
-                if comment.get('type'):
-                    type_label = QLabel(f"Status changed to: {comment['type']}")
+                if comment.type:
+                    type_label = QLabel(f"Status changed to: {comment.type}")
                     type_label.setStyleSheet("color: #0078d4; font-size: 11px;")
                     comment_layout.addWidget(type_label)
                 
@@ -0,0 +1,138 @@
+"""
+Background database access for the UI.
+
+Queries run on a shared QThreadPool, each with its own session, and their
+results are delivered back on the UI thread through Qt signals. Requests
+are keyed: submitting a new request for a key supersedes the previous one,
+which is skipped if it has not started yet and its result dropped if it has.
+
+Task functions receive an open session and must return values that do not
+need it: plain Python values, or detached instances with everything the
+caller reads already loaded. They must not touch any widget.
+"""
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from app.database.connection import SessionLocal
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import threading
+import traceback
+
+# Worker threads for background queries; leaves pool connections for UI-thread writes
+MAX_WORKERS = 4
+
+class QueryTask(QRunnable):
+    """One keyed query run on the worker pool"""
+
+    def __init__(self, worker: "DatabaseWorker", key: Hashable, generation: int, fn: Callable):
+        super().__init__()
+        self.worker = worker
+        self.key = key
+        self.generation = generation
+        self.fn = fn
+
+    def run(self):
+        # Superseded before it started: skip the round trip entirely
+        if not self.worker.is_current(self.key, self.generation):
+            return
+
+        db = SessionLocal()
+        try:
+            result = self.fn(db)
+        except Exception as e:
+            print(f"Error in background query {self.key}: {str(e)}")
+            print(traceback.format_exc())
+            self.worker.task_failed.emit(self.key, self.generation, str(e))
+        else:
+            self.worker.task_finished.emit(self.key, self.generation, result)
+        finally:
+            db.close()
+
+class DatabaseWorker(QObject):
+    """Runs keyed database queries off the UI thread
+
+    Results and errors are delivered to the callbacks on the UI thread,
+    and only for the latest request of each key.
+    """
+    task_finished = pyqtSignal(object, int, object)  # key, generation, result
+    task_failed = pyqtSignal(object, int, str)       # key, generation, error
+
+    def __init__(self, max_workers: int = MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self._lock = threading.Lock()
+        self._generations: Dict[Hashable, int] = {}
+        self._handlers: Dict[Hashable, Tuple[int, Callable, Optional[Callable]]] = {}
+        self.task_finished.connect(self._on_finished)
+        self.task_failed.connect(self._on_failed)
+
+    def submit(self, key: Hashable, fn: Callable[[Any], Any],
+               on_result: Callable[[Any], None],
+               on_error: Optional[Callable[[str], None]] = None) -> int:
+        """
+        Run fn(db) in the background, superseding any request with the same key.
+
+        Args:
+            key: Identifies the request, e.g. (id(widget), "page")
+            fn: Called with an open session on a worker thread
+            on_result: Called with fn's return value on the UI thread
+            on_error: Called with the error message on the UI thread
+
+        Returns:
+            Generation number of this request
+        """
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+        self._handlers[key] = (generation, on_result, on_error)
+        self.pool.start(QueryTask(self, key, generation, fn))
+        return generation
+
+    def cancel(self, key: Hashable) -> None:
+        """Drop the pending request for a key, if any"""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+        self._handlers.pop(key, None)
+
+    def is_pending(self, key: Hashable) -> bool:
+        """Whether a request for the key is waiting for its result"""
+        return key in self._handlers
+
+    def is_current(self, key: Hashable, generation: int) -> bool:
+        with self._lock:
+            return self._generations.get(key) == generation
+
+    def _take_handler(self, key, generation):
+        handler = self._handlers.get(key)
+        if handler is None or handler[0] != generation:
+            return None
+        del self._handlers[key]
+        return handler
+
+    def _on_finished(self, key, generation, result):
+        handler = self._take_handler(key, generation)
+        if handler is None:
+            return
+        try:
+            handler[1](result)
+        except Exception as e:
+            print(f"Error handling result of {key}: {str(e)}")
+            print(traceback.format_exc())
+
+    def _on_failed(self, key, generation, error):
+        handler = self._take_handler(key, generation)
+        if handler is None or handler[2] is None:
+            return
+        try:
+            handler[2](error)
+        except Exception as e:
+            print(f"Error handling failure of {key}: {str(e)}")
+            print(traceback.format_exc())
+
+_worker: Optional[DatabaseWorker] = None
+
+def get_database_worker() -> DatabaseWorker:
+    """The shared worker; must first be called from the UI thread"""
+    global _worker
+    if _worker is None:
+        _worker = DatabaseWorker()
+    return _worker
@@ -15,15 +15,16 @@ from app.ui.qt_types import (
     NoPen, WindowMinimized, AA_EnableHighDpiScaling, AA_UseHighDpiPixmaps,
     AA_UseStyleSheetPropagationInWidgetStyles, AA_DontCreateNativeWidgetSiblings
 )
-from app.ui.dashboard import DashboardWidget
-from app.ui.opportunity_form import OpportunityForm
 from app.ui.auth import AuthWidget
 from app.ui.account_creation import AccountCreationWidget
-from app.ui.settings import SettingsWidget
-from app.ui.management_portal import ManagementPortal
-from app.ui.profile import ProfileWidget
+# The dashboard, form, portal, profile and settings windows (and the Supabase
+# and openpyxl imports behind them) are imported when first opened, so the
+# login screen doesn't wait for them
 from app.ui.notifications import notification_manager
-from app.database.connection import SessionLocal
+from app.ui.db_worker import get_database_worker
+from app.ui.change_listener import ChangeListener
+from app.database.queries import load_update_fingerprint
+from app.database.connection import SessionLocal, configure_pool_logging, log_pool_stats
 from app.models.models import Opportunity, Notification, User
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo  # Import ZoneInfo for more robust timezone handling
@@ -36,6 +37,12 @@ from app.utils.dependency_checker import check_dependencies
 
 T = TypeVar('T')
 
+# Toolbar update check intervals (ms): normal polling, polling while changes
+# are pushed over LISTEN/NOTIFY, and the delay that batches pushed changes
+POLL_INTERVAL = 30000
+FALLBACK_POLL_INTERVAL = 300000
+CHANGE_DEBOUNCE = 250
+
 if TYPE_CHECKING:
     from PyQt5.QtCore import QObject
     from PyQt5.QtWidgets import QWidget as QWidgetType
@@ -200,6 +207,11 @@ class FloatingToolbar(QWidget):
         self.viewed_notifications = set()  # Track viewed notifications
         self.startup_notification_shown = False  # Track if startup notification was shown
         
+        # Last fetched update state; refetched only when the fingerprint changes
+        self.update_fingerprint = None
+        self.new_opportunities = []
+        self.new_notifications = []
+        
         # Load background image
         self.bg_image_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
                                     'resources', 'icons', 'Brushed_Bar_horizontal.png')
@@ -250,11 +262,14 @@ class FloatingToolbar(QWidget):
             print(f"Applying user's saved theme: {self.current_theme}")
             self.apply_static_theme()
 
+        # Update checks query the database off the UI thread
+        self.db_worker = get_database_worker()
+        
         # Initialize notification check timer
         print("DEBUG: Initializing notification check timer")
         self.notification_timer = QTimer(self)
         self.notification_timer.timeout.connect(self.check_updates)
-        check_interval = 30000  # Check every 30 seconds (30000 ms)
+        check_interval = POLL_INTERVAL
         print(f"DEBUG: Starting notification timer with interval of {check_interval}ms")
         self.notification_timer.start(check_interval)
         print("DEBUG: Notification timer started")
@@ -262,6 +277,42 @@ class FloatingToolbar(QWidget):
         # Run an immediate check after initialization
         QTimer.singleShot(2000, lambda: self.check_updates())
         print("DEBUG: Scheduled immediate update check after 2 seconds")
+        
+        # Database changes are pushed over LISTEN/NOTIFY; while that works the
+        # timer above only runs as a slow fallback. Bursts of changes are
+        # collapsed into one update check.
+        self.change_timer = QTimer(self)
+        self.change_timer.setSingleShot(True)
+        self.change_timer.setInterval(CHANGE_DEBOUNCE)
+        self.change_timer.timeout.connect(self.check_updates)
+        
+        self.change_listener = ChangeListener(parent=self)
+        self.change_listener.change_received.connect(self.on_database_change)
+        self.change_listener.connection_changed.connect(self.on_change_listener_connected)
+        QApplication.instance().aboutToQuit.connect(self.change_listener.stop)
+        self.change_listener.start()
+
+    def on_database_change(self, payload):
+        """Check for updates when a change relevant to the toolbar is pushed"""
+        if not self.parent() or not self.parent().current_user:
+            return
+        
+        if payload.get("table") == "notifications":
+            # Only this user's notifications affect the badge
+            if payload.get("user_id") != str(self.parent().current_user.id):
+                return
+        
+        print(f"DEBUG: Database change pushed: {payload}")
+        self.change_timer.start()
+
+    def on_change_listener_connected(self, connected):
+        """Poll rarely while changes are pushed, and at the normal rate otherwise"""
+        interval = FALLBACK_POLL_INTERVAL if connected else POLL_INTERVAL
+        print(f"DEBUG: Change listener {'connected' if connected else 'disconnected'}, polling every {interval}ms")
+        self.notification_timer.setInterval(interval)
+        if connected:
+            # Catch up on anything missed while not listening
+            self.change_timer.start()
 
     def initUI(self):
         # Main layout
@@ -744,14 +795,124 @@ class FloatingToolbar(QWidget):
                 self.save_position()
 
     def check_updates(self):
-        """Check for new opportunities and notifications"""
+        """Check for new opportunities and notifications in the background"""
         if not self.parent() or not self.parent().current_user:
             return
         
+        # Use ZoneInfo for more robust timezone handling
+        current_time = datetime.now(ZoneInfo('UTC'))
+        user_id = str(self.parent().current_user.id)
+        last_fingerprint = self.update_fingerprint
+        
+        # A check still in flight is superseded by this one
+        self.db_worker.submit(
+            (id(self), "updates"),
+            lambda db: self.fetch_updates(db, user_id, last_fingerprint),
+            lambda result: self.process_updates(current_time, *result),
+            lambda error: print(f"Database error in check_updates: {error}")
+        )
+
+    @staticmethod
+    def fetch_updates(db, user_id, last_fingerprint=None):
+        """
+        Load NEW opportunities created by other users and the user's unread
+        notifications. Runs on the database worker; returns detached objects.
+        
+        A fingerprint query runs first; when it matches last_fingerprint
+        nothing has changed and the lists are not fetched again.
+        
+        Returns:
+            Tuple of (fingerprint, new opportunities, unread notifications),
+            with both lists None when unchanged
+        """
+        fingerprint = load_update_fingerprint(db, user_id)
+        if fingerprint == last_fingerprint:
+            return fingerprint, None, None
+        
+        # Cleared below if a list could not be loaded, forcing a refetch next time
+        complete = True
+        
+        # Check for new opportunities
         try:
-            # Use ZoneInfo for more robust timezone handling
-            utc = ZoneInfo('UTC')
-            current_time = datetime.now(utc)
+            # SQL version - statuses are stored lowercase
+            new_opportunities_query = text("""
+                SELECT id, title, description, status, created_at, creator_id
+                FROM opportunities 
+                WHERE status = 'new' 
+                AND creator_id != :user_id
+            """)
+            
+            result = db.execute(new_opportunities_query, {"user_id": user_id})
+            
+            # Process the raw SQL results into Opportunity objects safely
+            new_opportunities = []
+
+            valid_fields = ['id', 'title', 'description', 'status', 'created_at', 'creator_id', 'acceptor_id', 'completed_at', 'started_at', 'response_time', 'work_time', 'updated_at', 'systems', 'files']
+            
+            for row in result:
+                try:
+                    # Create Opportunity object - only pass expected fields
+                    if hasattr(row, '_asdict'):
+                        row_dict = row._asdict()
+                    elif hasattr(row, '_mapping'):
+                        # For SQLAlchemy 1.4+
+                        row_dict = dict(row._mapping)
+                    else:
+                        # Fallback - direct dict conversion
+                        row_dict = dict(row)
+                        
+                    # Filter row_dict to only include valid fields
+                    filtered_dict = {k: v for k, v in row_dict.items() if k in valid_fields}
+                    
+                    # Create Opportunity object with filtered dict
+                    opp = Opportunity(**filtered_dict)
+                    new_opportunities.append(opp)
+                except Exception as row_err:
+                    print(f"Error processing row: {str(row_err)}")
+                    continue
+        except Exception as sql_err:
+            print(f"Error with SQL approach: {str(sql_err)}")
+            db.rollback()  # Rollback on SQL error before trying ORM
+            
+            # Fallback to ORM approach
+            try:
+                new_opportunities = db.query(Opportunity).filter(
+                    Opportunity.status == "new",
+                    Opportunity.creator_id != user_id
+                ).all()
+            except Exception as orm_err:
+                print(f"Error with ORM fallback: {str(orm_err)}")
+                db.rollback()  # Rollback transaction on failure
+                new_opportunities = []  # Set empty list to avoid errors
+                complete = False
+        
+        # Check new notifications (these are already filtered by user_id)
+        try:
+            new_notifications = db.query(Notification).filter(
+                Notification.user_id == user_id,
+                Notification.read == False
+            ).all()
+        except Exception as notif_err:
+            print(f"Error getting notifications: {str(notif_err)}")
+            db.rollback()  # Rollback transaction on failure
+            new_notifications = []  # Set empty list to avoid errors
+            complete = False
+        
+        return fingerprint if complete else None, new_opportunities, new_notifications
+
+    def process_updates(self, current_time, fingerprint, new_opportunities, new_notifications):
+        """Update the badge and show popups for a fetch_updates result"""
+        try:
+            if new_opportunities is None:
+                # Unchanged since the last check: reuse the lists fetched then
+                new_opportunities = self.new_opportunities
+                new_notifications = self.new_notifications
+            else:
+                print(f"DEBUG: Update fingerprint changed: {fingerprint}")
+                self.new_opportunities = new_opportunities
+                self.new_notifications = new_notifications
+            self.update_fingerprint = fingerprint
+            
             print(f"\nDEBUG: Checking updates at {current_time}")
             print(f"DEBUG: Last check time was {self.last_checked_time}")
             print(f"DEBUG: Last reminder time was {self.last_reminder_time}")
@@ -774,214 +935,125 @@ class FloatingToolbar(QWidget):
             if self.startup_notification_shown:
                 self.startup_notification_shown = False
                 
-            db = SessionLocal()
+            # Debug logging for better troubleshooting
+            print(f"DEBUG: New opportunities found in DB: {len(new_opportunities)}")
+            for i, opp in enumerate(new_opportunities, 1):
+                print(f"  {i}. ID: {opp.id}, Title: {opp.title}, Status: {opp.status}, Creator: {opp.creator_id}")
+            
+            # Get all opportunity IDs for cleaning up viewed_opportunities
+            all_new_opps_ids = {opp.id for opp in new_opportunities}
+            print(f"DEBUG: All new opportunity IDs: {all_new_opps_ids}")
+            
+            # Only keep viewed opportunities that are still in the NEW status
+            # This fixes a bug that was causing the viewed_opportunities to be emptied
+            self.viewed_opportunities = {opp_id for opp_id in self.viewed_opportunities if opp_id in all_new_opps_ids}
+            print(f"DEBUG: Viewed opportunities after cleanup: {self.viewed_opportunities}")
+            
+            # If this is initial startup, mark all existing opportunities as viewed
+            # This prevents showing notifications for existing tickets on startup
+            if is_initial_check and len(self.viewed_opportunities) == 0:
+                print("DEBUG: Initial check - marking all existing opportunities as viewed")
+                for opp in new_opportunities:
+                    self.viewed_opportunities.add(opp.id)
+                print(f"DEBUG: Marked {len(new_opportunities)} existing opportunities as viewed")
+            
+            # Get opportunities that haven't been viewed
+            unviewed_opportunities = [opp for opp in new_opportunities if opp.id not in self.viewed_opportunities]
+            print(f"DEBUG: Found {len(unviewed_opportunities)} unviewed NEW opportunities")
+            print(f"DEBUG: Total viewed opportunities: {len(self.viewed_opportunities)}")
+            print(f"DEBUG: Total new opportunities: {len(new_opportunities)}")
             
-            # Make sure we use proper transaction management
+            # Update total notification count (unviewed opportunities + unread notifications)
+            total_count = len(unviewed_opportunities) + len(new_notifications)
+            print(f"DEBUG: Total notification count: {total_count}")
+            
+            # Only update notification count if it's different
+            if total_count != self.notification_count:
+                self.notification_count = total_count
+                self.update_notification_badge()
+            
+            # Show notifications for new opportunities since last check
+            for opp in new_opportunities:
+                if opp.id not in self.viewed_opportunities and opp.created_at > self.last_checked_time:
+                    # Show detailed notification for this new opportunity
+                    print(f"DEBUG: Sending notification for new opportunity: {opp.id} - {opp.title}")
+                    self.show_windows_notification(
+                        "New SI Opportunity",
+                        f"Ticket: {opp.title}\nVehicle: {opp.display_title}\nDescription: {opp.description[:100]}...",
+                        opportunity_id=opp.id
+                    )
+                    # Mark as viewed to prevent duplicate notifications
+                    self.viewed_opportunities.add(opp.id)
+                    print(f"DEBUG: Marked opportunity as viewed: {opp.id}")
+            
+            # Show periodic reminder of total unviewed opportunities (every 5 minutes)
             try:
-                # Begin a new transaction
-                db.begin()
-                
-                # Check for new opportunities
-                try:
-                    # SQL version - use case-insensitive matching
-                    new_opportunities_query = text("""
-                        SELECT id, title, description, status, created_at, creator_id
-                        FROM opportunities 
-                        WHERE LOWER(status) = 'new' 
-                        AND creator_id != :user_id
-                    """)
+                current_seconds_since_reminder = (current_time - self.last_reminder_time).total_seconds()
+                reminder_condition = total_count > 0 and current_seconds_since_reminder > 300
+                print(f"DEBUG: Reminder condition: {reminder_condition} (total_count={total_count}, seconds_since_reminder={current_seconds_since_reminder})")
+                if reminder_condition:
+                    print(f"DEBUG: Showing 5-minute reminder notification for {total_count} unviewed items")
                     
-                    result = db.execute(new_opportunities_query, {"user_id": str(self.parent().current_user.id)})
+                    # Create a more detailed overview similar to startup notification
+                    new_opps_count = len(unviewed_opportunities)
+                    new_notifs_count = len(new_notifications)
                     
-                    # Process the raw SQL results into Opportunity objects safely
-                    new_opportunities = []
-
-                    valid_fields = ['id', 'title', 'description', 'status', 'created_at', 'creator_id', 'acceptor_id', 'completed_at', 'started_at', 'response_time', 'work_time', 'updated_at', 'systems', 'comments', 'files']
-                    
-                    for row in result:
-                        try:
-                            # Create Opportunity object - only pass expected fields
-                            if hasattr(row, '_asdict'):
-                                row_dict = row._asdict()
-                            elif hasattr(row, '_mapping'):
-                                # For SQLAlchemy 1.4+
-                                row_dict = dict(row._mapping)
-                            else:
-                                # Fallback - direct dict conversion
-                                row_dict = dict(row)
-                                
-                            # Filter row_dict to only include valid fields
-                            filtered_dict = {k: v for k, v in row_dict.items() if k in valid_fields}
-                            
-                            # Create Opportunity object with filtered dict
-                            opp = Opportunity(**filtered_dict)
-                            new_opportunities.append(opp)
-                        except Exception as row_err:
-                            print(f"Error processing row: {str(row_err)}")
-                            continue
-                except Exception as sql_err:
-                    print(f"Error with SQL approach: {str(sql_err)}")
-                    db.rollback()  # Rollback on SQL error before trying ORM
-                    db.begin()     # Start a fresh transaction
-                    
-                    # Fallback to ORM approach with case insensitive filter
-                    try:
-                        new_opportunities = db.query(Opportunity).filter(
-                            Opportunity.status.ilike("new"),
-                            Opportunity.creator_id != str(self.parent().current_user.id)
-                        ).all()
-                    except Exception as orm_err:
-                        print(f"Error with ORM fallback: {str(orm_err)}")
-                        db.rollback()  # Rollback transaction on failure
-                        new_opportunities = []  # Set empty list to avoid errors
-                
-                # Debug logging for better troubleshooting
-                print(f"DEBUG: New opportunities found in DB: {len(new_opportunities)}")
-                for i, opp in enumerate(new_opportunities, 1):
-                    print(f"  {i}. ID: {opp.id}, Title: {opp.title}, Status: {opp.status}, Creator: {opp.creator_id}")
-                
-                # Get all opportunity IDs for cleaning up viewed_opportunities
-                all_new_opps_ids = {opp.id for opp in new_opportunities}
-                print(f"DEBUG: All new opportunity IDs: {all_new_opps_ids}")
-                
-                # Only keep viewed opportunities that are still in the NEW status
-                # This fixes a bug that was causing the viewed_opportunities to be emptied
-                self.viewed_opportunities = {opp_id for opp_id in self.viewed_opportunities if opp_id in all_new_opps_ids}
-                print(f"DEBUG: Viewed opportunities after cleanup: {self.viewed_opportunities}")
-                
-                # If this is initial startup, mark all existing opportunities as viewed
-                # This prevents showing notifications for existing tickets on startup
-                if is_initial_check and len(self.viewed_opportunities) == 0:
-                    print("DEBUG: Initial check - marking all existing opportunities as viewed")
-                    for opp in new_opportunities:
-                        self.viewed_opportunities.add(opp.id)
-                    print(f"DEBUG: Marked {len(new_opportunities)} existing opportunities as viewed")
-                
-                # Get opportunities that haven't been viewed
-                unviewed_opportunities = [opp for opp in new_opportunities if opp.id not in self.viewed_opportunities]
-                print(f"DEBUG: Found {len(unviewed_opportunities)} unviewed NEW opportunities")
-                print(f"DEBUG: Total viewed opportunities: {len(self.viewed_opportunities)}")
-                print(f"DEBUG: Total new opportunities: {len(new_opportunities)}")
-                
-                # Check new notifications (these are already filtered by user_id)
-                try:
-                    new_notifications = db.query(Notification).filter(
-                        Notification.user_id == str(self.parent().current_user.id),
-                        Notification.read == False
-                    ).all()
-                    
-                    print(f"DEBUG: Found {len(new_notifications)} new notifications")
-                except Exception as notif_err:
-                    print(f"Error getting notifications: {str(notif_err)}")
-                    db.rollback()  # Rollback transaction on failure
-                    db.begin()     # Start a fresh transaction
-                    new_notifications = []  # Set empty list to avoid errors
-                
-                # Update total notification count (unviewed opportunities + unread notifications)
-                total_count = len(unviewed_opportunities) + len(new_notifications)
-                print(f"DEBUG: Total notification count: {total_count}")
-                
-                # Only update notification count if it's different
-                if total_count != self.notification_count:
-                    self.notification_count = total_count
-                    self.update_notification_badge()
-                
-                # Show notifications for new opportunities since last check
-                for opp in new_opportunities:
-                    if opp.id not in self.viewed_opportunities and opp.created_at > self.last_checked_time:
-                        # Show detailed notification for this new opportunity
-                        print(f"DEBUG: Sending notification for new opportunity: {opp.id} - {opp.title}")
-                        self.show_windows_notification(
-                            "New SI Opportunity",
-                            f"Ticket: {opp.title}\nVehicle: {opp.display_title}\nDescription: {opp.description[:100]}...",
-                            opportunity_id=opp.id
-                        )
-                        # Mark as viewed to prevent duplicate notifications
-                        self.viewed_opportunities.add(opp.id)
-                        print(f"DEBUG: Marked opportunity as viewed: {opp.id}")
-                
-                # Commit the transaction after all processing is complete
-                db.commit()
-                
-                # Show periodic reminder of total unviewed opportunities (every 5 minutes)
-                try:
-                    current_seconds_since_reminder = (current_time - self.last_reminder_time).total_seconds()
-                    reminder_condition = total_count > 0 and current_seconds_since_reminder > 300
-                    print(f"DEBUG: Reminder condition: {reminder_condition} (total_count={total_count}, seconds_since_reminder={current_seconds_since_reminder})")
-                    if reminder_condition:
-                        print(f"DEBUG: Showing 5-minute reminder notification for {total_count} unviewed items")
-                        
-                        # Create a more detailed overview similar to startup notification
-                        new_opps_count = len(unviewed_opportunities)
-                        new_notifs_count = len(new_notifications)
-                        
-                        stats_message = f"""
+                    stats_message = f"""
 You have {total_count} unviewed items requiring attention:
 • {new_opps_count} new opportunities
 • {new_notifs_count} unread notifications
 
 Click this notification to view all items in the dashboard.
 Or click 'Mark as Read' to clear without viewing."""
-                        
-                        self.show_windows_notification(
-                            "SI Opportunity Manager",  # Clean title without dash
-                            stats_message,
-                            is_reminder=True
-                        )
-                        self.last_reminder_time = current_time
-                        print(f"DEBUG: Updated last_reminder_time to {current_time}")
-                except Exception as reminder_err:
-                    print(f"DEBUG: Error in reminder logic: {str(reminder_err)}")
-                    print(traceback.format_exc())
-                
-                # Show notifications for other notification types
-                if len(new_notifications) > 0:
-                    # Keep track of notification opportunity IDs to avoid duplicates
-                    notified_opportunity_ids = set()
                     
-                    for notif in new_notifications:
-                        if notif.id not in self.viewed_notifications:
-                            # Skip showing individual notifications on startup
-                            if not is_initial_check:
-                                # Skip notifications for opportunities we already showed notifications for
-                                if notif.opportunity_id and notif.opportunity_id in self.viewed_opportunities:
-                                    print(f"DEBUG: Skipping duplicate notification for opportunity: {notif.opportunity_id}")
-                                    self.viewed_notifications.add(notif.id)
-                                    continue
-                                
-                                # Skip if we've already shown a notification for this opportunity in this batch
-                                if notif.opportunity_id and notif.opportunity_id in notified_opportunity_ids:
-                                    print(f"DEBUG: Skipping duplicate notification in current batch for opportunity: {notif.opportunity_id}")
-                                    self.viewed_notifications.add(notif.id)
-                                    continue
-                                
-                                # Track this opportunity ID to avoid duplicate notifications
-                                if notif.opportunity_id:
-                                    notified_opportunity_ids.add(notif.opportunity_id)
-                                
-                                # Show the notification
-                                self.show_windows_notification(
-                                    "New Notification",
-                                    notif.message,
-                                    opportunity_id=notif.opportunity_id
-                                )
-                            self.viewed_notifications.add(notif.id)
-                
-                # Update last check time only for future notifications
-                self.last_checked_time = current_time
+                    self.show_windows_notification(
+                        "SI Opportunity Manager",  # Clean title without dash
+                        stats_message,
+                        is_reminder=True
+                    )
+                    self.last_reminder_time = current_time
+                    print(f"DEBUG: Updated last_reminder_time to {current_time}")
+            except Exception as reminder_err:
+                print(f"DEBUG: Error in reminder logic: {str(reminder_err)}")
+                print(traceback.format_exc())
+            
+            # Show notifications for other notification types
+            if len(new_notifications) > 0:
+                # Keep track of notification opportunity IDs to avoid duplicates
+                notified_opportunity_ids = set()
                 
-            except Exception as db_err:
-                print(f"Database error in check_updates: {str(db_err)}")
-                traceback.print_exc()
-                # Always ensure we rollback on error
-                try:
-                    db.rollback()
-                except:
-                    pass
-            finally:
-                db.close()
-        except Exception as outer_e:
-            print(f"Critical error in check_updates: {str(outer_e)}")
+                for notif in new_notifications:
+                    if notif.id not in self.viewed_notifications:
+                        # Skip showing individual notifications on startup
+                        if not is_initial_check:
+                            # Skip notifications for opportunities we already showed notifications for
+                            if notif.opportunity_id and notif.opportunity_id in self.viewed_opportunities:
+                                print(f"DEBUG: Skipping duplicate notification for opportunity: {notif.opportunity_id}")
+                                self.viewed_notifications.add(notif.id)
+                                continue
+                            
+                            # Skip if we've already shown a notification for this opportunity in this batch
+                            if notif.opportunity_id and notif.opportunity_id in notified_opportunity_ids:
+                                print(f"DEBUG: Skipping duplicate notification in current batch for opportunity: {notif.opportunity_id}")
+                                self.viewed_notifications.add(notif.id)
+                                continue
+                            
+                            # Track this opportunity ID to avoid duplicate notifications
+                            if notif.opportunity_id:
+                                notified_opportunity_ids.add(notif.opportunity_id)
+                            
+                            # Show the notification
+                            self.show_windows_notification(
+                                "New Notification",
+                                notif.message,
+                                opportunity_id=notif.opportunity_id
+                            )
+                        self.viewed_notifications.add(notif.id)
+            
+            # Update last check time only for future notifications
+            self.last_checked_time = current_time
+        except Exception as e:
+            print(f"Critical error in check_updates: {str(e)}")
             print(traceback.format_exc())
 
     def show_windows_notification(self, title, message, is_reminder=False, opportunity_id=None):
@@ -1516,12 +1588,12 @@ Or click 'Mark as Read' to clear without viewing."""
                 # Begin transaction
                 db.begin()
                 
-                # Use case-insensitive SQL query for new opportunities
+                # Use SQL query for new opportunities
                 try:
                     new_opps_query = text("""
                         SELECT id, title, description, status, created_at, creator_id
                         FROM opportunities
-                        WHERE LOWER(status) = 'new'
+                        WHERE status = 'new'
                         AND creator_id != :user_id
                     """)
                     
@@ -1530,7 +1602,7 @@ Or click 'Mark as Read' to clear without viewing."""
                     # Process the raw SQL results into Opportunity objects safely
                     new_opps = []
 
-                    valid_fields = ['id', 'title', 'description', 'status', 'created_at', 'creator_id', 'acceptor_id', 'completed_at', 'started_at', 'response_time', 'work_time', 'updated_at', 'systems', 'comments', 'files']
+                    valid_fields = ['id', 'title', 'description', 'status', 'created_at', 'creator_id', 'acceptor_id', 'completed_at', 'started_at', 'response_time', 'work_time', 'updated_at', 'systems', 'files']
                     
                     for row in result:
                         try:
@@ -1558,10 +1630,10 @@ Or click 'Mark as Read' to clear without viewing."""
                     db.rollback()  # Rollback on error
                     db.begin()     # Start fresh transaction
                     
-                    # Fallback to ORM approach with case insensitive filter
+                    # Fallback to ORM approach
                     try:
                         new_opps = db.query(Opportunity).filter(
-                            Opportunity.status.ilike("new"),
+                            Opportunity.status == "new",
                             Opportunity.creator_id != str(self.parent().current_user.id)
                         ).all()
                     except Exception as orm_err:
@@ -1858,11 +1930,13 @@ class MainWindow(QMainWindow):
         # Create new dashboard with current user
         if hasattr(self, 'dashboard') and self.dashboard is not None:
             self.dashboard.deleteLater()
+        from app.ui.dashboard import DashboardWidget
         self.dashboard = DashboardWidget(current_user=user)
         
         # Create management portal if user is admin/manager
         if user.role.lower() in ["admin", "manager"]:
             print("DEBUG: Creating management portal for admin/manager")
+            from app.ui.management_portal import ManagementPortal
             self.management_portal = ManagementPortal(user, self)
             self.management_portal.refresh_needed.connect(self.on_management_refresh)
         
@@ -1885,20 +1959,20 @@ class MainWindow(QMainWindow):
             
             # Get detailed statistics for ticket overview
             new_tickets = db.query(Opportunity).filter(
-                Opportunity.status.ilike("new"),
+                Opportunity.status == "new",
                 Opportunity.creator_id != str(user.id)
             ).count()
             
             completed_tickets = db.query(Opportunity).filter(
-                Opportunity.status.ilike("completed")
+                Opportunity.status == "completed"
             ).count()
             
             in_progress_tickets = db.query(Opportunity).filter(
-                Opportunity.status.ilike("in progress")
+                Opportunity.status == "in progress"
             ).count()
             
             needs_info_tickets = db.query(Opportunity).filter(
-                Opportunity.status.ilike("needs info")
+                Opportunity.status == "needs info"
             ).count()
             
             own_tickets = db.query(Opportunity).filter(
@@ -1985,6 +2059,7 @@ class MainWindow(QMainWindow):
     def show_profile(self):
         """Show the user profile window"""
         if not self.profile:
+            from app.ui.profile import ProfileWidget
             self.profile = ProfileWidget(self.current_user)
             self.profile.profile_updated.connect(self.on_profile_updated)
         self.profile.show()
@@ -2026,6 +2101,7 @@ class MainWindow(QMainWindow):
     def show_opportunity_form(self):
         # Create form if it doesn't exist
         if not self.opportunity_form:
+            from app.ui.opportunity_form import OpportunityForm
             self.opportunity_form = OpportunityForm(str(self.current_user.id))
             # Connect the opportunity created signal to the toolbar
             self.opportunity_form.opportunity_created.connect(self.on_new_opportunity)
@@ -2058,6 +2134,7 @@ class MainWindow(QMainWindow):
             return
             
         if not self.management_portal:
+            from app.ui.management_portal import ManagementPortal
             self.management_portal = ManagementPortal(self.current_user, self)
             self.management_portal.refresh_needed.connect(self.on_management_refresh)
             
@@ -2101,6 +2178,8 @@ class MainWindow(QMainWindow):
         self.account_creation.account_created.connect(self.on_account_created)
         
         # Initialize dashboard with None user (will be set after authentication)
+        from app.ui.dashboard import DashboardWidget
+        from app.ui.settings import SettingsWidget
         self.dashboard = DashboardWidget()
         self.opportunity_form = None
         self.settings = SettingsWidget()
@@ -2118,6 +2197,10 @@ def main():
     # Create application
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
+
+    # Connection pool diagnostics (DB_POOL_LOG_LEVEL), with a summary on exit
+    configure_pool_logging()
+    app.aboutToQuit.connect(log_pool_stats)
     
     # Set application-wide stylesheet
     app.setStyleSheet("""
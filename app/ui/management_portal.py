@@ -2,15 +2,16 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
                            QTabWidget, QTableWidget, QTableWidgetItem, QComboBox,
                            QScrollArea, QFrame, QMessageBox, QLineEdit, QFormLayout,
                            QDialog, QCheckBox, QMainWindow, QHeaderView, QTextEdit, QFileDialog)
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from app.database.connection import SessionLocal
 from app.models.models import User, Opportunity, ActivityLog, Notification, File, Vehicle
-from datetime import datetime, timedelta, timezone
-import statistics
+from app.database.queries import (load_portal_page, load_portal_filter_values, portal_row,
+                                  load_member_statistics, load_team_summary, PORTAL_PAGE_SIZE)
+from app.services.reference_cache import get_user_name
+from app.ui.db_worker import get_database_worker
+from datetime import datetime, timezone
 from app.ui.dashboard import DashboardWidget
 from sqlalchemy import text
-import openpyxl
-from openpyxl.styles import Font, PatternFill
 import os
 import traceback
 
@@ -48,7 +49,7 @@ class TicketViewDialog(QDialog):
             # Status combo box
             status_combo = QComboBox()
             status_combo.addItems(["New", "In Progress", "Completed", "Needs Info"])
-            status_combo.setCurrentText(opportunity.status)
+            status_combo.setCurrentText(opportunity.display_status)
             status_combo.setStyleSheet("""
                 QComboBox {
                     background-color: #3d3d3d;
@@ -78,16 +79,14 @@ class TicketViewDialog(QDialog):
             info_layout = QFormLayout()
             
             # Add info fields
-            creator = db.query(User).filter(User.id == opportunity.creator_id).first()
-            creator_name = f"{creator.first_name} {creator.last_name}" if creator else "Unknown"
+            creator_name = get_user_name(db, opportunity.creator_id)
             info_layout.addRow("Created By:", QLabel(creator_name))
             
             created_at = opportunity.created_at.strftime("%Y-%m-%d %H:%M") if opportunity.created_at else "N/A"
             info_layout.addRow("Created:", QLabel(created_at))
             
             if opportunity.acceptor_id:
-                acceptor = db.query(User).filter(User.id == opportunity.acceptor_id).first()
-                acceptor_name = f"{acceptor.first_name} {acceptor.last_name}" if acceptor else "Unknown"
+                acceptor_name = get_user_name(db, opportunity.acceptor_id)
                 info_layout.addRow("Assigned To:", QLabel(acceptor_name))
             
             if opportunity.response_time:
@@ -243,6 +242,7 @@ class ManagementPortal(QMainWindow):
         self.is_admin = current_user.role == "admin"
         self.main_window = parent
         self.dashboard = None
+        self.db_worker = get_database_worker()
         self.initUI()
         
     def closeEvent(self, event):
@@ -598,9 +598,22 @@ class ManagementPortal(QMainWindow):
         
         # Create filters for each column
         self.filters = {}
+        self.filter_defaults = {
+            "title": "All Titles",
+            "status": "All Statuses",
+            "created_by": "All Created Bys",
+            "assigned_to": "All Assigned Tos"
+        }
         filter_columns = ["Title", "Status", "Created By", "Assigned To"]
         
+        # Debounce filter changes so typing in the title box doesn't query per keystroke
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(300)
+        self.filter_timer.timeout.connect(self.apply_filters)
+        
         for column in filter_columns:
+            filter_id = column.lower().replace(" ", "_")
             filter_box = QComboBox()
             filter_box.setStyleSheet("""
                 QComboBox {
@@ -612,8 +625,14 @@ class ManagementPortal(QMainWindow):
                     min-width: 120px;
                 }
             """)
-            filter_box.addItem(f"All {column}s")
-            filter_box.currentTextChanged.connect(self.apply_filters)
+            filter_box.addItem(self.filter_defaults[filter_id])
+            
+            # Only recent titles are listed, so allow typing any part of a ticket number
+            if filter_id == "title":
+                filter_box.setEditable(True)
+                filter_box.setInsertPolicy(QComboBox.NoInsert)
+            
+            filter_box.currentTextChanged.connect(lambda _: self.filter_timer.start())
             
             # Create label for each filter
             column_label = QLabel(f"{column}:")
@@ -621,7 +640,7 @@ class ManagementPortal(QMainWindow):
             
             filter_layout.addWidget(column_label)
             filter_layout.addWidget(filter_box)
-            self.filters[column.lower().replace(" ", "_")] = filter_box
+            self.filters[filter_id] = filter_box
         
         filter_layout.addStretch()
         layout.addLayout(filter_layout)
@@ -658,224 +677,239 @@ class ManagementPortal(QMainWindow):
         self.opportunities_table.horizontalHeader().setSectionsClickable(True)
         
         layout.addWidget(self.opportunities_table)
+        
+        # Paging controls
+        self.current_page = 0
+        self.total_opportunities = 0
+        pager_layout = QHBoxLayout()
+        pager_layout.addStretch()
+        
+        pager_style = """
+            QPushButton {
+                background-color: #3d3d3d;
+                color: white;
+                border: none;
+                padding: 4px 12px;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #4d4d4d;
+            }
+            QPushButton:disabled {
+                color: #777777;
+            }
+        """
+        self.prev_page_btn = QPushButton("◀ Previous")
+        self.prev_page_btn.setStyleSheet(pager_style)
+        self.prev_page_btn.clicked.connect(lambda: self.change_page(-1))
+        pager_layout.addWidget(self.prev_page_btn)
+        
+        self.page_label = QLabel()
+        self.page_label.setStyleSheet("color: white; padding: 0 8px;")
+        pager_layout.addWidget(self.page_label)
+        
+        self.next_page_btn = QPushButton("Next ▶")
+        self.next_page_btn.setStyleSheet(pager_style)
+        self.next_page_btn.clicked.connect(lambda: self.change_page(1))
+        pager_layout.addWidget(self.next_page_btn)
+        
+        layout.addLayout(pager_layout)
         tab.setLayout(layout)
         return tab
         
     def apply_filters(self):
         """Apply all filters to the opportunities table"""
+        # Filters change the result set, so start again from the first page
+        self.current_page = 0
+        self.load_opportunities()
+        
+    def change_page(self, step):
+        """Move the opportunities table by the given number of pages"""
+        last_page = max(0, (self.total_opportunities - 1) // PORTAL_PAGE_SIZE)
+        self.current_page = min(max(0, self.current_page + step), last_page)
         self.load_opportunities()
         
+    def get_active_filters(self):
+        """Return the filter state as keyword arguments for load_portal_page"""
+        active = {}
+        for filter_id, combobox in self.filters.items():
+            value = combobox.currentText().strip()
+            if value and value != self.filter_defaults[filter_id]:
+                active[filter_id] = value
+        return active
+        
+    def update_pager(self):
+        """Update the page label and buttons for the current page"""
+        page_count = max(1, -(-self.total_opportunities // PORTAL_PAGE_SIZE))
+        self.page_label.setText(
+            f"Page {self.current_page + 1} of {page_count} ({self.total_opportunities} tickets)"
+        )
+        self.prev_page_btn.setEnabled(self.current_page > 0)
+        self.next_page_btn.setEnabled(self.current_page + 1 < page_count)
+        
     def load_opportunities(self):
-        """Load opportunities into the table"""
-        try:
-            db = SessionLocal()
-            opportunities = db.query(Opportunity).all()
-            
-            # Apply filters if they exist and are set
-            filtered_opportunities = []
-            for opp in opportunities:
-                # Check if opportunity passes all filters
-                passes_filters = True
-                
-                # Get creator and acceptor info for filtering
-                creator = db.query(User).filter(User.id == opp.creator_id).first()
-                creator_name = creator.username if creator else "Unknown"
-                
-                assigned_to = "Unassigned"
-                if opp.acceptor_id:
-                    acceptor = db.query(User).filter(User.id == opp.acceptor_id).first()
-                    if acceptor:
-                        assigned_to = f"{acceptor.first_name} {acceptor.last_name}"
-                
-                # Apply title filter
-                if hasattr(self, 'filters') and 'title' in self.filters and self.filters['title'].currentText() != "All Titles":
-                    if self.filters['title'].currentText() not in opp.title:
-                        passes_filters = False
-                
-                # Apply status filter
-                if hasattr(self, 'filters') and 'status' in self.filters and self.filters['status'].currentText() != "All Statuses":
-                    if self.filters['status'].currentText() != opp.status:
-                        passes_filters = False
-                
-                # Apply created by filter
-                if hasattr(self, 'filters') and 'created_by' in self.filters and self.filters['created_by'].currentText() != "All Created Bys":
-                    if self.filters['created_by'].currentText() != creator_name:
-                        passes_filters = False
-                
-                # Apply assigned to filter
-                if hasattr(self, 'filters') and 'assigned_to' in self.filters and self.filters['assigned_to'].currentText() != "All Assigned Tos":
-                    if self.filters['assigned_to'].currentText() != assigned_to:
-                        passes_filters = False
-                
-                if passes_filters:
-                    filtered_opportunities.append(opp)
-            
-            # Sort by newest created date first (default sort)
-            filtered_opportunities.sort(key=lambda x: x.created_at if x.created_at else datetime.min, reverse=True)
-            
-            # Update filter dropdowns with available values
-            if hasattr(self, 'filters'):
-                # Collect unique values for each filter
-                titles = set()
-                statuses = set()
-                creators = set()
-                assignees = set()
-                
-                for opp in opportunities:
-                    titles.add(opp.title)
-                    statuses.add(opp.status)
-                    
-                    creator = db.query(User).filter(User.id == opp.creator_id).first()
-                    creators.add(creator.username if creator else "Unknown")
-                    
-                    assigned_to = "Unassigned"
-                    if opp.acceptor_id:
-                        acceptor = db.query(User).filter(User.id == opp.acceptor_id).first()
-                        if acceptor:
-                            assigned_to = f"{acceptor.first_name} {acceptor.last_name}"
-                    assignees.add(assigned_to)
-                
-                # Update comboboxes while preserving selection
-                self._update_combobox(self.filters['title'], titles, "All Titles")
-                self._update_combobox(self.filters['status'], statuses, "All Statuses")
-                self._update_combobox(self.filters['created_by'], creators, "All Created Bys")
-                self._update_combobox(self.filters['assigned_to'], assignees, "All Assigned Tos")
-            
-            # Update table with filtered opportunities
-            self.opportunities_table.setSortingEnabled(False)  # Disable sorting while updating
-            self.opportunities_table.setRowCount(len(filtered_opportunities))
-            
-            for i, opp in enumerate(filtered_opportunities):
-                # ID
-                id_item = QTableWidgetItem(str(opp.id))
-                id_item.setFlags(id_item.flags() & ~Qt.ItemIsEditable)  # Make read-only
-                self.opportunities_table.setItem(i, 0, id_item)
-                
-                # Title
-                title_item = QTableWidgetItem(opp.title)
-                title_item.setFlags(title_item.flags() & ~Qt.ItemIsEditable)
-                self.opportunities_table.setItem(i, 1, title_item)
-                
-                # Status
-                status_item = QTableWidgetItem(opp.status)
-                status_item.setFlags(status_item.flags() & ~Qt.ItemIsEditable)
-                self.opportunities_table.setItem(i, 2, status_item)
-                
-                # Created By
-                creator = db.query(User).filter(User.id == opp.creator_id).first()
-                creator_item = QTableWidgetItem(creator.username if creator else "Unknown")
-                creator_item.setFlags(creator_item.flags() & ~Qt.ItemIsEditable)
-                self.opportunities_table.setItem(i, 3, creator_item)
-                
-                # Created Date
-                created_date = opp.created_at.strftime("%Y-%m-%d %H:%M") if opp.created_at else "N/A"
-                created_date_item = QTableWidgetItem(created_date)
-                # Store the actual datetime for sorting
-                created_date_item.setData(Qt.UserRole, opp.created_at.timestamp() if opp.created_at else 0)
-                created_date_item.setFlags(created_date_item.flags() & ~Qt.ItemIsEditable)
-                self.opportunities_table.setItem(i, 4, created_date_item)
-                
-                # Assigned To
-                assigned_to = "Unassigned"
-                if opp.acceptor_id:
-                    acceptor = db.query(User).filter(User.id == opp.acceptor_id).first()
-                    if acceptor:
-                        assigned_to = f"{acceptor.first_name} {acceptor.last_name}"
-                assigned_item = QTableWidgetItem(assigned_to)
-                assigned_item.setFlags(assigned_item.flags() & ~Qt.ItemIsEditable)
-                self.opportunities_table.setItem(i, 5, assigned_item)
-                
-                # Completion Time
-                completion_time = "N/A"
-                if opp.status.lower() == "completed" and opp.completed_at:
-                    completion_time = opp.completed_at.strftime("%Y-%m-%d %H:%M")
-                completion_item = QTableWidgetItem(completion_time)
-                completion_item.setFlags(completion_item.flags() & ~Qt.ItemIsEditable)
-                self.opportunities_table.setItem(i, 6, completion_item)
-                
-                # Response Time
-                response_time = "N/A"
-                if opp.response_time:
-                    days = opp.response_time.days
-                    hours = opp.response_time.seconds // 3600
-                    minutes = (opp.response_time.seconds % 3600) // 60
-                    if days > 0:
-                        response_time = f"{days}d {hours:02d}h"
-                    else:
-                        response_time = f"{hours:02d}h {minutes:02d}m"
-                response_item = QTableWidgetItem(response_time)
-                response_item.setFlags(response_item.flags() & ~Qt.ItemIsEditable)
-                self.opportunities_table.setItem(i, 7, response_item)
-                
-                # Actions - Create widget with buttons
-                actions_widget = QWidget()
-                actions_layout = QHBoxLayout(actions_widget)
-                actions_layout.setContentsMargins(4, 0, 4, 0)
-                actions_layout.setSpacing(8)  # Increased spacing between buttons
-                
-                # View button
-                view_btn = QPushButton("View")
-                view_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #0078d4;
-                        color: white;
-                        border: none;
-                        padding: 4px 8px;
-                        border-radius: 4px;
-                        min-width: 60px;
-                    }
-                    QPushButton:hover {
-                        background-color: #106ebe;
-                    }
-                """)
-                view_btn.clicked.connect(lambda checked, oid=opp.id: self.view_opportunity(oid))
-                actions_layout.addWidget(view_btn)
-                
-                # Delete button
-                delete_btn = QPushButton("Delete")
-                delete_btn.setStyleSheet("""
+        """Load opportunities into the table
+        
+        The page is fetched in the background; a newer call supersedes one
+        still in flight.
+        """
+        filters = self.get_active_filters()
+        page = self.current_page
+        self.db_worker.submit(
+            (id(self), "opportunities"),
+            lambda db: self.fetch_opportunities_page(db, page, filters),
+            self.show_opportunities,
+            lambda error: print(f"Error loading opportunities: {error}")
+        )
+    
+    @staticmethod
+    def fetch_opportunities_page(db, page, filters):
+        """Load one table page as plain rows, with the total and the dropdown values"""
+        filtered_opportunities, total = load_portal_page(db, page=page, **filters)
+        
+        # A write may have emptied the current page; fall back to the first page
+        if not filtered_opportunities and page > 0:
+            page = 0
+            filtered_opportunities, total = load_portal_page(db, **filters)
+        
+        rows = [portal_row(opp) for opp in filtered_opportunities]
+        return page, rows, total, load_portal_filter_values(db)
+    
+    def show_opportunities(self, result):
+        """Fill the opportunities table from a fetched page"""
+        self.current_page, filtered_opportunities, self.total_opportunities, filter_values = result
+        self.update_pager()
+        
+        # Update filter dropdowns with available values
+        for filter_id, combobox in self.filters.items():
+            self._update_combobox(combobox, filter_values[filter_id], self.filter_defaults[filter_id])
+        
+        # Update table with filtered opportunities
+        self.opportunities_table.setSortingEnabled(False)  # Disable sorting while updating
+        self.opportunities_table.setRowCount(len(filtered_opportunities))
+        
+        for i, opp in enumerate(filtered_opportunities):
+            # ID
+            id_item = QTableWidgetItem(str(opp.id))
+            id_item.setFlags(id_item.flags() & ~Qt.ItemIsEditable)  # Make read-only
+            self.opportunities_table.setItem(i, 0, id_item)
+            
+            # Title
+            title_item = QTableWidgetItem(opp.title)
+            title_item.setFlags(title_item.flags() & ~Qt.ItemIsEditable)
+            self.opportunities_table.setItem(i, 1, title_item)
+            
+            # Status
+            status_item = QTableWidgetItem(opp.status)
+            status_item.setFlags(status_item.flags() & ~Qt.ItemIsEditable)
+            self.opportunities_table.setItem(i, 2, status_item)
+            
+            # Created By
+            creator_item = QTableWidgetItem(opp.created_by)
+            creator_item.setFlags(creator_item.flags() & ~Qt.ItemIsEditable)
+            self.opportunities_table.setItem(i, 3, creator_item)
+            
+            # Created Date
+            created_date = opp.created_at.strftime("%Y-%m-%d %H:%M") if opp.created_at else "N/A"
+            created_date_item = QTableWidgetItem(created_date)
+            # Store the actual datetime for sorting
+            created_date_item.setData(Qt.UserRole, opp.created_at.timestamp() if opp.created_at else 0)
+            created_date_item.setFlags(created_date_item.flags() & ~Qt.ItemIsEditable)
+            self.opportunities_table.setItem(i, 4, created_date_item)
+            
+            # Assigned To
+            assigned_item = QTableWidgetItem(opp.assigned_to)
+            assigned_item.setFlags(assigned_item.flags() & ~Qt.ItemIsEditable)
+            self.opportunities_table.setItem(i, 5, assigned_item)
+            
+            # Completion Time
+            completion_time = "N/A"
+            if opp.status == "completed" and opp.completed_at:
+                completion_time = opp.completed_at.strftime("%Y-%m-%d %H:%M")
+            completion_item = QTableWidgetItem(completion_time)
+            completion_item.setFlags(completion_item.flags() & ~Qt.ItemIsEditable)
+            self.opportunities_table.setItem(i, 6, completion_item)
+            
+            # Response Time
+            response_time = "N/A"
+            if opp.response_time:
+                days = opp.response_time.days
+                hours = opp.response_time.seconds // 3600
+                minutes = (opp.response_time.seconds % 3600) // 60
+                if days > 0:
+                    response_time = f"{days}d {hours:02d}h"
+                else:
+                    response_time = f"{hours:02d}h {minutes:02d}m"
+            response_item = QTableWidgetItem(response_time)
+            response_item.setFlags(response_item.flags() & ~Qt.ItemIsEditable)
+            self.opportunities_table.setItem(i, 7, response_item)
+            
+            # Actions - Create widget with buttons
+            actions_widget = QWidget()
+            actions_layout = QHBoxLayout(actions_widget)
+            actions_layout.setContentsMargins(4, 0, 4, 0)
+            actions_layout.setSpacing(8)  # Increased spacing between buttons
+            
+            # View button
+            view_btn = QPushButton("View")
+            view_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #0078d4;
+                    color: white;
+                    border: none;
+                    padding: 4px 8px;
+                    border-radius: 4px;
+                    min-width: 60px;
+                }
+                QPushButton:hover {
+                    background-color: #106ebe;
+                }
+            """)
+            view_btn.clicked.connect(lambda checked, oid=opp.id: self.view_opportunity(oid))
+            actions_layout.addWidget(view_btn)
+            
+            # Delete button
+            delete_btn = QPushButton("Delete")
+            delete_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #d83b01;
+                    color: white;
+                    border: none;
+                    padding: 4px 8px;
+                    border-radius: 4px;
+                    min-width: 60px;
+                }
+                QPushButton:hover {
+                    background-color: #ea4a1f;
+                }
+            """)
+            delete_btn.clicked.connect(lambda checked, oid=opp.id: self.delete_opportunity(oid))
+            actions_layout.addWidget(delete_btn)
+            
+            # Unassign button (if assigned)
+            if opp.acceptor_id:
+                unassign_btn = QPushButton("Unassign")
+                unassign_btn.setStyleSheet("""
                     QPushButton {
-                        background-color: #d83b01;
+                        background-color: #605e5c;
                         color: white;
                         border: none;
                         padding: 4px 8px;
                         border-radius: 4px;
-                        min-width: 60px;
+                        min-width: 65px;
                     }
                     QPushButton:hover {
-                        background-color: #ea4a1f;
+                        background-color: #7a7877;
                     }
                 """)
-                delete_btn.clicked.connect(lambda checked, oid=opp.id: self.delete_opportunity(oid))
-                actions_layout.addWidget(delete_btn)
-                
-                # Unassign button (if assigned)
-                if opp.acceptor_id:
-                    unassign_btn = QPushButton("Unassign")
-                    unassign_btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: #605e5c;
-                            color: white;
-                            border: none;
-                            padding: 4px 8px;
-                            border-radius: 4px;
-                            min-width: 65px;
-                        }
-                        QPushButton:hover {
-                            background-color: #7a7877;
-                        }
-                    """)
-                    unassign_btn.clicked.connect(lambda checked, oid=opp.id: self.unassign_opportunity(oid))
-                    actions_layout.addWidget(unassign_btn)
-                
-                self.opportunities_table.setCellWidget(i, 8, actions_widget)
+                unassign_btn.clicked.connect(lambda checked, oid=opp.id: self.unassign_opportunity(oid))
+                actions_layout.addWidget(unassign_btn)
             
-            # Re-enable sorting and sort by created date (newest first)
-            self.opportunities_table.setSortingEnabled(True)
-            self.opportunities_table.sortByColumn(4, Qt.DescendingOrder)
-            
-        finally:
-            db.close()
+            self.opportunities_table.setCellWidget(i, 8, actions_widget)
+        
+        # Re-enable sorting and sort by created date (newest first)
+        self.opportunities_table.setSortingEnabled(True)
+        self.opportunities_table.sortByColumn(4, Qt.DescendingOrder)
             
     def _update_combobox(self, combobox, values, default_text):
         """Update a combobox with new values while preserving selection"""
@@ -890,6 +924,9 @@ class ManagementPortal(QMainWindow):
         index = combobox.findText(current_text)
         if index >= 0:
             combobox.setCurrentIndex(index)
+        elif combobox.isEditable():
+            # Keep free text typed into editable filters
+            combobox.setEditText(current_text)
         else:
             combobox.setCurrentIndex(0)
         combobox.blockSignals(False)
@@ -927,7 +964,7 @@ class ManagementPortal(QMainWindow):
                 
                 # Update opportunity
                 opportunity.acceptor_id = None
-                opportunity.status = "New"  # Reset status to New
+                opportunity.status = "new"  # Reset status to New
                 
                 db.commit()
                 QMessageBox.information(self, "Success", "User unassigned successfully.")
@@ -1016,132 +1053,114 @@ class ManagementPortal(QMainWindow):
                 db.close()
 
     def load_data(self):
-        """Load all data for the management portal"""
-        db = SessionLocal()
-        try:
-            # Get team members
-            if self.is_admin:
-                team_members = db.query(User).all()
-            else:
-                team_members = db.query(User).filter(User.team == self.current_user.team).all()
-            
-            # Update team table
-            self.team_table.setRowCount(0)
-            for member in team_members:
-                row = self.team_table.rowCount()
-                self.team_table.insertRow(row)
-                
-                # Get member statistics
-                active_tickets = db.query(Opportunity).filter(
-                    Opportunity.acceptor_id == member.id,
-                    Opportunity.status.in_(["new", "in progress"])
-                ).count()
-                
-                completed_tickets = db.query(Opportunity).filter(
-                    Opportunity.acceptor_id == member.id,
-                    Opportunity.status == "completed"
-                ).count()
-                
-                # Calculate average response time
-                completed_opps = db.query(Opportunity).filter(
-                    Opportunity.acceptor_id == member.id,
-                    Opportunity.status == "completed",
-                    Opportunity.response_time.isnot(None)
-                ).all()
-                
-                avg_response = "N/A"
-                if completed_opps:
-                    response_times = [opp.response_time.total_seconds() for opp in completed_opps]
-                    avg_seconds = statistics.mean(response_times)
-                    avg_response = str(timedelta(seconds=int(avg_seconds)))
-                
-                # Add data to table
-                self.team_table.setItem(row, 0, QTableWidgetItem(f"{member.first_name} {member.last_name}"))
-                self.team_table.setItem(row, 1, QTableWidgetItem(member.role))
-                self.team_table.setItem(row, 2, QTableWidgetItem(str(active_tickets)))
-                self.team_table.setItem(row, 3, QTableWidgetItem(str(completed_tickets)))
-                self.team_table.setItem(row, 4, QTableWidgetItem(avg_response))
+        """Load all data for the management portal
+        
+        Team statistics and the opportunities page are fetched in parallel
+        in the background.
+        """
+        # Get team members with their ticket statistics, and the summary cards
+        team = None if self.is_admin else self.current_user.team
+        self.db_worker.submit(
+            (id(self), "team"),
+            lambda db: (load_member_statistics(db, team), load_team_summary(db, team)),
+            self.show_team_data,
+            lambda error: print(f"Error loading team data: {error}")
+        )
+        
+        # Load opportunities
+        self.load_opportunities()
+    
+    def show_team_data(self, result):
+        """Fill the team and users tables and the statistics cards"""
+        member_statistics, summary = result
+        
+        # Update team table
+        self.team_table.setRowCount(0)
+        for member, active_tickets, completed_tickets, avg_response_time in member_statistics:
+            row = self.team_table.rowCount()
+            self.team_table.insertRow(row)
+            
+            # Add data to table
+            self.team_table.setItem(row, 0, QTableWidgetItem(f"{member.first_name} {member.last_name}"))
+            self.team_table.setItem(row, 1, QTableWidgetItem(member.role))
+            self.team_table.setItem(row, 2, QTableWidgetItem(str(active_tickets)))
+            self.team_table.setItem(row, 3, QTableWidgetItem(str(completed_tickets)))
+            self.team_table.setItem(row, 4, QTableWidgetItem(self.format_member_response_time(avg_response_time)))
+            
+            # Add action buttons
+            actions_widget = QWidget()
+            actions_layout = QHBoxLayout()
+            actions_layout.setContentsMargins(0, 0, 0, 0)
+            
+            edit_btn = QPushButton("Edit")
+            edit_btn.clicked.connect(lambda checked, m=member: self.edit_user(m))
+            actions_layout.addWidget(edit_btn)
+            
+            actions_widget.setLayout(actions_layout)
+            self.team_table.setCellWidget(row, 5, actions_widget)
+        
+        # Update users table (admin only)
+        if self.is_admin:
+            self.users_table.setRowCount(0)
+            for user, *_ in member_statistics:
+                row = self.users_table.rowCount()
+                self.users_table.insertRow(row)
+                
+                self.users_table.setItem(row, 0, QTableWidgetItem(user.username))
+                self.users_table.setItem(row, 1, QTableWidgetItem(f"{user.first_name} {user.last_name}"))
+                self.users_table.setItem(row, 2, QTableWidgetItem(user.team))
+                self.users_table.setItem(row, 3, QTableWidgetItem(user.role))
+                self.users_table.setItem(row, 4, QTableWidgetItem("Active" if user.is_active else "Inactive"))
+                self.users_table.setItem(row, 5, QTableWidgetItem(
+                    user.last_active.strftime("%Y-%m-%d %H:%M") if user.last_active else "Never"
+                ))
                 
                 # Add action buttons
                 actions_widget = QWidget()
                 actions_layout = QHBoxLayout()
-                actions_layout.setContentsMargins(0, 0, 0, 0)
+                actions_layout.setContentsMargins(4, 0, 4, 0)
+                actions_layout.setSpacing(4)
                 
+                # Edit button
                 edit_btn = QPushButton("Edit")
-                edit_btn.clicked.connect(lambda checked, m=member: self.edit_user(m))
+                edit_btn.setStyleSheet("""
+                    QPushButton {
+                        background-color: #0078d4;
+                        color: white;
+                        border: none;
+                        padding: 4px 8px;
+                        border-radius: 4px;
+                    }
+                    QPushButton:hover {
+                        background-color: #106ebe;
+                    }
+                """)
+                edit_btn.clicked.connect(lambda checked, u=user: self.edit_user(u))
                 actions_layout.addWidget(edit_btn)
                 
-                actions_widget.setLayout(actions_layout)
-                self.team_table.setCellWidget(row, 5, actions_widget)
-            
-            # Update users table (admin only)
-            if self.is_admin:
-                self.users_table.setRowCount(0)
-                for user in db.query(User).all():
-                    row = self.users_table.rowCount()
-                    self.users_table.insertRow(row)
-                    
-                    self.users_table.setItem(row, 0, QTableWidgetItem(user.username))
-                    self.users_table.setItem(row, 1, QTableWidgetItem(f"{user.first_name} {user.last_name}"))
-                    self.users_table.setItem(row, 2, QTableWidgetItem(user.team))
-                    self.users_table.setItem(row, 3, QTableWidgetItem(user.role))
-                    self.users_table.setItem(row, 4, QTableWidgetItem("Active" if user.is_active else "Inactive"))
-                    self.users_table.setItem(row, 5, QTableWidgetItem(
-                        user.last_active.strftime("%Y-%m-%d %H:%M") if user.last_active else "Never"
-                    ))
-                    
-                    # Add action buttons
-                    actions_widget = QWidget()
-                    actions_layout = QHBoxLayout()
-                    actions_layout.setContentsMargins(4, 0, 4, 0)
-                    actions_layout.setSpacing(4)
-                    
-                    # Edit button
-                    edit_btn = QPushButton("Edit")
-                    edit_btn.setStyleSheet("""
+                # Delete button (don't allow deleting self or other admins)
+                if str(user.id) != str(self.current_user.id) and user.role != "admin":
+                    delete_btn = QPushButton("Delete")
+                    delete_btn.setStyleSheet("""
                         QPushButton {
-                            background-color: #0078d4;
+                            background-color: #d83b01;
                             color: white;
                             border: none;
                             padding: 4px 8px;
                             border-radius: 4px;
                         }
                         QPushButton:hover {
-                            background-color: #106ebe;
+                            background-color: #ea4a1f;
                         }
                     """)
-                    edit_btn.clicked.connect(lambda checked, u=user: self.edit_user(u))
-                    actions_layout.addWidget(edit_btn)
-                    
-                    # Delete button (don't allow deleting self or other admins)
-                    if str(user.id) != str(self.current_user.id) and user.role != "admin":
-                        delete_btn = QPushButton("Delete")
-                        delete_btn.setStyleSheet("""
-                            QPushButton {
-                                background-color: #d83b01;
-                                color: white;
-                                border: none;
-                                padding: 4px 8px;
-                                border-radius: 4px;
-                            }
-                            QPushButton:hover {
-                                background-color: #ea4a1f;
-                            }
-                        """)
-                        delete_btn.clicked.connect(lambda checked, u=user: self.delete_user(u))
-                        actions_layout.addWidget(delete_btn)
-                    
-                    actions_widget.setLayout(actions_layout)
-                    self.users_table.setCellWidget(row, 6, actions_widget)
-            
-            # Update statistics
-            self.update_statistics(db)
-            
-            # Load opportunities
-            self.load_opportunities()
-            
-        finally:
-            db.close()
+                    delete_btn.clicked.connect(lambda checked, u=user: self.delete_user(u))
+                    actions_layout.addWidget(delete_btn)
+                
+                actions_widget.setLayout(actions_layout)
+                self.users_table.setCellWidget(row, 6, actions_widget)
+        
+        # Update statistics
+        self.update_statistics(summary)
             
     def handle_opportunity_double_click(self, item):
         """Handle double click on an opportunity in the table"""
@@ -1158,131 +1177,47 @@ class ManagementPortal(QMainWindow):
             print(f"Error in handle_opportunity_double_click: {str(e)}")
             print(traceback.format_exc())
             
-    def update_statistics(self, db):
-        """Update the statistics cards with current data"""
+    def update_statistics(self, summary):
+        """Update the statistics cards from a load_team_summary result"""
         try:
-            # Determine filter based on admin status
-            if self.is_admin:
-                team_filter = True
-            else:
-                team_members = db.query(User).filter(User.team == self.current_user.team).all()
-                team_member_ids = [m.id for m in team_members]
-                team_filter = Opportunity.creator_id.in_(team_member_ids) | Opportunity.acceptor_id.in_(team_member_ids)
-            
-            # Active tickets (In Progress or New)
-            active_tickets = db.query(Opportunity).filter(
-                team_filter if self.is_admin else True,
-                Opportunity.status.ilike("in progress") | Opportunity.status.ilike("new")
-            ).count()
-            self.findChild(QLabel, "stat_active_tickets").setText(str(active_tickets))
-            
-            # Team members
-            team_count = db.query(User).filter(
-                User.team == self.current_user.team if not self.is_admin else True,
-                User.is_active == True  # Only count active team members
-            ).count()
-            self.findChild(QLabel, "stat_team_members").setText(str(team_count))
-            
-            # Average response time and completion rate
-            completed_opps = db.query(Opportunity).filter(
-                team_filter if self.is_admin else True,
-                Opportunity.status.ilike("completed"),
-                Opportunity.completed_at.isnot(None),
-                Opportunity.created_at.isnot(None)
-            ).all()
-            
-            total_tickets = db.query(Opportunity).filter(
-                team_filter if self.is_admin else True
-            ).count()
-            
-            # Calculate average response time
-            if completed_opps:
-                response_times = []
-                for opp in completed_opps:
-                    if opp.completed_at and opp.created_at:
-                        duration = opp.completed_at - opp.created_at
-                        response_times.append(duration.total_seconds())
-                
-                if response_times:
-                    avg_seconds = sum(response_times) / len(response_times)
-                    days = int(avg_seconds // 86400)
-                    hours = int((avg_seconds % 86400) // 3600)
-                    minutes = int((avg_seconds % 3600) // 60)
-                    
-                    if days > 0:
-                        avg_response = f"{days}d {hours}h"
-                    else:
-                        avg_response = f"{hours}h {minutes}m"
+            self.findChild(QLabel, "stat_active_tickets").setText(str(summary["active_tickets"]))
+            self.findChild(QLabel, "stat_team_members").setText(str(summary["team_members"]))
+            
+            # Average response time
+            avg_response = "N/A"
+            if summary["avg_response"] is not None:
+                avg_seconds = summary["avg_response"].total_seconds()
+                days = int(avg_seconds // 86400)
+                hours = int((avg_seconds % 86400) // 3600)
+                minutes = int((avg_seconds % 3600) // 60)
+                
+                if days > 0:
+                    avg_response = f"{days}d {hours}h"
                 else:
-                    avg_response = "N/A"
-            else:
-                avg_response = "N/A"
+                    avg_response = f"{hours}h {minutes}m"
             
             self.findChild(QLabel, "stat_avg_response_time").setText(avg_response)
             
             # Calculate completion rate
-            if total_tickets > 0:
-                completion_rate = (len(completed_opps) / total_tickets) * 100
+            if summary["total_tickets"] > 0:
+                completion_rate = (summary["completed_tickets"] / summary["total_tickets"]) * 100
                 self.findChild(QLabel, "stat_completion_rate").setText(f"{completion_rate:.1f}%")
             else:
                 self.findChild(QLabel, "stat_completion_rate").setText("0.0%")
             
-            # Update team table statistics
-            for row in range(self.team_table.rowCount()):
-                name_item = self.team_table.item(row, 0)
-                if name_item:
-                    name_parts = name_item.text().split()
-                    if len(name_parts) >= 2:
-                        user = db.query(User).filter(
-                            User.first_name == name_parts[0],
-                            User.last_name == name_parts[1]
-                        ).first()
-                        
-                        if user:
-                            # Count active tickets for user
-                            active_count = db.query(Opportunity).filter(
-                                (Opportunity.creator_id == user.id) | (Opportunity.acceptor_id == user.id),
-                                Opportunity.status.in_(["new", "in progress"])
-                            ).count()
-                            self.team_table.setItem(row, 2, QTableWidgetItem(str(active_count)))
-                            
-                            # Count completed tickets
-                            completed_count = db.query(Opportunity).filter(
-                                (Opportunity.creator_id == user.id) | (Opportunity.acceptor_id == user.id),
-                                Opportunity.status.ilike("completed")
-                            ).count()
-                            self.team_table.setItem(row, 3, QTableWidgetItem(str(completed_count)))
-                            
-                            # Calculate average response time for user
-                            user_completed = db.query(Opportunity).filter(
-                                (Opportunity.creator_id == user.id) | (Opportunity.acceptor_id == user.id),
-                                Opportunity.status.ilike("completed"),
-                                Opportunity.completed_at.isnot(None),
-                                Opportunity.created_at.isnot(None)
-                            ).all()
-                            
-                            if user_completed:
-                                user_times = []
-                                for opp in user_completed:
-                                    if opp.completed_at and opp.created_at:
-                                        duration = opp.completed_at - opp.created_at
-                                        user_times.append(duration.total_seconds())
-                                
-                                if user_times:
-                                    avg_secs = sum(user_times) / len(user_times)
-                                    days = int(avg_secs // 86400)
-                                    hours = int((avg_secs % 86400) // 3600)
-                                    user_avg = f"{days}d {hours}h" if days > 0 else f"{hours}h"
-                                    self.team_table.setItem(row, 4, QTableWidgetItem(user_avg))
-                                else:
-                                    self.team_table.setItem(row, 4, QTableWidgetItem("N/A"))
-                            else:
-                                self.team_table.setItem(row, 4, QTableWidgetItem("N/A"))
-            
         except Exception as e:
             print(f"Error updating statistics: {str(e)}")
             print(traceback.format_exc())
             
+    def format_member_response_time(self, avg_response_time):
+        """Format a team member's average response time for the team table"""
+        if avg_response_time is None:
+            return "N/A"
+        avg_secs = avg_response_time.total_seconds()
+        days = int(avg_secs // 86400)
+        hours = int((avg_secs % 86400) // 3600)
+        return f"{days}d {hours}h" if days > 0 else f"{hours}h"
+            
     def edit_user(self, user):
         """Open dialog to edit user details"""
         dialog = UserEditDialog(user, self.is_admin, self)
@@ -1654,11 +1589,7 @@ class ManagementPortal(QMainWindow):
             db = SessionLocal()
             
             # Check for references in opportunities
-            opps = db.query(Opportunity).filter(
-                Opportunity.year == vehicle.year,
-                Opportunity.make == vehicle.make,
-                Opportunity.model == vehicle.model
-            ).count()
+            opps = db.query(Opportunity).filter(Opportunity.vehicle_id == vehicle.id).count()
             
             if opps > 0:
                 msg = QMessageBox()
@@ -1761,6 +1692,10 @@ class ManagementPortal(QMainWindow):
     def export_to_excel(self):
         """Export ticket data to Excel with multiple sheets"""
         try:
+            # openpyxl is only needed here, so it is imported on first export
+            import openpyxl
+            from openpyxl.styles import Font, PatternFill
+
             # Create a new workbook
             wb = openpyxl.Workbook()
             
@@ -1771,10 +1706,10 @@ class ManagementPortal(QMainWindow):
                 all_tickets = db.query(Opportunity).all()
                 
                 # Separate tickets by status
-                completed_tickets = [t for t in all_tickets if t.status.lower() == "completed"]
-                in_progress_tickets = [t for t in all_tickets if t.status.lower() == "in progress"]
-                needs_info_tickets = [t for t in all_tickets if t.status.lower() == "needs info"]
-                new_tickets = [t for t in all_tickets if t.status.lower() == "new"]
+                completed_tickets = [t for t in all_tickets if t.status == "completed"]
+                in_progress_tickets = [t for t in all_tickets if t.status == "in progress"]
+                needs_info_tickets = [t for t in all_tickets if t.status == "needs info"]
+                new_tickets = [t for t in all_tickets if t.status == "new"]
                 
                 # Create sheets
                 completed_sheet = wb.active
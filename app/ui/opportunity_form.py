@@ -1,25 +1,29 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QLineEdit, QTextEdit, QPushButton, QComboBox,
                            QFileDialog, QMessageBox, QScrollArea, QFrame,
-                           QCheckBox, QGroupBox, QDialog, QFormLayout)
+                           QCheckBox, QGroupBox, QDialog, QFormLayout, QProgressBar)
 from PyQt5.QtCore import Qt, pyqtSignal
 from app.database.connection import SessionLocal
-from app.models.models import Opportunity, Vehicle, AdasSystem, File, User, Notification
-from app.config import STORAGE_DIR
+from app.models.models import Opportunity, Vehicle, File, User
 import os
 import mimetypes
 from datetime import datetime
-import shutil
 import hashlib
 from app.services.supabase_storage import SupabaseStorageService
+from app.services.notification_service import notify_all_users
+from app.services.reference_cache import get_adas_systems
+from app.services.ticket_numbers import allocate_ticket_number, peek_ticket_number
+from app.services.vehicle_catalog import get_vehicle_catalog
+from app.ui.upload_manager import UploadManager
 
-def calculate_file_hash(file_path):
-    """Calculate SHA-256 hash of a file"""
-    return SupabaseStorageService.calculate_file_hash(file_path)
-
-def store_file(source_path, file_hash):
-    """Store file in Supabase storage with hash-based name"""
-    return SupabaseStorageService.store_file(source_path, file_hash)
+def store_file(source_path, file_hash, progress=None):
+    """Store file in Supabase storage with hash-based name, linking a stored copy if there is one"""
+    db = SessionLocal()
+    try:
+        return SupabaseStorageService.store_file(source_path, file_hash, file_hash=file_hash, db=db,
+                                                 progress=progress)
+    finally:
+        db.close()
 
 class CustomVehicleDialog(QDialog):
     def __init__(self, parent=None):
@@ -308,8 +312,13 @@ class OpportunityForm(QWidget):
         super().__init__()
         self.current_user_id = current_user_id  # Store the user ID
         self.current_user = None  # Will be loaded from database
-        self.vehicles = []  # Initialize vehicles list
+        self.vehicle_catalog = None  # Shared year/make/model lookups, see load_data
         self.ticket_number = None  # Store the generated ticket number
+        self.submit_waiting = False  # Submit was pressed while uploads were still running
+        self.upload_manager = UploadManager(store_file, parent=self)
+        self.upload_manager.upload_progress.connect(self.on_upload_progress)
+        self.upload_manager.upload_finished.connect(self.on_upload_finished)
+        self.upload_manager.upload_failed.connect(self.on_upload_failed)
         self.load_current_user()  # Load the current user object
         self.initUI()
         
@@ -329,15 +338,10 @@ class OpportunityForm(QWidget):
         self.hide()
         
     def generate_ticket_number(self):
-        """Generate a unique ticket number based on the current count of opportunities"""
+        """Preview the next ticket number; the real one is allocated on submit"""
         db = SessionLocal()
         try:
-            # Get the current count of opportunities
-            count = db.query(Opportunity).count()
-            # Generate ticket number in format SI-YYYY-XXXXX where XXXXX is padded with zeros
-            year = datetime.now().year
-            ticket_number = f"SI-{year}-{(count + 1):05d}"
-            return ticket_number
+            return peek_ticket_number(db)
         finally:
             db.close()
             
@@ -660,6 +664,7 @@ class OpportunityForm(QWidget):
         # Submit button
         submit_btn = QPushButton("Submit")
         submit_btn.clicked.connect(self.submit_opportunity)
+        self.submit_btn = submit_btn
         submit_btn.setStyleSheet("""
             QPushButton {
                 background-color: #0078d4;
@@ -698,18 +703,19 @@ class OpportunityForm(QWidget):
         """Load vehicle and system data from database"""
         db = SessionLocal()
         try:
-            # Load vehicles
-            self.vehicles = db.query(Vehicle).all()  # Store vehicles in instance variable
+            # Load the vehicle catalog (refetched only when the table changed)
+            self.vehicle_catalog = get_vehicle_catalog(db)
             
-            if self.vehicles:
+            if self.vehicle_catalog.years:
                 # Populate year combo
-                years = sorted(set(v.year for v in self.vehicles), reverse=True)
+                years = self.vehicle_catalog.years
                 # Add 2025 if not already in the list
                 if "2025" not in years:
                     years = ["2025"] + years
                 # Add empty item at the start
+                self.year_combo.clear()
                 self.year_combo.addItem("")
-                self.year_combo.addItems(map(str, years))
+                self.year_combo.addItems(years)
             else:
                 print("No vehicles found in database")
             
@@ -721,8 +727,8 @@ class OpportunityForm(QWidget):
     def update_makes(self, year):
         """Update makes combo box based on selected year"""
         self.make_combo.clear()
-        if year and self.vehicles:
-            makes = sorted(set(v.make for v in self.vehicles if str(v.year) == year))
+        if year and self.vehicle_catalog:
+            makes = self.vehicle_catalog.makes_for(year)
             self.make_combo.addItems(makes)
             # Trigger initial model update if there are makes
             if makes:
@@ -732,10 +738,8 @@ class OpportunityForm(QWidget):
         """Update models combo box based on selected make"""
         self.model_combo.clear()
         year = self.year_combo.currentText()
-        if year and make and self.vehicles:
-            models = sorted(set(v.model for v in self.vehicles 
-                              if str(v.year) == year and v.make == make))
-            self.model_combo.addItems(models)
+        if year and make and self.vehicle_catalog:
+            self.model_combo.addItems(self.vehicle_catalog.models_for(year, make))
             
     def add_system_row(self):
         """Add a new system row with dropdown and affected portions"""
@@ -837,12 +841,12 @@ class OpportunityForm(QWidget):
         }
         self.system_rows.append(row_data)
         
-        # Load systems into combo
+        # Load systems into combo (cached; refetched only when the table changed)
         db = SessionLocal()
         try:
-            systems = db.query(AdasSystem).all()
+            systems = get_adas_systems(db)
             if systems:
-                system_combo.addItems([f"{s.code} - {s.name}" for s in systems])
+                system_combo.addItems([f"{code} - {name}" for _, code, name in systems])
         finally:
             db.close()
 
@@ -858,7 +862,7 @@ class OpportunityForm(QWidget):
         row_widget.deleteLater()
 
     def add_attachment(self):
-        """Handle file attachment"""
+        """Handle file attachment; the upload starts right away in the background"""
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Select File",
@@ -868,24 +872,8 @@ class OpportunityForm(QWidget):
         
         if file_path:
             try:
-                # Calculate file hash
-                file_hash = calculate_file_hash(file_path)
                 file_name = os.path.basename(file_path)
                 
-                # Try to store in Supabase first
-                storage_path = store_file(file_path, file_hash)
-                
-                # If Supabase storage fails, store locally
-                if not storage_path:
-                    # Create local storage path
-                    local_dir = os.path.join(STORAGE_DIR, file_hash[:2], file_hash[2:4])
-                    os.makedirs(local_dir, exist_ok=True)
-                    
-                    # Copy file to local storage
-                    local_path = os.path.join(local_dir, file_name)
-                    shutil.copy2(file_path, local_path)
-                    storage_path = os.path.join('local', file_hash[:2], file_hash[2:4], file_name)
-                
                 # Create container for attachment row
                 attachment_row = QWidget()
                 row_layout = QHBoxLayout(attachment_row)
@@ -894,6 +882,28 @@ class OpportunityForm(QWidget):
                 label = QLabel(file_name)
                 label.setStyleSheet("color: #ffffff;")
                 row_layout.addWidget(label)
+
+                # Upload progress and status
+                progress_bar = QProgressBar()
+                progress_bar.setRange(0, 100)
+                progress_bar.setValue(0)
+                progress_bar.setFixedWidth(120)
+                progress_bar.setStyleSheet("""
+                    QProgressBar {
+                        border: 1px solid #555555;
+                        border-radius: 3px;
+                        text-align: center;
+                        background-color: #3d3d3d;
+                        color: #ffffff;
+                    }
+                    QProgressBar::chunk {
+                        background-color: #0078d4;
+                    }
+                """)
+                row_layout.addWidget(progress_bar)
+                status_label = QLabel("Queued")
+                status_label.setStyleSheet("color: #aaaaaa;")
+                row_layout.addWidget(status_label)
                 
                 # Add remove button
                 remove_btn = QPushButton("×")
@@ -911,33 +921,79 @@ class OpportunityForm(QWidget):
                         background-color: #ea4a1f;
                     }
                 """)
-                remove_btn.clicked.connect(lambda: self.remove_attachment(attachment_row, file_path))
                 row_layout.addWidget(remove_btn)
                 
                 # Add to container
                 self.attachments_container_layout.addWidget(attachment_row)
                 
-                # Store file info
-                self.attachments.append({
+                # Store file info; storage_path and hash are filled in when the upload finishes
+                attachment = {
                     'path': file_path,
-                    'storage_path': storage_path,
-                    'hash': file_hash,
+                    'storage_path': None,
+                    'hash': None,
                     'name': file_name,
                     'size': os.path.getsize(file_path),
-                    'mime_type': mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
-                })
+                    'mime_type': mimetypes.guess_type(file_path)[0] or 'application/octet-stream',
+                    'upload_id': self.upload_manager.start(file_path),
+                    'progress_bar': progress_bar,
+                    'status_label': status_label
+                }
+                remove_btn.clicked.connect(lambda: self.remove_attachment(attachment_row, attachment))
+                self.attachments.append(attachment)
                 self.attachment_labels.append(attachment_row)
                 
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to attach file: {str(e)}")
                 print(f"Error attaching file: {str(e)}")  # Log the error for debugging
 
-    def remove_attachment(self, row_widget, file_path):
-        """Remove an attachment"""
-        index = self.attachments.index(file_path)
+    def find_attachment(self, upload_id):
+        for attachment in self.attachments:
+            if attachment['upload_id'] == upload_id:
+                return attachment
+        return None
+
+    def on_upload_progress(self, upload_id, status, percent):
+        attachment = self.find_attachment(upload_id)
+        if attachment is None:
+            return
+        if percent >= 0:
+            attachment['progress_bar'].setValue(percent)
+        attachment['status_label'].setText(status)
+
+    def on_upload_finished(self, upload_id, result):
+        attachment = self.find_attachment(upload_id)
+        if attachment is None:
+            return
+        attachment.update(storage_path=result['storage_path'], hash=result['hash'], size=result['size'])
+        attachment['progress_bar'].setValue(100)
+        attachment['status_label'].setText("Saved locally" if result['storage_path'].startswith('local')
+                                           else "Uploaded")
+        self.check_waiting_submit()
+
+    def on_upload_failed(self, upload_id, error):
+        attachment = self.find_attachment(upload_id)
+        if attachment is None:
+            return
+        attachment['status_label'].setText("Failed")
+        attachment['status_label'].setStyleSheet("color: #d83b01;")
+        self.check_waiting_submit()
+
+    def check_waiting_submit(self):
+        """Finish a submit that was waiting for the last uploads"""
+        if self.submit_waiting and self.upload_manager.pending_count() == 0:
+            self.submit_waiting = False
+            self.submit_btn.setEnabled(True)
+            self.submit_btn.setText("Submit")
+            self.submit_opportunity()
+
+    def remove_attachment(self, row_widget, attachment):
+        """Remove an attachment, cancelling its upload if it is still running"""
+        self.upload_manager.cancel(attachment['upload_id'])
+        index = self.attachments.index(attachment)
         self.attachments.pop(index)
         self.attachment_labels.pop(index)
         row_widget.deleteLater()
+        self.check_waiting_submit()
 
     def check_show_vin_field(self, make_text):
         """Show or hide the VIN field based on the selected make"""
@@ -950,6 +1006,20 @@ class OpportunityForm(QWidget):
     def submit_opportunity(self):
         if not self.validate_form():
             return
+
+        # Only wait on uploads that are still running; the rest are already stored
+        pending = self.upload_manager.pending_count()
+        if pending:
+            self.submit_waiting = True
+            self.submit_btn.setEnabled(False)
+            self.submit_btn.setText(f"Waiting for {pending} upload{'s' if pending > 1 else ''}...")
+            return
+
+        failed = [attachment['name'] for attachment in self.attachments if not attachment['storage_path']]
+        if failed:
+            QMessageBox.warning(self, "Attachment Error",
+                                f"These files could not be stored, remove them to continue:\n{', '.join(failed)}")
+            return
             
         db = SessionLocal()
         try:
@@ -970,7 +1040,11 @@ class OpportunityForm(QWidget):
                         })
             
             # Format vehicle information
-            vehicle_info = f"{self.year_combo.currentText()} {self.make_combo.currentText()} {self.model_combo.currentText()}"
+            year = self.year_combo.currentText()
+            make = self.make_combo.currentText()
+            model = self.model_combo.currentText()
+            vehicle_info = f"{year} {make} {model}"
+            vehicle_id = self.vehicle_catalog.vehicle_id(year, make, model) if self.vehicle_catalog else None
             
             # Add VIN to description if provided
             vin_text = ""
@@ -983,6 +1057,9 @@ class OpportunityForm(QWidget):
             # Get VIN if provided
             vin = self.vin_input.text().strip() if self.make_combo.currentText().lower() == "bmw" else None
             
+            # Allocate the ticket number in the same transaction as the insert
+            self.ticket_number = allocate_ticket_number(db)
+            
             # Create the opportunity
             new_opp = Opportunity(
                 title=self.ticket_number,
@@ -991,24 +1068,24 @@ class OpportunityForm(QWidget):
                 systems=systems_data,
                 creator_id=self.current_user_id,
                 created_at=datetime.utcnow(),
-                vin=vin  # Add VIN to the database record
+                vin=vin,  # Add VIN to the database record
+                vehicle_id=vehicle_id,
+                year=year,
+                make=make,
+                model=model
             )
             
             db.add(new_opp)
             db.flush()  # Get the ID without committing
             
-            # Create notifications for all users except the creator
-            all_users = db.query(User).filter(User.id != self.current_user_id).all()
-            for user in all_users:
-                notification = Notification(
-                    user_id=user.id,
-                    opportunity_id=new_opp.id,
-                    type="new_opportunity",
-                    message=f"New opportunity created: {new_opp.title} - Vehicle: {vehicle_info}",
-                    created_at=datetime.utcnow(),
-                    read=False
-                )
-                db.add(notification)
+            # Create notifications for all users except the creator in one statement
+            notify_all_users(
+                db,
+                new_opp.id,
+                "new_opportunity",
+                f"New opportunity created: {new_opp.title} - Vehicle: {vehicle_info}",
+                exclude_user_id=self.current_user_id
+            )
             
             # Handle file attachments
             for attachment in self.attachments:
@@ -1030,7 +1107,7 @@ class OpportunityForm(QWidget):
             # Emit signal with the new opportunity
             self.opportunity_created.emit(new_opp)
             
-            QMessageBox.information(self, "Success", "Opportunity created successfully!")
+            QMessageBox.information(self, "Success", f"Opportunity {self.ticket_number} created successfully!")
             self.clear_form()
             
         except Exception as e:
@@ -1077,6 +1154,7 @@ class OpportunityForm(QWidget):
         self.vin_container.hide()  # Hide the VIN field
         
         # Clear attachments
+        self.upload_manager.cancel_all()
         for label in self.attachment_labels:
             label.deleteLater()
         self.attachments = []
@@ -1102,8 +1180,6 @@ class OpportunityForm(QWidget):
             self.load_data()
             
             # Select the newly added vehicle
-            if self.vehicles:
-                latest_vehicle = self.vehicles[-1]
-                self.year_combo.setCurrentText(latest_vehicle.year)
-                self.make_combo.setCurrentText(latest_vehicle.make)
-                self.model_combo.setCurrentText(latest_vehicle.model) 
\ No newline at end of file
+            self.year_combo.setCurrentText(dialog.year_input.text().strip())
+            self.make_combo.setCurrentText(dialog.make_input.text().strip())
+            self.model_combo.setCurrentText(dialog.model_input.text().strip()) 
\ No newline at end of file
@@ -0,0 +1,486 @@
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QPoint, QEvent, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QFont, QFontMetrics, QPen
+from app.models.models import Opportunity
+from app.ui.db_worker import get_database_worker
+from sqlalchemy.orm import joinedload, selectinload, undefer
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import re
+
+# Rows fetched per page as the dashboard list scrolls
+DASHBOARD_PAGE_SIZE = 50
+
+# Item data role carrying the Opportunity instance
+OpportunityRole = Qt.UserRole + 1
+# Item data role carrying the card description, see card_description()
+CardDescriptionRole = Qt.UserRole + 2
+
+# The "Vehicle: ..." line the form writes into descriptions; the card title shows it
+VEHICLE_LINE = re.compile(r'Vehicle:\s+[^\n]+(\n|$)')
+
+STATUS_CHOICES = ["New", "In Progress", "Completed", "Needs Info"]
+
+def card_loader_options():
+    """Loader options for everything a card paints, so detached rows never lazy-load"""
+    return (
+        selectinload(Opportunity.files),
+        joinedload(Opportunity.creator),
+        joinedload(Opportunity.acceptor),
+        undefer(Opportunity.comment_count),
+        undefer(Opportunity.first_comment)
+    )
+
+def opportunity_version(opportunity: Opportunity) -> Optional[datetime]:
+    """Version stamp used to detect changed rows: updated_at, else created_at"""
+    return opportunity.updated_at or opportunity.created_at
+
+def card_title(opportunity: Opportunity) -> str:
+    """Vehicle "YEAR MAKE MODEL" when known, otherwise the ticket title"""
+    return opportunity.vehicle_name or opportunity.display_title
+
+def card_systems(opportunity: Opportunity) -> str:
+    """Comma separated system names stored on the ticket"""
+    if not isinstance(opportunity.systems, list):
+        return ""
+
+    systems = []
+    for system in opportunity.systems:
+        if isinstance(system, dict) and "system" in system:
+            systems.append(system["system"])
+        elif isinstance(system, dict) and "name" in system:
+            systems.append(system["name"])
+        elif isinstance(system, str):
+            systems.append(system)
+    return ", ".join(systems)
+
+def card_description(opportunity: Opportunity) -> str:
+    """First comment, or the description without its Vehicle: line
+
+    Computed once per loaded row by OpportunityListModel (CardDescriptionRole),
+    not on every paint.
+    """
+    if opportunity.comment_count:
+        return opportunity.first_comment or ""
+
+    if opportunity.description:
+        return VEHICLE_LINE.sub('', opportunity.description).strip()
+    return ""
+
+class OpportunityListModel(QAbstractListModel):
+    """List model over the dashboard's filtered opportunities
+
+    Rows are fetched a page at a time as the view scrolls. refresh()
+    reconciles the loaded rows with the database by opportunity ID, only
+    fetching rows whose version changed. All queries run on the shared
+    database worker; a refresh supersedes any page or refresh in flight.
+    """
+    refreshed = pyqtSignal()
+    load_failed = pyqtSignal(str)
+
+    def __init__(self,
+                 fetch_page: Callable[..., List[Opportunity]],
+                 fetch_versions: Callable[..., List[Tuple[str, datetime]]],
+                 get_filters: Callable[[], Dict],
+                 page_size: int = DASHBOARD_PAGE_SIZE,
+                 parent=None):
+        """
+        Args:
+            fetch_page: (db, filters, offset, limit) -> opportunities in display order
+            fetch_versions: (db, filters, limit) -> (id, version) pairs in display order
+            get_filters: Snapshot of the filter state, called on the UI thread
+            page_size: Rows fetched per page
+        """
+        super().__init__(parent)
+        self.fetch_page = fetch_page
+        self.fetch_versions = fetch_versions
+        self.get_filters = get_filters
+        self.page_size = page_size
+        self.worker = get_database_worker()
+        self._page_key = (id(self), "page")
+        self._refresh_key = (id(self), "refresh")
+        self._rows: List[Opportunity] = []
+        self._versions: Dict[str, datetime] = {}
+        self._descriptions: Dict[str, str] = {}
+        self._exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+
+        opportunity = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return opportunity.title
+        if role == OpportunityRole:
+            return opportunity
+        if role == CardDescriptionRole:
+            return self._descriptions.get(str(opportunity.id), "")
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return (not parent.isValid() and not self._exhausted
+                and not self.worker.is_pending(self._page_key)
+                and not self.worker.is_pending(self._refresh_key))
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+
+        filters = self.get_filters()
+        offset = len(self._rows)
+        limit = self.page_size
+        self.worker.submit(
+            self._page_key,
+            lambda db: self.fetch_page(db, filters, offset, limit),
+            self._on_page,
+            self.load_failed.emit
+        )
+
+    def _on_page(self, page: List[Opportunity]) -> None:
+        self._exhausted = len(page) < self.page_size
+
+        # Rows created since the last page shift the offset; skip repeats
+        page = [opp for opp in page if str(opp.id) not in self._versions]
+        if not page:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        for opp in page:
+            self._rows.append(opp)
+            self._versions[str(opp.id)] = opportunity_version(opp)
+            self._descriptions[str(opp.id)] = card_description(opp)
+        self.endInsertRows()
+
+    def refresh(self) -> None:
+        """Reconcile the loaded rows with the database, keyed by opportunity ID
+
+        Covers at least one page, or everything already scrolled into view.
+        Changed rows are replaced in place, new rows inserted, rows that left
+        the filter removed and moved rows moved. Emits refreshed when done.
+        """
+        self.worker.cancel(self._page_key)
+        filters = self.get_filters()
+        limit = max(len(self._rows), self.page_size)
+        known = dict(self._versions)
+        self.worker.submit(
+            self._refresh_key,
+            lambda db: self._load_changes(db, filters, limit, known),
+            lambda result: self._on_refresh(limit, *result),
+            self.load_failed.emit
+        )
+
+    def _load_changes(self, db, filters, limit, known):
+        """Worker side of refresh: the version window plus full rows for changed IDs"""
+        versions = self.fetch_versions(db, filters, limit)
+        changed_ids = [
+            opportunity_id for opportunity_id, version in versions
+            if opportunity_id not in known or known[opportunity_id] != version
+        ]
+        fresh: Dict[str, Opportunity] = {}
+        if changed_ids:
+            for opp in (db.query(Opportunity)
+                        .options(*card_loader_options())
+                        .filter(Opportunity.id.in_(changed_ids))
+                        .all()):
+                fresh[str(opp.id)] = opp
+        return versions, fresh
+
+    def _on_refresh(self, limit, versions, fresh) -> None:
+        self._exhausted = len(versions) < limit
+
+        # Drop rows deleted between the version query and the fetch
+        versions = [(opportunity_id, version) for opportunity_id, version in versions
+                    if opportunity_id in fresh or opportunity_id in self._versions]
+        self._apply(versions, fresh)
+        self.refreshed.emit()
+
+    def _apply(self, versions: List[Tuple[str, datetime]], fresh: Dict[str, Opportunity]) -> None:
+        """Turn the loaded rows into the given ID order with row-level signals"""
+        wanted = {opportunity_id for opportunity_id, _ in versions}
+        for row in reversed(range(len(self._rows))):
+            opportunity_id = str(self._rows[row].id)
+            if opportunity_id not in wanted:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._rows[row]
+                self._versions.pop(opportunity_id, None)
+                self._descriptions.pop(opportunity_id, None)
+                self.endRemoveRows()
+
+        for target, (opportunity_id, version) in enumerate(versions):
+            source = self._find(opportunity_id, target)
+            if opportunity_id in fresh:
+                self._descriptions[opportunity_id] = card_description(fresh[opportunity_id])
+            if source is None:
+                self.beginInsertRows(QModelIndex(), target, target)
+                self._rows.insert(target, fresh[opportunity_id])
+                self.endInsertRows()
+            else:
+                if source != target:
+                    self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), target)
+                    self._rows.insert(target, self._rows.pop(source))
+                    self.endMoveRows()
+                if opportunity_id in fresh:
+                    self._rows[target] = fresh[opportunity_id]
+                    index = self.index(target)
+                    self.dataChanged.emit(index, index)
+            self._versions[opportunity_id] = version
+
+    def _find(self, opportunity_id: str, start: int) -> Optional[int]:
+        for row in range(start, len(self._rows)):
+            if str(self._rows[row].id) == opportunity_id:
+                return row
+        return None
+
+    def clear(self) -> None:
+        """Drop all loaded rows; the next refresh starts from the first page"""
+        self.worker.cancel(self._page_key)
+        self.worker.cancel(self._refresh_key)
+        self.beginResetModel()
+        self._rows = []
+        self._versions = {}
+        self._descriptions = {}
+        self._exhausted = False
+        self.endResetModel()
+
+    def is_fetching(self) -> bool:
+        """Whether a page or refresh is in flight"""
+        return self.worker.is_pending(self._page_key) or self.worker.is_pending(self._refresh_key)
+
+    def opportunities(self) -> List[Opportunity]:
+        """Loaded opportunities in display order"""
+        return list(self._rows)
+
+    def row_of(self, opportunity_id: str) -> Optional[int]:
+        """Row of a loaded opportunity, or None"""
+        return self._find(str(opportunity_id), 0)
+
+class CardLayout:
+    """Geometry of one painted card: what to draw and where clicks land"""
+
+    def __init__(self):
+        self.height = 0
+        self.boxes = []  # (rect, background, border)
+        self.texts = []  # (rect, text, font, color, flags)
+        self.hits = []   # (rect, action, payload)
+
+class OpportunityCardDelegate(QStyledItemDelegate):
+    """Paints opportunity cards for the dashboard list
+
+    Only rows inside the viewport are painted, so no widgets are created
+    per ticket. Clicks on the status, buttons and attachment links are
+    reported through signals.
+    """
+    status_clicked = pyqtSignal(object, QPoint)  # opportunity, global position for a menu
+    comments_clicked = pyqtSignal(object)
+    details_clicked = pyqtSignal(object)
+    attachment_clicked = pyqtSignal(object)
+
+    CARD_SPACING = 16
+    DESCRIPTION_LENGTH = 150
+    MAX_ATTACHMENTS = 3
+
+    def __init__(self, time_formatter: Callable[[Opportunity], str], parent=None):
+        """
+        Args:
+            time_formatter: Builds the created/assigned/completed line for a card
+            parent: The list view the delegate paints for
+        """
+        super().__init__(parent)
+        self.time_formatter = time_formatter
+        self.is_compact = True
+        self.expanded: Set[str] = set()
+
+    def _font(self, base: QFont, pixel_size: int, bold: bool = False, italic: bool = False) -> QFont:
+        font = QFont(base)
+        font.setPixelSize(pixel_size)
+        font.setBold(bold)
+        font.setItalic(italic)
+        return font
+
+    def layout_card(self, opportunity: Opportunity, rect: QRect, base_font: QFont,
+                    description: str = "") -> CardLayout:
+        """Compute the card geometry for an opportunity at the given width
+
+        description is the model's CardDescriptionRole text for the row.
+        """
+        layout = CardLayout()
+        padding = 12 if self.is_compact else 20
+        spacing = 2 if self.is_compact else 4
+        status_width = 100 if self.is_compact else 140
+        status_height = 26 if self.is_compact else 32
+
+        left = rect.left() + padding
+        width = max(rect.width() - 2 * padding - status_width - 16, 120)
+        y = rect.top() + padding
+
+        def add_text(text, font, color, indent=0, action=None, payload=None):
+            nonlocal y
+            flags = Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap
+            text_width = width - 2 * indent
+            height = QFontMetrics(font).boundingRect(QRect(0, 0, text_width, 100000), flags, text).height()
+            text_rect = QRect(left + indent, y, text_width, height)
+            layout.texts.append((text_rect, text, font, color, flags))
+            if action:
+                layout.hits.append((text_rect, action, payload))
+            y += height + spacing
+
+        # Title and submitter info
+        add_text(card_title(opportunity), self._font(base_font, 14 if self.is_compact else 18, bold=True), "#ffffff")
+        if opportunity.creator:
+            creator = opportunity.creator
+            add_text(f"Submitted by {creator.first_name} {creator.last_name} ({creator.team})",
+                     self._font(base_font, 12), "#bbbbbb")
+
+        time_text = self.time_formatter(opportunity)
+        if time_text:
+            add_text(time_text, self._font(base_font, 11), "#888888")
+
+        # Ticket, VIN, systems, attachments and description
+        details_top = y + 4
+        y = details_top + 8
+        add_text(f"Ticket: {opportunity.display_title}", self._font(base_font, 12, bold=True), "#0078d4", indent=8)
+        if opportunity.vin:
+            add_text(f"VIN: {opportunity.vin}", self._font(base_font, 12), "#0078d4", indent=8)
+
+        systems = card_systems(opportunity)
+        if systems:
+            add_text(f"Systems: {systems}", self._font(base_font, 12), "#0078d4", indent=8)
+
+        files = opportunity.files or []
+        if files:
+            add_text(f"Attachments ({len(files)}):", self._font(base_font, 12, bold=True), "#0078d4", indent=8)
+            for file in files[:self.MAX_ATTACHMENTS]:
+                add_text(f"📎 {file.display_name}", self._font(base_font, 11), "#0078d4", indent=8,
+                         action="attachment", payload=file)
+            remaining = len(files) - self.MAX_ATTACHMENTS
+            if remaining > 0:
+                add_text(f"... and {remaining} more file(s)", self._font(base_font, 11, italic=True), "#888888", indent=8)
+
+        if description:
+            expanded = str(opportunity.id) in self.expanded
+            truncated = len(description) > self.DESCRIPTION_LENGTH
+            display_text = description if expanded or not truncated else description[:self.DESCRIPTION_LENGTH] + "..."
+            description_top = y
+            add_text(display_text, self._font(base_font, 12), "#cccccc", indent=8)
+            if truncated:
+                add_text("Click to collapse..." if expanded else "Click to expand...",
+                         self._font(base_font, 11, italic=True), "#0078d4", indent=8)
+                layout.hits.append((QRect(left, description_top, width, y - description_top), "description", None))
+
+        y += 8 - spacing
+        layout.boxes.append((QRect(left, details_top, width, y - details_top), "#252525", None))
+
+        # Buttons section (expanded view only)
+        if not self.is_compact:
+            y += 12
+            button_font = self._font(base_font, 13)
+            metrics = QFontMetrics(button_font)
+            x = left
+            buttons = []
+            if opportunity.description or opportunity.systems:
+                buttons.append(("View Details", "details"))
+            comment_count = opportunity.comment_count
+            buttons.append((f"Comments ({comment_count})" if comment_count else "Add Comment", "comments"))
+            for label, action in buttons:
+                button_rect = QRect(x, y, metrics.horizontalAdvance(label) + 24, metrics.height() + 12)
+                layout.boxes.append((button_rect, "#262626", None))
+                layout.texts.append((button_rect, label, button_font, "#0078d4", Qt.AlignCenter))
+                layout.hits.append((button_rect, action, None))
+                x += button_rect.width() + 8
+            y += metrics.height() + 12
+
+        # Status on the right of the header
+        status_rect = QRect(rect.left() + rect.width() - padding - status_width, rect.top() + padding,
+                            status_width, status_height)
+        layout.boxes.append((status_rect, "#262626", "#404040"))
+        layout.texts.append((status_rect, f"{opportunity.display_status}  ▾", self._font(base_font, 12),
+                             "#ffffff", Qt.AlignCenter))
+        layout.hits.append((status_rect, "status", None))
+
+        layout.height = max(y, status_rect.bottom()) + padding - rect.top()
+        return layout
+
+    def _view_width(self, option) -> int:
+        view = self.parent()
+        if view is not None and hasattr(view, 'viewport'):
+            return view.viewport().width()
+        return option.rect.width()
+
+    def sizeHint(self, option, index):
+        opportunity = index.data(OpportunityRole)
+        if opportunity is None:
+            return super().sizeHint(option, index)
+
+        width = self._view_width(option)
+        layout = self.layout_card(opportunity, QRect(0, 0, width, 0), option.font,
+                                  index.data(CardDescriptionRole))
+        return QSize(width, layout.height + self.CARD_SPACING)
+
+    def paint(self, painter, option, index):
+        opportunity = index.data(OpportunityRole)
+        if opportunity is None:
+            return super().paint(painter, option, index)
+
+        layout = self.layout_card(opportunity, option.rect, option.font, index.data(CardDescriptionRole))
+        radius = 6 if self.is_compact else 8
+        card_rect = QRect(option.rect.left(), option.rect.top(), option.rect.width(), layout.height)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Card background, highlighted when hovered or selected
+        if option.state & QStyle.State_Selected:
+            painter.setPen(QPen(QColor("#0078d4"), 2))
+        else:
+            painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#333333" if option.state & QStyle.State_MouseOver else "#2d2d2d"))
+        painter.drawRoundedRect(card_rect.adjusted(1, 1, -1, -1), radius, radius)
+
+        for rect, background, border in layout.boxes:
+            painter.setPen(QPen(QColor(border), 1) if border else Qt.NoPen)
+            painter.setBrush(QColor(background))
+            painter.drawRoundedRect(rect, 4, 4)
+
+        for rect, text, font, color, flags in layout.texts:
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            painter.drawText(rect, flags, text)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() != QEvent.MouseButtonRelease or event.button() != Qt.LeftButton:
+            return super().editorEvent(event, model, option, index)
+
+        opportunity = index.data(OpportunityRole)
+        if opportunity is None:
+            return False
+
+        layout = self.layout_card(opportunity, option.rect, option.font, index.data(CardDescriptionRole))
+        for rect, action, payload in layout.hits:
+            if not rect.contains(event.pos()):
+                continue
+
+            if action == "status":
+                view = self.parent()
+                self.status_clicked.emit(opportunity, view.viewport().mapToGlobal(rect.bottomLeft()))
+            elif action == "comments":
+                self.comments_clicked.emit(opportunity)
+            elif action == "details":
+                self.details_clicked.emit(opportunity)
+            elif action == "attachment":
+                self.attachment_clicked.emit(payload)
+            elif action == "description":
+                opportunity_id = str(opportunity.id)
+                if opportunity_id in self.expanded:
+                    self.expanded.discard(opportunity_id)
+                else:
+                    self.expanded.add(opportunity_id)
+                self.sizeHintChanged.emit(index)
+            return True
+
+        return super().editorEvent(event, model, option, index)
@@ -5,7 +5,9 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtGui import QShowEvent, QCloseEvent
 from app.database.connection import SessionLocal
-from app.models.models import User, Opportunity
+from app.models.models import User
+from app.database.queries import load_profile_statistics
+from app.ui.db_worker import get_database_worker
 from app.auth.auth_handler import hash_pin, verify_pin
 from sqlalchemy import update
 import traceback
@@ -18,6 +20,7 @@ class ProfileWidget(QWidget):
         self.current_user = current_user
         self.fields: Dict[str, Union[QLineEdit, QComboBox]] = {}
         self.stats_labels: Dict[str, QLabel] = {}
+        self.db_worker = get_database_worker()
         self.initUI()
         
     def showEvent(self, a0: QShowEvent) -> None:
@@ -370,123 +373,58 @@ class ProfileWidget(QWidget):
         self.fields[name] = field
             
     def load_statistics(self) -> None:
-        """Load and display user statistics"""
-        with SessionLocal() as db:
-            try:
-                # Get opportunities created by the user
-                created_opps = db.query(Opportunity).filter(
-                    Opportunity.creator_id == self.current_user.id
-                ).all()
-                print(f"Created opportunities: {len(created_opps)}")
-                
-                # Get opportunities accepted by the user
-                accepted_opps = db.query(Opportunity).filter(
-                    Opportunity.acceptor_id == self.current_user.id
-                ).all()
-                print(f"Accepted opportunities: {len(accepted_opps)}")
-                
-                # Get active opportunities (both created and accepted)
-                active_opps = db.query(Opportunity).filter(
-                    (Opportunity.creator_id == self.current_user.id) | 
-                    (Opportunity.acceptor_id == self.current_user.id),
-                    Opportunity.status.ilike("new") |
-                    Opportunity.status.ilike("in progress") |
-                    Opportunity.status.ilike("needs info")
-                ).all()
-                print(f"Active opportunities: {len(active_opps)}")
-                
-                # Get completed opportunities with case-insensitive comparison
-                completed_opps = db.query(Opportunity).filter(
-                    (Opportunity.creator_id == self.current_user.id) | 
-                    (Opportunity.acceptor_id == self.current_user.id),
-                    Opportunity.status.ilike("completed")
-                ).all()
-                
-                # Debug logging for completed opportunities
-                print(f"Completed opportunities found: {len(completed_opps)}")
-                for opp in completed_opps:
-                    print(f"Completed opp - ID: {opp.id}, Status: {opp.status}, Creator: {opp.creator_id}, Acceptor: {opp.acceptor_id}")
-                
-                # Calculate statistics
-                total_created = len(created_opps)
-                total_accepted = len(accepted_opps)
-                total_active = len(active_opps)
-                total_completed = len(completed_opps)
-                
-                # Calculate average response time for opportunities
-                response_times = []
-                
-                # Include both accepted and completed opportunities for response time calculation
-                all_handled_opps = []
-                seen_ids = set()  # To avoid counting the same opportunity twice
-                
-                for opp in accepted_opps + completed_opps:
-                    if opp.id not in seen_ids:
-                        all_handled_opps.append(opp)
-                        seen_ids.add(opp.id)
-                
-                print(f"Total handled opportunities for response time: {len(all_handled_opps)}")
-                
-                for opp in all_handled_opps:
-                    # Skip if user is the creator (we want response time for tickets they handle)
-                    if opp.creator_id == self.current_user.id:
-                        continue
-                        
-                    # Calculate response time based on available timestamps
-                    created_time = opp.created_at
-                    response_time = None
-                    
-                    # Try different timestamps in order of preference
-                    if opp.started_at and created_time:
-                        response_time = opp.started_at - created_time
-                        print(f"Using started_at for ticket {opp.id}")
-                    elif opp.accepted_at and created_time:
-                        response_time = opp.accepted_at - created_time
-                        print(f"Using accepted_at for ticket {opp.id}")
-                    elif opp.status.lower() == "completed" and opp.completed_at and created_time:
-                        response_time = opp.completed_at - created_time
-                        print(f"Using completed_at for ticket {opp.id}")
-                    
-                    if response_time:
-                        hours = response_time.total_seconds() / 3600
-                        print(f"Response time for ticket {opp.id}: {hours:.1f} hours")
-                        response_times.append(hours)
-                
-                # Calculate average response time
-                if response_times:
-                    avg_response_time = sum(response_times) / len(response_times)
-                    print(f"Average response time: {avg_response_time:.1f} hours")
-                else:
-                    avg_response_time = 0
-                    print("No response times available")
-                
-                # Update statistics labels with better formatting
-                self.stats_labels['total_opportunities'].setText(f"{total_created:,}")
-                self.stats_labels['accepted_opportunities'].setText(f"{total_accepted:,}")
-                self.stats_labels['active_opportunities'].setText(f"{total_active:,}")
-                self.stats_labels['completed_opportunities'].setText(f"{total_completed:,}")
-                
-                # Format response time more readably
-                if avg_response_time > 24:
-                    days = int(avg_response_time / 24)
-                    hours = int(avg_response_time % 24)
-                    self.stats_labels['avg_response_time'].setText(f"{days:,}d {hours}h")
-                else:
-                    self.stats_labels['avg_response_time'].setText(f"{avg_response_time:.1f} hours")
-                
-                # Update last login and account creation time if available
-                if self.current_user.last_login:
-                    self.stats_labels['last_login'].setText(
-                        self.current_user.last_login.strftime("%Y-%m-%d %H:%M:%S")
-                    )
-                if self.current_user.created_at:
-                    self.stats_labels['account_created'].setText(
-                        self.current_user.created_at.strftime("%Y-%m-%d %H:%M:%S")
-                    )
-            except Exception as e:
-                print(f"Error loading statistics: {str(e)}")
-                print(traceback.format_exc())
-                
+        """Load user statistics in the background and display them when they arrive"""
+        user_id = self.current_user.id
+        self.db_worker.submit(
+            (id(self), "statistics"),
+            lambda db: load_profile_statistics(db, user_id),
+            self.show_statistics,
+            lambda error: print(f"Error loading statistics: {error}")
+        )
+    
+    def show_statistics(self, stats) -> None:
+        """Display a load_profile_statistics result"""
+        try:
+            total_created = stats["created"]
+            total_accepted = stats["accepted"]
+            total_active = stats["active"]
+            total_completed = stats["completed"]
+            
+            # Average response time in hours
+            if stats["avg_response"] is not None:
+                avg_response_time = stats["avg_response"].total_seconds() / 3600
+                print(f"Average response time: {avg_response_time:.1f} hours")
+            else:
+                avg_response_time = 0
+                print("No response times available")
+            
+            # Update statistics labels with better formatting
+            self.stats_labels['total_opportunities'].setText(f"{total_created:,}")
+            self.stats_labels['accepted_opportunities'].setText(f"{total_accepted:,}")
+            self.stats_labels['active_opportunities'].setText(f"{total_active:,}")
+            self.stats_labels['completed_opportunities'].setText(f"{total_completed:,}")
+            
+            # Format response time more readably
+            if avg_response_time > 24:
+                days = int(avg_response_time / 24)
+                hours = int(avg_response_time % 24)
+                self.stats_labels['avg_response_time'].setText(f"{days:,}d {hours}h")
+            else:
+                self.stats_labels['avg_response_time'].setText(f"{avg_response_time:.1f} hours")
+            
+            # Update last login and account creation time if available
+            if self.current_user.last_login:
+                self.stats_labels['last_login'].setText(
+                    self.current_user.last_login.strftime("%Y-%m-%d %H:%M:%S")
+                )
+            if self.current_user.created_at:
+                self.stats_labels['account_created'].setText(
+                    self.current_user.created_at.strftime("%Y-%m-%d %H:%M:%S")
+                )
+        except Exception as e:
+            print(f"Error loading statistics: {str(e)}")
+            print(traceback.format_exc())
+    
     def save_changes(self) -> None:
         """Save changes to user profile"""
         try:
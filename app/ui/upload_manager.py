@@ -0,0 +1,165 @@
+"""
+Background attachment uploads for the opportunity form.
+
+Each attachment is hashed and stored on a QThreadPool as soon as it is
+picked, a few at a time, while the user keeps filling in the form.
+Progress and results are delivered on the UI thread through Qt signals.
+A failed upload is retried with exponential backoff; once the retries are
+used up the file is copied to local storage instead, as add_attachment
+used to do.
+
+Upload functions run on worker threads and must not touch any widget.
+"""
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from app.config import STORAGE_DIR
+from app.services.supabase_storage import SupabaseStorageService
+from typing import Any, Callable, Dict, Optional
+import mimetypes
+import os
+import shutil
+import threading
+import time
+import traceback
+
+# Concurrent transfers; the rest wait in the pool's queue
+MAX_UPLOADS = 3
+# Attempts per file before falling back to local storage
+MAX_ATTEMPTS = 3
+# Delay before the first retry (seconds), doubled for each further one
+RETRY_DELAY = 1.0
+
+def store_locally(file_path: str, file_hash: str) -> str:
+    """Copy a file into local storage; returns its 'local/...' storage path"""
+    file_name = os.path.basename(file_path)
+    local_dir = os.path.join(STORAGE_DIR, file_hash[:2], file_hash[2:4])
+    os.makedirs(local_dir, exist_ok=True)
+    shutil.copy2(file_path, os.path.join(local_dir, file_name))
+    return os.path.join('local', file_hash[:2], file_hash[2:4], file_name)
+
+class UploadTask(QRunnable):
+    """Hashes, uploads (with retries) and describes one attachment"""
+
+    def __init__(self, manager: "UploadManager", upload_id: int, file_path: str):
+        super().__init__()
+        self.manager = manager
+        self.upload_id = upload_id
+        self.file_path = file_path
+        self.last_percent = -1
+
+    def report(self, status: str, percent: int) -> None:
+        # Only emit when something visible changes; chunks arrive every 64 KB
+        if percent != self.last_percent or percent < 0:
+            self.last_percent = percent
+            self.manager.upload_progress.emit(self.upload_id, status, percent)
+
+    def run(self):
+        if not self.manager.is_active(self.upload_id):
+            return
+
+        try:
+            self.report("Hashing", 0)
+            file_hash = SupabaseStorageService.calculate_file_hash(self.file_path)
+
+            storage_path = None
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                if not self.manager.is_active(self.upload_id):
+                    return
+                storage_path = self.manager.store(
+                    self.file_path, file_hash,
+                    lambda sent, total: self.report("Uploading", int(sent * 100 / total) if total else 100)
+                )
+                if storage_path:
+                    break
+                if attempt < MAX_ATTEMPTS:
+                    delay = RETRY_DELAY * 2 ** (attempt - 1)
+                    self.report(f"Retrying in {delay:.0f}s", -1)
+                    time.sleep(delay)
+
+            # Supabase is unreachable: keep a local copy instead
+            if not storage_path:
+                storage_path = store_locally(self.file_path, file_hash)
+
+            attachment = {
+                'path': self.file_path,
+                'storage_path': storage_path,
+                'hash': file_hash,
+                'name': os.path.basename(self.file_path),
+                'size': os.path.getsize(self.file_path),
+                'mime_type': mimetypes.guess_type(self.file_path)[0] or 'application/octet-stream'
+            }
+        except Exception as e:
+            print(f"Error uploading {self.file_path}: {str(e)}")
+            print(traceback.format_exc())
+            self.manager.task_failed.emit(self.upload_id, str(e))
+        else:
+            self.manager.task_finished.emit(self.upload_id, attachment)
+
+class UploadManager(QObject):
+    """Runs attachment uploads off the UI thread
+
+    upload_progress reports (upload id, status, percent or -1); results and
+    errors go to upload_finished / upload_failed, on the UI thread and only
+    for uploads that were not cancelled.
+    """
+    upload_progress = pyqtSignal(int, str, int)    # upload id, status, percent
+    upload_finished = pyqtSignal(int, object)      # upload id, attachment dict
+    upload_failed = pyqtSignal(int, str)           # upload id, error
+    task_finished = pyqtSignal(int, object)
+    task_failed = pyqtSignal(int, str)
+
+    def __init__(self, store: Callable[[str, str, Callable[[int, int], None]], Optional[str]],
+                 max_uploads: int = MAX_UPLOADS, parent=None):
+        """
+        Args:
+            store: Called as store(file_path, file_hash, progress) on a worker
+                thread; returns the storage path, or None if the upload failed
+            max_uploads: Concurrent transfers
+        """
+        super().__init__(parent)
+        self.store = store
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_uploads)
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._active: Dict[int, str] = {}
+        self.task_finished.connect(self._on_finished)
+        self.task_failed.connect(self._on_failed)
+
+    def start(self, file_path: str) -> int:
+        """Queue a file for upload; returns its upload id"""
+        with self._lock:
+            self._next_id += 1
+            upload_id = self._next_id
+            self._active[upload_id] = file_path
+        self.pool.start(UploadTask(self, upload_id, file_path))
+        return upload_id
+
+    def cancel(self, upload_id: int) -> None:
+        """Forget an upload; its result, if any, is dropped"""
+        with self._lock:
+            self._active.pop(upload_id, None)
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            self._active.clear()
+
+    def is_active(self, upload_id: int) -> bool:
+        with self._lock:
+            return upload_id in self._active
+
+    def pending_count(self) -> int:
+        """Uploads still running or queued"""
+        with self._lock:
+            return len(self._active)
+
+    def _take(self, upload_id: int) -> bool:
+        with self._lock:
+            return self._active.pop(upload_id, None) is not None
+
+    def _on_finished(self, upload_id: int, attachment: Any):
+        if self._take(upload_id):
+            self.upload_finished.emit(upload_id, attachment)
+
+    def _on_failed(self, upload_id: int, error: str):
+        if self._take(upload_id):
+            self.upload_failed.emit(upload_id, error)
@@ -1,6 +1,6 @@
 import sys
 import subprocess
-import pkg_resources
+from importlib import metadata
 from PyQt5.QtWidgets import QMessageBox, QDialog, QVBoxLayout, QLabel, QProgressBar, QPushButton
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 
@@ -120,11 +120,12 @@ def check_dependencies():
     """Check if all required packages are installed and install missing ones."""
     missing_packages = []
     
-    # Check installed packages
-    installed_packages = {pkg.key for pkg in pkg_resources.working_set}
-    
+    # Check installed packages (importlib.metadata looks each one up directly,
+    # pkg_resources scanned and imported far more at startup)
     for package in REQUIRED_PACKAGES:
-        if package not in installed_packages:
+        try:
+            metadata.distribution(package)
+        except metadata.PackageNotFoundError:
             missing_packages.append(package)
     
     if missing_packages:
@@ -163,8 +164,6 @@ def check_dependencies():
             result = installer.exec_()
             
             if result == QDialog.Accepted:
-                # Refresh the working set to include newly installed packages
-                pkg_resources.working_set = pkg_resources.WorkingSet()
                 return True
             return False
             
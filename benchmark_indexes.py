@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+"""
+Benchmark for the migration 011 indexes and the migration 012 status
+normalization.
+
+Seeds a scratch schema with a large ticket history, captures the SQL the
+app's hot read paths send (toolbar, dashboard, portal, statistics) and
+reports EXPLAIN ANALYZE timings before and after applying the migrations
+to the scratch copy. The real tables are never touched, but run it against
+a local database:
+
+    python benchmark_indexes.py [--tickets 100000] [--keep]
+"""
+import argparse
+import json
+import os
+import sys
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from app.database.connection import DATABASE_URL
+from app.database.queries import (load_member_statistics, load_portal_page,
+                                  load_profile_statistics, load_update_fingerprint)
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'migrations'))
+import run_migration_011
+import run_migration_012
+from migration_sql import migration_statements
+
+MIGRATIONS = [run_migration_011, run_migration_012]
+
+SCHEMA = "index_benchmark"
+TABLES = ["users", "vehicles", "opportunities", "notifications", "files", "comments"]
+
+# Share of seeded tickets per status, with the mixed spellings old rows have
+STATUS_MIX = [("completed", 0.80), ("Completed", 0.07), ("in progress", 0.05),
+              ("In Progress", 0.02), ("new", 0.03), ("New", 0.01), ("needs info", 0.02)]
+
+def seed(conn, tickets, users, notifications_per_ticket, unread_share):
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    for table in TABLES:
+        conn.execute(text(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING DEFAULTS)"))
+        conn.execute(text(f"ALTER TABLE {SCHEMA}.{table} ADD PRIMARY KEY (id)"))
+
+    conn.execute(text(f"""
+        INSERT INTO {SCHEMA}.users (id, username, email, pin, first_name, last_name,
+                                    team, department, role, is_active, created_at)
+        SELECT gen_random_uuid(), 'user' || n, 'user' || n || '@example.com', 'x',
+               'First' || n, 'Last' || n, 'Team ' || (n % 5), 'SI', 'user', true, now()
+        FROM generate_series(1, :users) AS n
+    """), {"users": users})
+
+    # Cumulative status thresholds for picking a status from random()
+    cases = []
+    total = 0.0
+    for status, share in STATUS_MIX:
+        total += share
+        cases.append(f"WHEN r < {total:.4f} THEN '{status}'")
+    conn.execute(text(f"""
+        WITH u AS (SELECT array_agg(id) AS ids FROM {SCHEMA}.users),
+             t AS (
+                 SELECT n, random() AS r,
+                        now() - (random() * interval '1095 days') AS created_at
+                 FROM generate_series(1, :tickets) AS n
+             )
+        INSERT INTO {SCHEMA}.opportunities (id, title, description, status, creator_id,
+                                            acceptor_id, created_at, updated_at,
+                                            started_at, completed_at, systems)
+        SELECT gen_random_uuid(), 'SI-' || lpad(n::text, 6, '0'), repeat('Vehicle details ', 20),
+               CASE {' '.join(cases)} ELSE 'completed' END,
+               u.ids[1 + (n * 7) % :users],
+               CASE WHEN r < 0.96 THEN u.ids[1 + (n * 13) % :users] END,
+               created_at, created_at + interval '2 days',
+               CASE WHEN r < 0.96 THEN created_at + interval '3 hours' END,
+               CASE WHEN r < 0.87 THEN created_at + interval '2 days' END,
+               '[]'::jsonb
+        FROM t, u
+    """), {"tickets": tickets, "users": users})
+
+    conn.execute(text(f"""
+        WITH u AS (SELECT array_agg(id) AS ids FROM {SCHEMA}.users)
+        INSERT INTO {SCHEMA}.notifications (id, user_id, opportunity_id, type, message, read, created_at)
+        SELECT gen_random_uuid(), u.ids[1 + (k * 31 + o.n) % :users], o.id, 'new_opportunity',
+               'New opportunity created: ' || o.title, random() >= :unread, o.created_at
+        FROM (SELECT id, title, created_at, row_number() OVER () AS n FROM {SCHEMA}.opportunities) AS o,
+             generate_series(1, :per_ticket) AS k, u
+    """), {"users": users, "per_ticket": notifications_per_ticket, "unread": unread_share})
+
+    # The comments table ships with its index (migration 013), so it is not part of the comparison
+    conn.execute(text(f"""
+        INSERT INTO {SCHEMA}.comments (id, opportunity_id, user_id, user_name, text, created_at)
+        SELECT gen_random_uuid(), o.id, o.creator_id, 'First Last', 'Comment ' || k, o.created_at + k * interval '1 hour'
+        FROM (SELECT id, creator_id, created_at FROM {SCHEMA}.opportunities WHERE random() < :commented) AS o,
+             generate_series(1, 3) AS k
+    """), {"commented": 0.2})
+    conn.execute(text(f"CREATE INDEX ON {SCHEMA}.comments (opportunity_id, created_at, id)"))
+
+    for table in TABLES:
+        conn.execute(text(f"ANALYZE {SCHEMA}.{table}"))
+
+def scenarios(user_id):
+    """Hot read paths, each a callable taking a session"""
+    # Imported here: the dashboard and toolbar modules pull in PyQt
+    from app.ui.dashboard import DashboardWidget
+    from app.ui.main import FloatingToolbar
+
+    def dashboard(filter_name, **extra):
+        filters = {"filter": filter_name, "user_id": user_id, "my_tickets": "Both",
+                   "advanced": False, "status": "All", "assignment": "All",
+                   "from_date": None, "to_date": None}
+        filters.update(extra)
+        return lambda db: (DashboardWidget.get_opportunity_versions(db, filters, 50),
+                           DashboardWidget.get_filtered_opportunities(db, filters, 0, 50))
+
+    return [
+        ("toolbar fingerprint", lambda db: load_update_fingerprint(db, user_id)),
+        ("toolbar full fetch", lambda db: FloatingToolbar.fetch_updates(db, user_id)),
+        ("dashboard active page", dashboard("active_tickets")),
+        ("dashboard new page", dashboard("new")),
+        ("dashboard my tickets", dashboard("my_tickets")),
+        ("portal first page", lambda db: load_portal_page(db)),
+        ("member statistics", lambda db: load_member_statistics(db)),
+        ("profile statistics", lambda db: load_profile_statistics(db, user_id)),
+    ]
+
+def capture_statements(Session, scenario):
+    """Run a scenario and return the SELECT statements it sent"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    db = Session()
+    event.listen(db.get_bind(), "before_cursor_execute", record)
+    try:
+        scenario(db)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", record)
+        db.close()
+    return statements
+
+def plan_nodes(plan):
+    """Scan node types in a JSON plan, e.g. ['Index Only Scan', 'Seq Scan']"""
+    nodes = []
+    if "Scan" in plan["Node Type"]:
+        nodes.append(plan["Node Type"])
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+def explain(engine, statements, runs):
+    """Best total execution time (ms) over runs, plus the scan nodes used"""
+    best = None
+    nodes = []
+    with engine.connect() as conn:
+        for _ in range(runs):
+            total = 0.0
+            nodes = []
+            for statement, parameters in statements:
+                row = conn.exec_driver_sql("EXPLAIN (ANALYZE, FORMAT JSON) " + statement, parameters).scalar()
+                result = row[0] if isinstance(row, list) else json.loads(row)[0]
+                total += result["Execution Time"]
+                nodes.extend(plan_nodes(result["Plan"]))
+            best = total if best is None else min(best, total)
+        conn.rollback()
+    return best, sorted(set(nodes))
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE the hot queries before and after migrations 011 and 012")
+    parser.add_argument("--tickets", type=int, default=100000, help="Tickets to seed")
+    parser.add_argument("--users", type=int, default=200, help="Users to seed")
+    parser.add_argument("--notifications-per-ticket", type=int, default=5, help="Notification rows per ticket")
+    parser.add_argument("--unread", type=float, default=0.02, help="Share of unread notifications")
+    parser.add_argument("--runs", type=int, default=3, help="EXPLAIN runs per query; the best is reported")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema afterwards")
+    parser.add_argument("--allow-remote", action="store_true", help="Allow a non-local DATABASE_URL")
+    args = parser.parse_args()
+
+    engine = create_engine(DATABASE_URL, connect_args={"options": f"-csearch_path={SCHEMA}"})
+    if engine.url.host not in ("localhost", "127.0.0.1", None) and not args.allow_remote:
+        sys.exit(f"Refusing to seed {args.tickets} tickets into {engine.url.host}; "
+                 "point DATABASE_URL at a local database or pass --allow-remote")
+    Session = sessionmaker(bind=engine)
+
+    print(f"Seeding {SCHEMA} with {args.tickets} tickets...")
+    with engine.begin() as conn:
+        seed(conn, args.tickets, args.users, args.notifications_per_ticket, args.unread)
+        user_id = str(conn.execute(text(f"SELECT id FROM {SCHEMA}.users ORDER BY username LIMIT 1")).scalar())
+
+    try:
+        captured = [(name, capture_statements(Session, scenario)) for name, scenario in scenarios(user_id)]
+        before = {name: explain(engine, statements, args.runs) for name, statements in captured}
+
+        # The migrations' unqualified table names resolve to the scratch schema
+        with engine.connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            for migration in MIGRATIONS:
+                for statement in migration_statements(migration.MIGRATION_FILE):
+                    conn.exec_driver_sql(statement)
+            # Vacuum after the status rewrite so index-only scans stay possible
+            for table in TABLES:
+                conn.exec_driver_sql(f"VACUUM ANALYZE {SCHEMA}.{table}")
+
+        print("Index benchmark (EXPLAIN ANALYZE execution time, best of runs)")
+        print("--------------------------------------------------------------")
+        for name, statements in captured:
+            after = explain(engine, statements, args.runs)
+            print(f"  {name:<22} statements={len(statements):<2} before={before[name][0]:>9.2f}ms "
+                  f"after={after[0]:>8.2f}ms  {', '.join(before[name][1])} -> {', '.join(after[1])}")
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+"""
+Load test for the websocket notification hub.
+
+Starts the hub in-process (without the database listener), connects
+thousands of local websocket clients and measures broadcast delivery
+latency. The serial fan-out the hub used to do is compared against the
+queued concurrent fan-out, and a final round adds clients that never
+read to show they are evicted without delaying everyone else:
+
+    python benchmark_notification_fanout.py [--clients 2000] [--slow-clients 20]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import statistics
+import threading
+import time
+import uuid
+
+import uvicorn
+import websockets
+
+from app.services.notification_server import create_app
+from app.services.notification_service import notification_manager
+
+# Receive buffer of clients that never read (bytes)
+SLOW_CLIENT_BUFFER = 16384
+
+class HubThread(threading.Thread):
+    """Runs the hub's uvicorn server on its own event loop"""
+
+    def __init__(self, port):
+        super().__init__(daemon=True)
+        config = uvicorn.Config(create_app(listen_database=False), host="127.0.0.1",
+                                port=port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.loop = None
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.server.serve())
+
+    def call(self, coroutine):
+        """Run a coroutine on the hub loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+async def serial_broadcast(data):
+    """The old fan-out: await each connection's send in turn"""
+    for connections in list(notification_manager.active_connections.values()):
+        for websocket in list(connections):
+            await websocket.send_json(data)
+
+async def queued_broadcast(data):
+    await notification_manager.broadcast(data)
+
+class Clients:
+    """Local websocket clients; fast ones record when each message arrives"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.url = f"ws://{host}:{port}/ws/notifications"
+        self.fast = []
+        self.slow = []
+        self.received = {}  # seq -> list of delivery latencies (s)
+        self.seq = 0
+
+    async def connect(self, count, slow=False, concurrency=200):
+        limit = asyncio.Semaphore(concurrency)
+
+        async def open_one():
+            async with limit:
+                if not slow:
+                    return await websockets.connect(f"{self.url}/{uuid.uuid4()}", max_size=None)
+
+                return await self._open_slow()
+
+        connections = await asyncio.gather(*(open_one() for _ in range(count)))
+        if slow:
+            self.slow.extend(connections)
+        else:
+            for connection in connections:
+                self.fast.append(connection)
+                asyncio.create_task(self._read(connection))
+
+    async def trim(self, count):
+        """Disconnect fast clients until count remain"""
+        extra, self.fast = self.fast[count:], self.fast[:count]
+        await asyncio.gather(*(connection.close() for connection in extra))
+        while sum(len(c) for c in list(notification_manager.active_connections.values())) > len(self.fast):
+            await asyncio.sleep(0.05)
+
+    async def _open_slow(self):
+        # A bare socket that completes the websocket upgrade and then never
+        # reads; its small fixed receive buffer makes the hub's sends back up
+        # after a few messages
+        sock = socket.socket()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SLOW_CLIENT_BUFFER)
+        sock.setblocking(False)
+        loop = asyncio.get_running_loop()
+        await loop.sock_connect(sock, (self.host, self.port))
+        key = base64.b64encode(os.urandom(16)).decode()
+        request = (f"GET /ws/notifications/{uuid.uuid4()} HTTP/1.1\r\n"
+                   f"Host: {self.host}:{self.port}\r\n"
+                   "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                   f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n")
+        await loop.sock_sendall(sock, request.encode())
+        response = b""
+        while b"\r\n\r\n" not in response:
+            response += await loop.sock_recv(sock, 1)
+        if not response.startswith(b"HTTP/1.1 101"):
+            raise RuntimeError(f"Slow client upgrade failed: {response!r}")
+        return sock
+
+    async def _read(self, connection):
+        try:
+            async for message in connection:
+                data = json.loads(message)
+                self.received.setdefault(data["seq"], []).append(time.perf_counter() - data["sent"])
+        except websockets.ConnectionClosed:
+            pass
+
+    async def wait_for(self, seq, timeout):
+        deadline = time.perf_counter() + timeout
+        while len(self.received.get(seq, ())) < len(self.fast) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.005)
+        return len(self.received.get(seq, ()))
+
+async def run_round(name, hub, clients, broadcast, messages, payload, timeout):
+    broadcast_times = []
+    latencies = []
+    delivered = 0
+    sent = 0
+    for _ in range(messages):
+        clients.seq += 1
+        seq = clients.seq
+        data = {"seq": seq, "sent": time.perf_counter(), "pad": payload}
+        start = time.perf_counter()
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, hub.call, asyncio.wait_for(broadcast(data), timeout))
+        except asyncio.TimeoutError:
+            print(f"  {name:<12} broadcast {sent + 1} stalled for {timeout:.0f}s, giving up")
+            break
+        sent += 1
+        broadcast_times.append(time.perf_counter() - start)
+        delivered += await clients.wait_for(seq, timeout)
+        latencies.extend(clients.received.get(seq, ()))
+
+    if not latencies:
+        return
+    expected = sent * len(clients.fast)
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0
+    print(f"  {name:<12} clients={len(clients.fast) + len(clients.slow):<6} delivered={delivered}/{expected} "
+          f"broadcast={statistics.mean(broadcast_times) * 1000:.1f}ms "
+          f"p50={statistics.median(latencies) * 1000:.1f}ms p99={p99 * 1000:.1f}ms "
+          f"max={latencies[-1] * 1000:.1f}ms evicted={notification_manager.evicted_count}")
+
+def raise_file_limit(needed):
+    """Raise the open file limit for the clients' sockets; None where there is none (Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = min(hard, max(soft, needed))
+    if target > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    return target
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def run(args):
+    hub = HubThread(free_port())
+    hub.start()
+    while not hub.server.started:
+        await asyncio.sleep(0.05)
+
+    clients = Clients("127.0.0.1", hub.server.config.port)
+    payload = "x" * args.payload_bytes
+
+    start = time.perf_counter()
+    await clients.connect(args.clients)
+    print(f"Connected {args.clients} clients in {time.perf_counter() - start:.1f}s")
+
+    if not args.skip_legacy:
+        await run_round("serial", hub, clients, serial_broadcast, args.messages, payload, args.timeout)
+    await run_round("queued", hub, clients, queued_broadcast, args.messages, payload, args.timeout)
+
+    if args.slow_clients:
+        # Filling the hub's socket buffers takes megabytes per client, so
+        # the slow rounds run with fewer readers to stay quick
+        await clients.trim(args.slow_round_clients)
+        await clients.connect(args.slow_clients, slow=True)
+        # Enough traffic to fill the slow clients' socket buffers and send queues
+        slow_payload = "x" * args.slow_payload_bytes
+        if not args.skip_legacy:
+            await run_round("serial+slow", hub, clients, serial_broadcast, args.slow_messages,
+                            slow_payload, args.timeout)
+        await run_round("queued+slow", hub, clients, queued_broadcast, args.slow_messages,
+                        slow_payload, args.timeout)
+
+    for connection in clients.fast:
+        connection.transport.abort()
+    for sock in clients.slow:
+        sock.close()
+    hub.server.should_exit = True
+    hub.join(timeout=5)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure notification hub broadcast fan-out")
+    parser.add_argument("--clients", type=int, default=2000, help="Reading websocket clients")
+    parser.add_argument("--slow-clients", type=int, default=20, help="Clients that never read")
+    parser.add_argument("--messages", type=int, default=20, help="Broadcasts per round")
+    parser.add_argument("--slow-messages", type=int, default=200, help="Broadcasts per slow client round")
+    parser.add_argument("--slow-round-clients", type=int, default=200,
+                        help="Reading clients kept for the slow client rounds")
+    parser.add_argument("--payload-bytes", type=int, default=4096, help="Padding per message")
+    parser.add_argument("--slow-payload-bytes", type=int, default=65536,
+                        help="Padding per message in the slow client rounds")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="Seconds to wait for each broadcast and its delivery")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only run the queued fan-out")
+    args = parser.parse_args()
+
+    # Client and server end of every connection live in this process
+    limit = raise_file_limit(2 * (args.clients + args.slow_clients) + 100)
+    print(f"Notification fan-out benchmark (open file limit {limit or 'not adjustable'})")
+    print("----------------------------------")
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
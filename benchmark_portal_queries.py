@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Benchmark for the management portal refresh.
+
+Counts the SQL statements (and wall time) the portal sends to the database
+for one refresh, comparing the old per-row lookups against the batched
+loaders in app.database.queries. The opportunities table and the team
+statistics are measured separately. Run it against a copy of the database:
+
+    python benchmark_portal_queries.py [--runs 3]
+"""
+import argparse
+import time
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.database.connection import SessionLocal, get_engine
+from app.database.queries import (load_portal_page, load_portal_filter_values,
+                                  load_member_statistics, load_team_summary)
+from app.models.models import User, Opportunity
+
+class StatementCounter:
+    """Counts statements executed on an engine while active"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+@contextmanager
+def count_statements():
+    counter = StatementCounter()
+    event.listen(get_engine(), "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", counter)
+
+def legacy_load_opportunities(db):
+    """The pre-batching portal loader: one user lookup per row, three passes"""
+    opportunities = db.query(Opportunity).all()
+
+    def names(opp):
+        creator = db.query(User).filter(User.id == opp.creator_id).first()
+        assigned_to = "Unassigned"
+        if opp.acceptor_id:
+            acceptor = db.query(User).filter(User.id == opp.acceptor_id).first()
+            if acceptor:
+                assigned_to = f"{acceptor.first_name} {acceptor.last_name}"
+        return creator.username if creator else "Unknown", assigned_to
+
+    # Filtering pass, dropdown pass and table pass
+    for _ in range(3):
+        for opp in opportunities:
+            names(opp)
+    return opportunities
+
+def batched_load_opportunities(db):
+    """The current portal loader: one page plus the dropdown values"""
+    opportunities, _ = load_portal_page(db)
+    load_portal_filter_values(db)
+    return opportunities
+
+def legacy_load_statistics(db):
+    """The pre-aggregate statistics: per-member queries and Python-side averages"""
+    members = db.query(User).all()
+    for member in members:
+        member_filter = (Opportunity.creator_id == member.id) | (Opportunity.acceptor_id == member.id)
+        db.query(Opportunity).filter(member_filter, Opportunity.status.in_(["new", "in progress"])).count()
+        db.query(Opportunity).filter(member_filter, Opportunity.status.ilike("completed")).count()
+        completed = db.query(Opportunity).filter(
+            member_filter,
+            Opportunity.status.ilike("completed"),
+            Opportunity.completed_at.isnot(None),
+            Opportunity.created_at.isnot(None)
+        ).all()
+        [(opp.completed_at - opp.created_at).total_seconds() for opp in completed]
+
+    db.query(Opportunity).filter(
+        Opportunity.status.ilike("in progress") | Opportunity.status.ilike("new")
+    ).count()
+    db.query(User).filter(User.is_active == True).count()
+    completed = db.query(Opportunity).filter(
+        Opportunity.status.ilike("completed"),
+        Opportunity.completed_at.isnot(None),
+        Opportunity.created_at.isnot(None)
+    ).all()
+    [(opp.completed_at - opp.created_at).total_seconds() for opp in completed]
+    db.query(Opportunity).count()
+    return members
+
+def aggregate_load_statistics(db):
+    """The current statistics: one GROUP BY for members, one aggregate for the cards"""
+    members = load_member_statistics(db)
+    load_team_summary(db)
+    return members
+
+def run_benchmark(name, loader, runs):
+    statements = []
+    timings = []
+    rows = 0
+    for _ in range(runs):
+        db = SessionLocal()
+        try:
+            with count_statements() as counter:
+                start = time.perf_counter()
+                rows = len(loader(db))
+                timings.append(time.perf_counter() - start)
+            statements.append(counter.count)
+        finally:
+            db.close()
+
+    print(f"  {name:<10} rows={rows:<7} statements/refresh={max(statements):<7} "
+          f"best={min(timings) * 1000:.1f}ms avg={sum(timings) / len(timings) * 1000:.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Count SQL statements per management portal refresh")
+    parser.add_argument("--runs", type=int, default=3, help="Refreshes to run per loader")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only run the batched loaders")
+    args = parser.parse_args()
+
+    print("Management portal refresh benchmark")
+    print("-----------------------------------")
+    print("Opportunities table")
+    if not args.skip_legacy:
+        run_benchmark("legacy", legacy_load_opportunities, args.runs)
+    run_benchmark("batched", batched_load_opportunities, args.runs)
+
+    print("Team statistics")
+    if not args.skip_legacy:
+        run_benchmark("legacy", legacy_load_statistics, args.runs)
+    run_benchmark("aggregate", aggregate_load_statistics, args.runs)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Cold-start benchmark: time from launching the interpreter to the first
+paint of the login screen (AuthWidget).
+
+Each run starts a fresh interpreter with `-X importtime`, builds the
+MainWindow the way main() does and exits on the auth widget's first paint
+event. The report gives the median time per startup phase, the slowest
+imports and which heavy modules were already loaded when the login screen
+appeared (they should all be imported on first use):
+
+    python benchmark_startup.py [--runs 5] [--top 15]
+
+Headless machines can set QT_QPA_PLATFORM=offscreen.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules that should not be imported before the login screen is shown
+WATCHED_MODULES = ["app.ui.dashboard", "app.ui.management_portal", "app.ui.opportunity_form",
+                   "app.ui.profile", "supabase", "openpyxl", "fastapi", "uvicorn", "pkg_resources"]
+
+# Runs in the child interpreter; prints one JSON line of timestamps
+CHILD = """
+import json, sys, time
+phases = {"interpreter": time.time()}
+from PyQt5.QtCore import QEvent, QObject, QTimer, Qt
+from PyQt5.QtWidgets import QApplication
+import app.ui.main as main_module
+phases["imports"] = time.time()
+if SKIP_DEPENDENCY_CHECK:
+    main_module.check_dependencies = lambda: True
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and "first_paint" not in phases:
+            phases["first_paint"] = time.time()
+            QTimer.singleShot(0, application.quit)
+        return False
+
+QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
+QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
+application = QApplication(sys.argv)
+application.setStyle("Fusion")
+first_paint = FirstPaint()
+application.installEventFilter(first_paint)
+window = main_module.MainWindow()
+phases["main_window"] = time.time()
+window.auth.show()
+QTimer.singleShot(TIMEOUT_MS, application.quit)
+application.exec_()
+print("STARTUP " + json.dumps({"phases": phases,
+                               "loaded": [m for m in WATCHED if m in sys.modules]}))
+"""
+
+def run_once(timeout, skip_dependency_check):
+    """Launch one cold start; returns (phase timestamps, loaded watched modules, import times)"""
+    code = (CHILD.replace("SKIP_DEPENDENCY_CHECK", str(skip_dependency_check))
+                 .replace("TIMEOUT_MS", str(int(timeout * 1000)))
+                 .replace("WATCHED", json.dumps(WATCHED_MODULES)))
+    start = time.time()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, timeout=timeout + 30)
+    report = None
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP "):
+            report = json.loads(line[len("STARTUP "):])
+    if report is None or "first_paint" not in report["phases"]:
+        raise RuntimeError(f"Startup did not reach the login screen:\n{result.stderr[-2000:]}")
+
+    phases = report["phases"]
+    timings = {
+        "interpreter": phases["interpreter"] - start,
+        "imports": phases["imports"] - phases["interpreter"],
+        "main window": phases["main_window"] - phases["imports"],
+        "first paint": phases["first_paint"] - phases["main_window"],
+        "total": phases["first_paint"] - start,
+    }
+    return timings, report["loaded"], parse_importtime(result.stderr)
+
+def parse_importtime(stderr):
+    """Map module -> (self us, cumulative us, depth) from -X importtime output"""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return imports
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start to the first paint of the login screen")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to run; medians are reported")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for the login screen")
+    parser.add_argument("--skip-dependency-check", action="store_true",
+                        help="Don't run check_dependencies (it prompts when optional packages are missing)")
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.runs):
+        runs.append(run_once(args.timeout, args.skip_dependency_check))
+
+    print(f"Startup benchmark ({args.runs} cold starts, median)")
+    print("----------------------------------")
+    for phase in runs[0][0]:
+        values = [timings[phase] for timings, _, _ in runs]
+        print(f"  {phase:<12} {statistics.median(values) * 1000:>8.1f}ms  "
+              f"(min {min(values) * 1000:.1f}ms, max {max(values) * 1000:.1f}ms)")
+
+    _, loaded, imports = runs[-1]
+    total = sum(cumulative for _, cumulative, depth in imports.values() if depth == 0)
+    # Top-level imports and the modules they pulled in directly
+    shallow = {name: values for name, values in imports.items() if values[2] <= 1}
+    print(f"\nImport time {total / 1000:.1f}ms, slowest imports:")
+    for name, (_, cumulative, _) in sorted(shallow.items(), key=lambda item: -item[1][1])[:args.top]:
+        print(f"  {name:<40} {cumulative / 1000:>8.1f}ms")
+    print(f"\nHeavy modules loaded before the login screen: {', '.join(loaded) or 'none'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Benchmark for the shared Supabase storage client.
+
+Runs the attachment operations the app performs (bucket listing, upload,
+exists check, signed URL, download, delete) against the local stub storage
+server, once with a new client per call the way SupabaseStorageService used
+to work (including the extra connection test before listing buckets) and
+once with the shared keep-alive client. The stub's handshake delay stands
+in for the TCP/TLS setup to the hosted service:
+
+    python benchmark_storage_client.py [--iterations 50] [--handshake-ms 40] [--latency-ms 20]
+
+No real Supabase project is contacted.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+
+from app.services.storage_stub_server import StubStorageServer
+
+def start_stub(args):
+    server = StubStorageServer(handshake_ms=args.handshake_ms, latency_ms=args.latency_ms).start()
+    # Set before app.config is imported so the service talks to the stub
+    os.environ["SUPABASE_URL"] = server.url
+    os.environ["SUPABASE_SERVICE_KEY"] = "stub-service-key"
+    os.environ["SUPABASE_BUCKET"] = server.storage.buckets[0]
+    return server
+
+@contextmanager
+def per_call_clients(service):
+    """The old behaviour: every call builds (and never reuses) its own client"""
+    from supabase import create_client
+    from app.services import supabase_storage
+
+    def new_client():
+        start = time.perf_counter()
+        client = create_client(supabase_storage.SUPABASE_URL, supabase_storage.SUPABASE_SERVICE_KEY)
+        supabase_storage._client_stats["constructions"] += 1
+        supabase_storage._client_stats["construction_ms"] += (time.perf_counter() - start) * 1000
+        return client
+
+    shared = service.get_supabase_client
+    service.get_supabase_client = staticmethod(new_client)
+    try:
+        yield
+    finally:
+        service.get_supabase_client = shared
+
+def run_round(name, service, server, paths, legacy):
+    operations = {"list buckets": [], "upload": [], "exists": [], "signed url": [],
+                  "download": [], "delete": []}
+    stats_before = server.storage.stats()
+    clients_before = service.client_stats()
+    start = time.perf_counter()
+    for path in paths:
+        uploaded = {}
+        steps = [
+            # list_buckets used to run test_connection (a second listing) first
+            ("list buckets", lambda: (service.test_connection() if legacy else True) and service.list_buckets()),
+            ("upload", lambda: uploaded.setdefault("path", service.store_file(path))),
+            ("exists", lambda: service.file_exists(uploaded["path"])),
+            ("signed url", lambda: service.get_file_url(uploaded["path"])),
+            ("download", lambda: service.download_file(uploaded["path"], path + ".download")),
+            ("delete", lambda: service.delete_file(uploaded["path"])),
+        ]
+        for operation, call in steps:
+            call_start = time.perf_counter()
+            if not call():
+                raise RuntimeError(f"{operation} failed for {path}")
+            operations[operation].append(time.perf_counter() - call_start)
+    total = time.perf_counter() - start
+
+    stats = server.storage.stats()
+    clients = service.client_stats()
+    constructions = clients["constructions"] - clients_before["constructions"]
+    construction_ms = clients["construction_ms"] - clients_before["construction_ms"]
+    print(f"  {name:<8} total={total * 1000:>8.1f}ms requests={stats['requests'] - stats_before['requests']:<5} "
+          f"connections={stats['connections'] - stats_before['connections']:<5} "
+          f"clients={constructions:<4} client construction={construction_ms:>7.1f}ms")
+    for operation, times in operations.items():
+        print(f"      {operation:<13} mean={statistics.mean(times) * 1000:>7.2f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-call and shared Supabase storage clients")
+    parser.add_argument("--iterations", type=int, default=50, help="Attachments to run through each round")
+    parser.add_argument("--handshake-ms", type=float, default=40.0, help="Stub delay per new connection")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stub delay per request")
+    parser.add_argument("--size", type=int, default=256 * 1024, help="Attachment size in bytes")
+    args = parser.parse_args()
+
+    server = start_stub(args)
+    from app.services.supabase_storage import SupabaseStorageService
+
+    with tempfile.TemporaryDirectory() as directory:
+        def make_files(label):
+            paths = []
+            for n in range(args.iterations):
+                path = os.path.join(directory, f"{label}-{n}.bin")
+                with open(path, "wb") as f:
+                    f.write(os.urandom(args.size))
+                paths.append(path)
+            return paths
+
+        print(f"Storage client benchmark ({args.iterations} attachments, handshake {args.handshake_ms:.0f}ms, "
+              f"latency {args.latency_ms:.0f}ms)")
+        print("----------------------------------")
+        with per_call_clients(SupabaseStorageService):
+            run_round("per-call", SupabaseStorageService, server, make_files("legacy"), legacy=True)
+        run_round("shared", SupabaseStorageService, server, make_files("shared"), legacy=False)
+
+    SupabaseStorageService.close_client()
+    server.stop()
+
+if __name__ == "__main__":
+    main()
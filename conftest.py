@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models.models import File
+from app.services.storage_stub_server import patched_storage
+
+@pytest.fixture
+def stub_storage(request, tmp_path):
+    """A fresh stub storage server SupabaseStorageService talks to
+
+    Storage calls in a test using this fixture never reach the real bucket.
+    A test module can set STORAGE_SETTINGS (e.g. a small SUPABASE_CHUNK_SIZE)
+    to patch more of the service's settings.
+    """
+    settings = getattr(request.module, "STORAGE_SETTINGS", {})
+    with patched_storage(str(tmp_path / "uploads"), **settings) as server:
+        yield server
+
+@pytest.fixture
+def files_db():
+    """A session on an in-memory SQLite database holding only the files table
+
+    Enough for the storage service's attachment lookups, without the live
+    database; SQLite does not enforce the foreign keys to tickets and users.
+    """
+    engine = create_engine("sqlite://")
+    File.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
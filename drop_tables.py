@@ -1,8 +1,8 @@
-from app.models import Base, engine
+from app.models import Base, get_engine
 
 def drop_tables():
     # Drop all tables
-    Base.metadata.drop_all(bind=engine)
+    Base.metadata.drop_all(bind=get_engine())
     print("Successfully dropped all database tables!")
 
 if __name__ == "__main__":
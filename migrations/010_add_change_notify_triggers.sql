@@ -0,0 +1,36 @@
+-- Push opportunity and notification changes to listening clients (LISTEN si_changes)
+CREATE OR REPLACE FUNCTION notify_si_change() RETURNS trigger AS $$
+DECLARE
+    rec RECORD;
+    payload JSON;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        rec := OLD;
+    ELSE
+        rec := NEW;
+    END IF;
+
+    -- Keep the payload compact: clients refetch what they need
+    IF TG_TABLE_NAME = 'notifications' THEN
+        payload := json_build_object('table', TG_TABLE_NAME, 'op', TG_OP,
+                                     'id', rec.id, 'user_id', rec.user_id);
+    ELSE
+        payload := json_build_object('table', TG_TABLE_NAME, 'op', TG_OP,
+                                     'id', rec.id, 'status', rec.status,
+                                     'creator_id', rec.creator_id);
+    END IF;
+
+    PERFORM pg_notify('si_changes', payload::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS opportunities_notify_change ON opportunities;
+CREATE TRIGGER opportunities_notify_change
+AFTER INSERT OR UPDATE OR DELETE ON opportunities
+FOR EACH ROW EXECUTE FUNCTION notify_si_change();
+
+DROP TRIGGER IF EXISTS notifications_notify_change ON notifications;
+CREATE TRIGGER notifications_notify_change
+AFTER INSERT OR UPDATE OR DELETE ON notifications
+FOR EACH ROW EXECUTE FUNCTION notify_si_change();
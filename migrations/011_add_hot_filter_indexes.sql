@@ -0,0 +1,29 @@
+-- Indexes for the dashboard, management portal and toolbar filters.
+-- CONCURRENTLY keeps the tables writable while the indexes build, so each
+-- statement must run outside a transaction (see run_migration_011.py).
+
+-- Status filters compare LOWER(status) and list newest first; the included
+-- columns let the toolbar fingerprint run as an index-only scan
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_opportunities_lower_status_created_at
+    ON opportunities (LOWER(status), created_at DESC NULLS LAST, id)
+    INCLUDE (creator_id, updated_at);
+
+-- Unfiltered lists: dashboard pages and the portal table
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_opportunities_created_at
+    ON opportunities (created_at DESC NULLS LAST, id);
+
+-- My tickets filters and per-member statistics
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_opportunities_creator_id
+    ON opportunities (creator_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_opportunities_acceptor_id
+    ON opportunities (acceptor_id);
+
+-- Unread notifications per user; read rows are never searched this way
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notifications_user_unread
+    ON notifications (user_id, created_at DESC)
+    WHERE read = false;
+
+-- Notifications of a ticket, e.g. when it is deleted
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notifications_opportunity_id
+    ON notifications (opportunity_id);
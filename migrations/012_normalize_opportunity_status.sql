@@ -0,0 +1,26 @@
+-- Store opportunity statuses in one canonical lowercase form so every
+-- status filter is a plain equality the indexes can serve. Old rows hold
+-- mixed spellings ("New", "In Progress", "in_progress"); the model now
+-- normalizes on write (see Opportunity.status). Each statement runs on its
+-- own because the index rebuild uses CONCURRENTLY (see run_migration_012.py).
+
+UPDATE opportunities
+SET status = COALESCE(NULLIF(lower(regexp_replace(btrim(replace(status, '_', ' ')), '\s+', ' ', 'g')), ''), 'new')
+WHERE status IS NULL
+   OR status IS DISTINCT FROM lower(regexp_replace(btrim(replace(status, '_', ' ')), '\s+', ' ', 'g'));
+
+ALTER TABLE opportunities ALTER COLUMN status SET DEFAULT 'new';
+
+ALTER TABLE opportunities ALTER COLUMN status SET NOT NULL;
+
+ALTER TABLE opportunities DROP CONSTRAINT IF EXISTS opportunities_status_check;
+
+ALTER TABLE opportunities ADD CONSTRAINT opportunities_status_check
+    CHECK (status IN ('new', 'in progress', 'completed', 'needs info'));
+
+-- Replaces the migration 011 LOWER(status) index with one on the column itself
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_opportunities_status_created_at
+    ON opportunities (status, created_at DESC NULLS LAST, id)
+    INCLUDE (creator_id, updated_at);
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_opportunities_lower_status_created_at;
@@ -0,0 +1,50 @@
+-- Comments move out of the opportunities.comments JSONB array into their own
+-- table, so adding one is a single INSERT and counting them does not read
+-- any comment bodies.
+
+CREATE TABLE IF NOT EXISTS comments (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    opportunity_id UUID NOT NULL REFERENCES opportunities(id) ON DELETE CASCADE,
+    user_id UUID REFERENCES users(id) ON DELETE SET NULL,
+    user_name VARCHAR,
+    text TEXT NOT NULL,
+    type VARCHAR,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+-- A ticket's comments in order, and their count as an index-only scan
+CREATE INDEX IF NOT EXISTS ix_comments_opportunity_id_created_at
+    ON comments (opportunity_id, created_at, id);
+
+-- Backfill from the JSONB arrays, keeping their order. Entries written
+-- without a timestamp (status change notes) take the latest timestamp
+-- before them, or the ticket's creation time; the ordinality microseconds
+-- keep ties in array order.
+INSERT INTO comments (opportunity_id, user_id, user_name, text, type, created_at)
+SELECT entries.opportunity_id,
+       users.id,
+       entries.value->>'user_name',
+       COALESCE(entries.value->>'text', ''),
+       entries.value->>'type',
+       COALESCE(
+           max(entries.written_at) OVER (PARTITION BY entries.opportunity_id ORDER BY entries.position),
+           entries.opportunity_created_at,
+           now()
+       ) + entries.position * interval '1 microsecond'
+FROM (
+    SELECT o.id AS opportunity_id,
+           o.created_at AS opportunity_created_at,
+           c.value,
+           c.position,
+           CASE WHEN c.value->>'timestamp' ~ '^\d{4}-\d{2}-\d{2}'
+                THEN (c.value->>'timestamp')::timestamptz END AS written_at
+    FROM opportunities o
+    CROSS JOIN LATERAL jsonb_array_elements(o.comments) WITH ORDINALITY AS c(value, position)
+    WHERE jsonb_typeof(o.comments) = 'array'
+      AND jsonb_typeof(c.value) = 'object'
+      AND NOT EXISTS (SELECT 1 FROM comments existing WHERE existing.opportunity_id = o.id)
+) AS entries
+LEFT JOIN users ON users.id::text = entries.value->>'user_id';
+
+-- opportunities.comments stays until migration 018, so clients on the
+-- previous release keep working and this migration can be backed out
@@ -0,0 +1,44 @@
+-- Store each ticket's vehicle as columns instead of only in the
+-- "Vehicle: YEAR MAKE MODEL" description line. Each statement runs on its
+-- own because the indexes build CONCURRENTLY (see run_migration_014.py).
+
+ALTER TABLE opportunities ADD COLUMN IF NOT EXISTS vehicle_id UUID REFERENCES vehicles(id);
+
+ALTER TABLE opportunities ADD COLUMN IF NOT EXISTS year VARCHAR;
+
+ALTER TABLE opportunities ADD COLUMN IF NOT EXISTS make VARCHAR;
+
+ALTER TABLE opportunities ADD COLUMN IF NOT EXISTS model VARCHAR;
+
+-- Backfill tickets whose description names a known vehicle
+UPDATE opportunities o
+SET vehicle_id = v.id, year = v.year, make = v.make, model = v.model
+FROM (
+    SELECT DISTINCT ON (parsed.id) parsed.id AS opportunity_id, vehicles.*
+    FROM (
+        SELECT id, btrim(substring(description FROM 'Vehicle:\s+([^\n]+)')) AS vehicle
+        FROM opportunities
+        WHERE year IS NULL AND description ~ 'Vehicle:\s+'
+    ) AS parsed
+    JOIN vehicles ON lower(vehicles.year || ' ' || vehicles.make || ' ' || vehicles.model) = lower(parsed.vehicle)
+    ORDER BY parsed.id, vehicles.is_custom, vehicles.created_at
+) AS v
+WHERE o.id = v.opportunity_id;
+
+-- The rest: split "YEAR MAKE MODEL..." on the first two spaces
+UPDATE opportunities o
+SET year = parsed.parts[1], make = parsed.parts[2], model = parsed.parts[3]
+FROM (
+    SELECT id, regexp_match(btrim(substring(description FROM 'Vehicle:\s+([^\n]+)')), '^(\d{4})\s+(\S+)\s+(.+)$') AS parts
+    FROM opportunities
+    WHERE year IS NULL AND description ~ 'Vehicle:\s+'
+) AS parsed
+WHERE o.id = parsed.id AND parsed.parts IS NOT NULL;
+
+-- Filtering and grouping by make and model
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_opportunities_make_model
+    ON opportunities (make, model);
+
+-- Tickets of a vehicle, e.g. before deleting it
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_opportunities_vehicle_id
+    ON opportunities (vehicle_id);
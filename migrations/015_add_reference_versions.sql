@@ -0,0 +1,36 @@
+-- Version stamps for the reference data clients cache locally (vehicles,
+-- ADAS systems, user names). Each table's version lives in the settings
+-- table under 'reference_version:<table>' and is bumped once per statement
+-- that changes the table, so clients only refetch after a real change.
+CREATE OR REPLACE FUNCTION bump_reference_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO settings (key, value, updated_at)
+    VALUES ('reference_version:' || TG_TABLE_NAME, jsonb_build_object('version', 1), now())
+    ON CONFLICT (key) DO UPDATE
+    SET value = jsonb_build_object('version', COALESCE((settings.value->>'version')::bigint, 0) + 1),
+        updated_at = now();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS vehicles_bump_reference_version ON vehicles;
+CREATE TRIGGER vehicles_bump_reference_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON vehicles
+FOR EACH STATEMENT EXECUTE FUNCTION bump_reference_version();
+
+DROP TRIGGER IF EXISTS adas_systems_bump_reference_version ON adas_systems;
+CREATE TRIGGER adas_systems_bump_reference_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON adas_systems
+FOR EACH STATEMENT EXECUTE FUNCTION bump_reference_version();
+
+-- Only the cached user columns; logins update last_login/last_active constantly
+DROP TRIGGER IF EXISTS users_bump_reference_version ON users;
+CREATE TRIGGER users_bump_reference_version
+AFTER INSERT OR DELETE OR TRUNCATE OR UPDATE OF username, first_name, last_name, team, role, is_active ON users
+FOR EACH STATEMENT EXECUTE FUNCTION bump_reference_version();
+
+-- Starting versions
+INSERT INTO settings (key, value, updated_at)
+SELECT 'reference_version:' || t.name, jsonb_build_object('version', 1), now()
+FROM (VALUES ('vehicles'), ('adas_systems'), ('users')) AS t(name)
+ON CONFLICT (key) DO NOTHING;
@@ -0,0 +1,31 @@
+-- Ticket numbers (SI-YYYY-NNNNN) come from a per-year counter row that is
+-- incremented atomically when a ticket is inserted, instead of counting
+-- every opportunity when the form opens. A unique constraint on title
+-- guarantees no number is handed out twice.
+
+CREATE TABLE IF NOT EXISTS ticket_counters (
+    year INTEGER PRIMARY KEY,
+    last_number INTEGER NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+-- Tickets already numbered twice by concurrent submitters keep their
+-- number on the oldest ticket; later ones get a -2, -3, ... suffix
+UPDATE opportunities o
+SET title = o.title || '-' || d.copy
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY title ORDER BY created_at NULLS LAST, id) AS copy
+    FROM opportunities
+) AS d
+WHERE o.id = d.id AND d.copy > 1;
+
+ALTER TABLE opportunities DROP CONSTRAINT IF EXISTS opportunities_title_key;
+ALTER TABLE opportunities ADD CONSTRAINT opportunities_title_key UNIQUE (title);
+
+-- Continue each year from the highest number already issued
+INSERT INTO ticket_counters (year, last_number)
+SELECT (m[1])::integer, max((m[2])::integer)
+FROM (SELECT regexp_match(title, '^SI-(\d{4})-(\d+)$') AS m FROM opportunities) AS numbered
+WHERE m IS NOT NULL
+GROUP BY m[1]
+ON CONFLICT (year) DO UPDATE SET last_number = GREATEST(ticket_counters.last_number, EXCLUDED.last_number);
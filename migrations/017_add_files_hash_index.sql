@@ -0,0 +1,11 @@
+-- Index for hash-first attachment uploads: SupabaseStorageService.store_file
+-- looks up an already stored copy of a file by its SHA-256 before sending
+-- the bytes again. CONCURRENTLY keeps the files table writable while the
+-- index builds, so it must run outside a transaction (see run_migration_017.py).
+
+-- Live attachments by content hash; the included path answers the lookup
+-- from the index alone
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_files_hash
+    ON files (hash)
+    INCLUDE (storage_path)
+    WHERE is_deleted IS NOT TRUE;
@@ -0,0 +1,41 @@
+-- Drop the legacy opportunities.comments JSONB array. Comments live in the
+-- comments table since migration 013; apply this only once every client is
+-- on a release that reads and writes that table.
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'opportunities' AND column_name = 'comments') THEN
+        -- Pick up comments older clients wrote to the array after 013's
+        -- backfill, for tickets that have none in the table yet (same
+        -- ordering rules as 013)
+        INSERT INTO comments (opportunity_id, user_id, user_name, text, type, created_at)
+        SELECT entries.opportunity_id,
+               users.id,
+               entries.value->>'user_name',
+               COALESCE(entries.value->>'text', ''),
+               entries.value->>'type',
+               COALESCE(
+                   max(entries.written_at) OVER (PARTITION BY entries.opportunity_id ORDER BY entries.position),
+                   entries.opportunity_created_at,
+                   now()
+               ) + entries.position * interval '1 microsecond'
+        FROM (
+            SELECT o.id AS opportunity_id,
+                   o.created_at AS opportunity_created_at,
+                   c.value,
+                   c.position,
+                   CASE WHEN c.value->>'timestamp' ~ '^\d{4}-\d{2}-\d{2}'
+                        THEN (c.value->>'timestamp')::timestamptz END AS written_at
+            FROM opportunities o
+            CROSS JOIN LATERAL jsonb_array_elements(o.comments) WITH ORDINALITY AS c(value, position)
+            WHERE jsonb_typeof(o.comments) = 'array'
+              AND jsonb_typeof(c.value) = 'object'
+              AND NOT EXISTS (SELECT 1 FROM comments existing WHERE existing.opportunity_id = o.id)
+        ) AS entries
+        LEFT JOIN users ON users.id::text = entries.value->>'user_id';
+
+        ALTER TABLE opportunities DROP COLUMN comments;
+    END IF;
+END
+$$;
@@ -0,0 +1,10 @@
+def migration_statements(path):
+    """Split a migration file into statements, dropping comment lines
+
+    Migrations that use CREATE INDEX CONCURRENTLY run on an autocommit
+    connection one statement at a time, since the statement cannot run
+    inside a transaction block.
+    """
+    with open(path, 'r') as f:
+        sql = "\n".join(line for line in f if not line.lstrip().startswith('--'))
+    return [statement.strip() for statement in sql.split(';') if statement.strip()]
@@ -3,7 +3,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from sqlalchemy import text
-from app.database.connection import engine
+from app.database.connection import get_engine
 
 def run_migration():
     # Read the migration file
@@ -14,7 +14,7 @@ def run_migration():
     statements = migration_sql.split(';')
     
     # Execute each statement
-    with engine.connect() as conn:
+    with get_engine().connect() as conn:
         try:
             for statement in statements:
                 if statement.strip():  # Skip empty statements
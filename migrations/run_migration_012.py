@@ -0,0 +1,40 @@
+import os
+import psycopg2
+from dotenv import load_dotenv
+from migration_sql import migration_statements
+
+MIGRATION_FILE = os.path.join(os.path.dirname(__file__), '012_normalize_opportunity_status.sql')
+
+def run_migration():
+    """Run the migration to normalize opportunity statuses"""
+    load_dotenv()
+    
+    # Get database connection details from environment variables
+    db_url = os.getenv("DATABASE_URL")
+    
+    conn = None
+    cur = None
+    try:
+        # Connect to the database; the CONCURRENTLY index rebuild cannot run in a transaction
+        conn = psycopg2.connect(db_url)
+        conn.autocommit = True
+        cur = conn.cursor()
+        
+        # Execute the migration one statement at a time
+        for statement in migration_statements(MIGRATION_FILE):
+            print(f"Running: {statement.splitlines()[0]}")
+            cur.execute(statement)
+        
+        print("Migration 012 completed successfully!")
+        
+    except Exception as e:
+        print(f"Error during migration: {str(e)}")
+        raise
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
+
+if __name__ == "__main__":
+    run_migration()
@@ -1,9 +1,8 @@
-from sqlalchemy import create_engine, text
-from app.models import SQLALCHEMY_DATABASE_URL
+from sqlalchemy import text
+from app.database.connection import get_engine
 
 def reset_database():
-    # Create engine
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    engine = get_engine()
     
     try:
         # Connect and execute DROP commands
@@ -0,0 +1,63 @@
+import os
+import pytest
+from app.services.attachment_cache import AttachmentCache, AttachmentHashMismatchError
+from app.services.supabase_storage import SupabaseStorageService
+
+def test_attachment_cache(stub_storage, tmp_path):
+    """Open attachments through the cache and check reopens stay local"""
+    def downloads():
+        """Requests the stub has served"""
+        return stub_storage.storage.stats()["requests"]
+
+    cache_dir = str(tmp_path / "cache")
+    hashes = []
+    for n in range(3):
+        path = tmp_path / f"photo-{n}.jpg"
+        path.write_bytes(os.urandom(400 * 1024))
+        file_hash = SupabaseStorageService.calculate_file_hash(str(path))
+        assert SupabaseStorageService.store_file(str(path), file_hash, file_hash=file_hash) == file_hash
+        hashes.append(file_hash)
+
+    # Room for two of the three attachments
+    cache = AttachmentCache(cache_dir, max_bytes=900 * 1024)
+    first = cache.fetch(hashes[0], hashes[0], ".jpg")
+    requests = downloads()
+    again = cache.fetch(hashes[0], hashes[0], ".jpg")
+    assert first == again and first.endswith(".jpg")
+    assert downloads() == requests, "Reopening downloaded the attachment again"
+    with open(first, "rb") as f:
+        assert f.read() == (tmp_path / "photo-0.jpg").read_bytes()
+
+    # Opening a third attachment evicts the least recently opened one
+    cache.fetch(hashes[1], hashes[1], ".jpg")
+    cache.fetch(hashes[0], hashes[0], ".jpg")
+    cache.fetch(hashes[2], hashes[2], ".jpg")
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["entries"] == 2
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert cache.get(hashes[1]) is None and cache.get(hashes[0]) is not None
+
+    # A new process finds the entries on disk, in the same order (the
+    # get above made photo-0 the most recently used)
+    cache = AttachmentCache(cache_dir, max_bytes=900 * 1024)
+    assert list(cache.entries) == [hashes[2], hashes[0]]
+
+    # A corrupted entry is dropped and downloaded again
+    with open(cache.entries[hashes[2]], "r+b") as f:
+        f.write(b"corrupt")
+    requests = downloads()
+    assert cache.fetch(hashes[2], hashes[2], ".jpg") is not None
+    assert downloads() > requests
+    assert SupabaseStorageService.calculate_file_hash(cache.entries[hashes[2]]) == hashes[2]
+
+    # A download that does not match File.hash is not cached, but handed over once
+    with pytest.raises(AttachmentHashMismatchError) as mismatch:
+        cache.fetch(hashes[1], "0" * 64, ".jpg")
+    assert SupabaseStorageService.calculate_file_hash(mismatch.value.path) == hashes[1]
+    assert mismatch.value.path.endswith(".jpg")
+    os.remove(mismatch.value.path)
+    assert cache.stats()["rejected"] == 1 and cache.get("0" * 64) is None
+
+    # A failed download is reported as None, without raising
+    assert cache.fetch("missing.jpg", "1" * 64, ".jpg") is None
+    assert not [name for name in os.listdir(cache_dir) if name.endswith(".part")]
@@ -1,10 +1,10 @@
-from app.models import engine, User, Opportunity
+from app.models import get_engine, User, Opportunity
 from sqlalchemy import inspect
 
 def test_connection():
     try:
         # Create an inspector
-        inspector = inspect(engine)
+        inspector = inspect(get_engine())
         
         # Get all table names
         tables = inspector.get_table_names()
@@ -0,0 +1,50 @@
+import os
+from app.services import supabase_storage
+from app.services.supabase_storage import SupabaseStorageService
+
+# Small chunks keep the test quick
+STORAGE_SETTINGS = {
+    "SUPABASE_CHUNK_SIZE": 256 * 1024,
+    "SUPABASE_RESUMABLE_THRESHOLD": 1024 * 1024,
+}
+
+def stored_data(stub, storage_path):
+    return stub.storage.objects.get((stub.storage.buckets[0], storage_path))
+
+def test_resumable_upload(stub_storage, tmp_path):
+    """Upload a large attachment in chunks, drop the connection and resume"""
+    stub = stub_storage
+    data = os.urandom(3 * 1024 * 1024 + 1000)
+    path = tmp_path / "survey.mp4"
+    path.write_bytes(data)
+    file_hash = SupabaseStorageService.calculate_file_hash(str(path))
+    state_path = os.path.join(supabase_storage.RESUMABLE_STATE_DIR, f"{file_hash}.json")
+
+    # The connection drops after five chunks; the upload fails but its state is kept
+    stub.storage.drop_patch_after = 5
+    progress = []
+    failed = SupabaseStorageService.store_file(str(path), file_hash, file_hash=file_hash,
+                                               progress=lambda sent, total: progress.append(sent))
+    assert failed is None
+    assert os.path.exists(state_path), "Resume state was not saved"
+    assert stored_data(stub, file_hash) is None
+    assert stub.storage.stats()["chunks"] == 5
+
+    # The retry only sends the remaining chunks
+    progress.clear()
+    stored = SupabaseStorageService.store_file(str(path), file_hash, file_hash=file_hash,
+                                               progress=lambda sent, total: progress.append(sent))
+    stats = stub.storage.stats()
+    assert stored == file_hash
+    assert progress[0] == 6 * 256 * 1024 and progress[-1] == len(data)
+    assert stats["chunks"] == 13 and stats["uploads"] == 0
+    assert stored_data(stub, stored) == data, "Stored copy differs from the attachment"
+    assert not os.path.exists(state_path), "Resume state was not removed"
+
+    # Files up to the threshold still go in a single request
+    small = tmp_path / "notes.txt"
+    small.write_bytes(os.urandom(64 * 1024))
+    small_hash = SupabaseStorageService.calculate_file_hash(str(small))
+    assert SupabaseStorageService.store_file(str(small), small_hash, file_hash=small_hash) == small_hash
+    assert stub.storage.stats()["chunks"] == 13
+    assert stored_data(stub, small_hash) is not None
@@ -0,0 +1,72 @@
+import threading
+from datetime import datetime
+from app.database.connection import SessionLocal
+from app.models.models import Opportunity, TicketCounter, User
+from app.services.ticket_numbers import allocate_ticket_number, format_ticket_number
+
+# A year no real ticket uses, so the test never touches live counters
+TEST_YEAR = 1900
+THREADS = 16
+SUBMISSIONS_PER_THREAD = 25
+
+def submit_tickets(creator_id, titles, errors):
+    """Insert tickets the way OpportunityForm.submit_opportunity does"""
+    for _ in range(SUBMISSIONS_PER_THREAD):
+        db = SessionLocal()
+        try:
+            title = allocate_ticket_number(db, TEST_YEAR)
+            db.add(Opportunity(
+                title=title,
+                description="Ticket number concurrency test",
+                status="new",
+                creator_id=creator_id,
+                created_at=datetime.utcnow()
+            ))
+            db.commit()
+            titles.append(title)
+        except Exception as e:
+            db.rollback()
+            errors.append(str(e))
+        finally:
+            db.close()
+
+def test_concurrent_ticket_numbers():
+    """Submit tickets from many threads at once and check every number is unique"""
+    db = SessionLocal()
+    try:
+        print("Testing concurrent ticket number allocation...")
+        creator = db.query(User).first()
+        if not creator:
+            print("No users found; create a user first")
+            return
+
+        titles = []
+        errors = []
+        threads = [threading.Thread(target=submit_tickets, args=(creator.id, titles, errors))
+                   for _ in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        expected = THREADS * SUBMISSIONS_PER_THREAD
+        print(f"Submitted {len(titles)}/{expected} tickets from {THREADS} threads, {len(errors)} errors")
+        for error in errors[:5]:
+            print(f"  Error: {error}")
+
+        assert not errors, "Submissions failed"
+        assert len(set(titles)) == len(titles), "Duplicate ticket numbers were issued"
+        assert sorted(titles) == [format_ticket_number(TEST_YEAR, n) for n in range(1, expected + 1)], \
+            "Ticket numbers are not consecutive"
+        print("All ticket numbers are unique and consecutive")
+        print("Test completed successfully!")
+
+    finally:
+        print("\nCleaning up test tickets...")
+        db.query(Opportunity).filter(Opportunity.title.like(f"SI-{TEST_YEAR}-%")).delete(synchronize_session=False)
+        db.query(TicketCounter).filter(TicketCounter.year == TEST_YEAR).delete()
+        db.commit()
+        db.close()
+
+if __name__ == "__main__":
+    test_concurrent_ticket_numbers()